@@ -1,15 +1,82 @@
+from asgiref.sync import sync_to_async
 from django.db import connection
+from django.http import HttpResponse
 from django.utils import timezone
-from ninja import NinjaAPI
 
-from apps.garden.api import router as garden_router
+from apps import cache, metrics
+from apps.garden.live import live_feed
+from apps.routing import LazyNinjaAPI
+from apps.task import sweeper
 
-api = NinjaAPI(title="Seedr", version="0.1.0", docs_url="/docs", csrf=False)
-api.add_router("gardens", garden_router)
+api = LazyNinjaAPI(
+    title="Seedr",
+    version="0.1.0",
+    docs_url="/docs",
+    csrf=False,
+    on_router_loaded=metrics.instrument,
+)
+# Imported by the first request under each prefix
+api.add_lazy_router("gardens", "apps.garden.api.router")
+api.add_lazy_router("seeds", "apps.seed.api.router")
+api.add_lazy_router("batches", "apps.seed.api.batch_router")
+api.add_lazy_router("tasks", "apps.task.api.router")
+api.add_lazy_router("reminders", "apps.task.api.reminder_router")
 
 
-@api.get("health", tags=["health"])
-def health(request) -> dict[str, str]:
+def _ping_database() -> None:
     with connection.cursor() as cursor:
         cursor.execute("SELECT 1")
+
+
+@api.get("health", tags=["health"])
+async def health(request) -> dict[str, str]:
+    await sync_to_async(_ping_database)()
     return {"status": "ok", "timestamp": timezone.now().isoformat()}
+
+
+@api.get("cache/stats", tags=["health"])
+async def cache_stats(request) -> dict[str, int]:
+    """Response cache counters of the worker process serving the request."""
+    return cache.stats.snapshot()
+
+
+@api.get("tasks/sweep/stats", tags=["health"])
+def sweep_stats(request) -> dict:
+    """Totals of the overdue sweep across every scheduler run."""
+    return sweeper.snapshot()
+
+
+@api.get("metrics", tags=["health"])
+def prometheus_metrics(request):
+    """Request, response cache, live stream and overdue sweep metrics in the Prometheus
+    text format.
+
+    Request, cache and live stream metrics are those of the worker process serving the
+    request.
+    """
+    sweep = sweeper.snapshot()
+    last_run = sweep["last_run_at"]
+    lines = metrics.registry.render()
+    lines += metrics.render_counters("seedr_response_cache", cache.stats.snapshot(), {})
+    lines += metrics.render_counters(
+        "seedr_live_stream", live_feed.snapshot(), {"subscribers": "gauge"}
+    )
+    lines += metrics.render_counters(
+        "seedr_task_sweep",
+        {
+            "runs": sweep["sweeps"],
+            "marked_overdue": sweep["marked_overdue"],
+            "rolled_forward": sweep["rolled_forward"],
+            "missed": sweep["missed"],
+            "seconds": sweep["seconds_total"],
+            "last_seconds": sweep["last_seconds"],
+            "last_rows": sweep["last_rows"],
+            "last_run_timestamp_seconds": last_run.timestamp() if last_run else 0,
+        },
+        dict.fromkeys(["last_seconds", "last_rows", "last_run_timestamp_seconds"], "gauge"),
+    )
+    return HttpResponse("\n".join(lines) + "\n", content_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+
+# Last, so every operation above is covered; routers are instrumented as they load
+metrics.instrument(api)
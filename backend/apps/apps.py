@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class SeedrAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import metrics
+
+        # Count every query towards the request that issued it
+        connection_created.connect(metrics.install_query_recorder)
@@ -0,0 +1,201 @@
+"""Response cache for hot read endpoints.
+
+Serialized responses are stored in the ``responses`` cache alias under a key
+that includes a per-scope version token (e.g. one per garden). Invalidating a
+scope swaps its token, which orphans every cached page of it at once: list
+pages with any cursor/limit as well as single objects. Orphans age out via the
+TTL or the backend's LRU eviction. Each cached response carries a strong
+ETag, so clients polling with ``If-None-Match`` get an empty 304 instead of
+the body.
+
+With the default local-memory backend every worker process has its own cache
+and only sees its own invalidations until the TTL expires; set
+``RESPONSE_CACHE_URL`` to share one Redis cache across workers.
+"""
+
+import hashlib
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+
+RESPONSE_CACHE_ALIAS = "responses"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    invalidations: int = 0
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            setattr(self._stats, name, getattr(self._stats, name) + 1)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return asdict(self._stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = CacheStats()
+
+
+stats = _Counters()
+
+
+def _version_key(scope: str) -> str:
+    return f"version:{scope}"
+
+
+def _version(scope: str) -> str:
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    version = cache.get(_version_key(scope))
+    if version is None:
+        # Random rather than a counter: an evicted token must never come back
+        # as a value that older entries were stored under.
+        cache.add(_version_key(scope), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(scope))
+    return version
+
+
+async def _aversion(scope: str) -> str:
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    version = await cache.aget(_version_key(scope))
+    if version is None:
+        await cache.aadd(_version_key(scope), uuid.uuid4().hex, None)
+        version = await cache.aget(_version_key(scope))
+    return version
+
+
+def invalidate(scope: str) -> None:
+    """Drop every cached response of ``scope`` once the current transaction commits.
+
+    Model saves and deletes call this through signals; code writing with
+    ``bulk_create``/``bulk_update``/``QuerySet.update`` must call it itself.
+    """
+
+    def swap():
+        caches[RESPONSE_CACHE_ALIAS].set(_version_key(scope), uuid.uuid4().hex, None)
+        stats.add("invalidations")
+
+    transaction.on_commit(swap)
+
+
+def _etag(content: bytes) -> str:
+    return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _respond(request, etag: str, content: bytes, content_type: str) -> HttpResponse:
+    if _matches(request, etag):
+        stats.add("not_modified")
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"  # always revalidate, cheaply
+    return response
+
+
+def _key(request, scope: str, version: str) -> str:
+    key = f"response:{scope}:{version}:{request.get_full_path()}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _entry(response: HttpResponse):
+    """What gets cached for ``response``, or ``None`` if it must not be."""
+    if response.status_code != 200 or response.streaming:
+        return None
+    return _etag(response.content), response.content, response["Content-Type"]
+
+
+def _lookup(request, scope: str):
+    key = _key(request, scope, _version(scope))
+    return key, caches[RESPONSE_CACHE_ALIAS].get(key)
+
+
+async def _alookup(request, scope: str):
+    key = _key(request, scope, await _aversion(scope))
+    return key, await caches[RESPONSE_CACHE_ALIAS].aget(key)
+
+
+def _store(request, key: str, response: HttpResponse) -> HttpResponse:
+    stats.add("misses")
+    entry = _entry(response)
+    if entry is None:
+        return response
+    caches[RESPONSE_CACHE_ALIAS].set(key, entry, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return _respond(request, *entry)
+
+
+async def _astore(request, key: str, response: HttpResponse) -> HttpResponse:
+    stats.add("misses")
+    entry = _entry(response)
+    if entry is None:
+        return response
+    await caches[RESPONSE_CACHE_ALIAS].aset(key, entry, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return _respond(request, *entry)
+
+
+def cached_response(scope: Callable[..., str]):
+    """View decorator caching 200 responses under ``scope(**path_kwargs)``.
+
+    Apply to Ninja operations with ``decorate_view`` so the serialized
+    response is what gets cached. Works for sync and async operations.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method != "GET":
+                    return await view(request, *args, **kwargs)
+                # The async cache API, so a shared cache's round trips do not block the loop
+                key, entry = await _alookup(request, scope(**kwargs))
+                if entry is not None:
+                    stats.add("hits")
+                    return _respond(request, *entry)
+                return await _astore(request, key, await view(request, *args, **kwargs))
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view(request, *args, **kwargs)
+            key, entry = _lookup(request, scope(**kwargs))
+            if entry is not None:
+                stats.add("hits")
+                return _respond(request, *entry)
+            return _store(request, key, view(request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def garden_scope(garden_id, **kwargs) -> str:
+    return f"garden:{garden_id}"
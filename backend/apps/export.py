@@ -0,0 +1,255 @@
+"""Streaming CSV and Parquet export of large querysets.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)``, so the
+database cursor is consumed ``EXPORT_CHUNK_SIZE`` rows at a time, and each
+chunk is encoded and handed out before the next one is fetched. Memory use
+depends on the chunk size, not on how many rows are exported. Parquet output
+writes one row group per chunk and needs the optional ``pyarrow`` package
+(the ``export`` extra).
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Literal, Optional, Sequence
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import models
+from django.http import HttpRequest, StreamingHttpResponse
+
+ExportFormat = Literal["csv", "parquet"]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+ENVIRONMENT_EXPORT_FIELDS = (
+    "garden_id",
+    "timestamp",
+    "ph_level",
+    "ec_level",
+    "water_temp_c",
+    "dissolved_oxygen",
+    "air_temp_c",
+    "humidity_percent",
+    "light_intensity_lux",
+    "notes",
+)
+
+GROWTH_LOG_EXPORT_FIELDS = (
+    "seed_batch_id",
+    "timestamp",
+    "observation",
+    "height_cm",
+    "leaf_count",
+    "photo_urls",
+    "notes",
+)
+
+
+class ExportUnavailable(RuntimeError):
+    """The requested format needs a package that is not installed."""
+
+
+def _chunked(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _csv_value(field: models.Field) -> Callable:
+    if isinstance(field, models.DateTimeField):
+        return lambda value: value.isoformat() if value is not None else None
+    if isinstance(field, models.JSONField):
+        return lambda value: json.dumps(value) if value is not None else None
+    return lambda value: value
+
+
+def iter_csv(
+    queryset: models.QuerySet, fields: Sequence[str], chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield the header, then ``chunk_size`` encoded rows at a time."""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    converters = [_csv_value(queryset.model._meta.get_field(name)) for name in fields]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    for chunk in _chunked(rows, chunk_size):
+        writer.writerows(
+            [convert(value) for convert, value in zip(converters, row)] for row in chunk
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _arrow_type(pa, field: models.Field):
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.IntegerField, models.AutoField, models.ForeignKey)):
+        return pa.int64()
+    return pa.string()
+
+
+def iter_parquet(
+    queryset: models.QuerySet, fields: Sequence[str], chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield a Parquet file one row group of ``chunk_size`` rows at a time.
+
+    Raises ``ExportUnavailable`` right away, not on first iteration, when
+    pyarrow is missing.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export needs pyarrow (install the 'export' extra)")
+    return _parquet_chunks(pa, pq, queryset, fields, chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+def _parquet_chunks(pa, pq, queryset, fields, chunk_size) -> Iterator[bytes]:
+    model_fields = [queryset.model._meta.get_field(name) for name in fields]
+    schema = pa.schema(
+        [(name, _arrow_type(pa, field)) for name, field in zip(fields, model_fields)]
+    )
+    json_columns = {
+        i for i, field in enumerate(model_fields) if isinstance(field, models.JSONField)
+    }
+
+    sink = _Drain()
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for chunk in _chunked(rows, chunk_size):
+            columns = list(zip(*chunk))
+            for i in json_columns:
+                columns[i] = [json.dumps(v) if v is not None else None for v in columns[i]]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _in_range(queryset, start: Optional[datetime], end: Optional[datetime]):
+    if start is not None:
+        queryset = queryset.filter(timestamp__gte=start)
+    if end is not None:
+        queryset = queryset.filter(timestamp__lt=end)
+    return queryset
+
+
+def environment_logs(
+    garden_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> models.QuerySet:
+    """Raw readings in ``[start, end)``, oldest first along the (garden, timestamp) index."""
+    from apps.garden.models import GardenEnvironmentLog
+
+    logs = GardenEnvironmentLog.objects.all()
+    if garden_id is not None:
+        logs = logs.filter(garden_id=garden_id)
+    return _in_range(logs, start, end).order_by("garden_id", "timestamp", "id")
+
+
+def growth_logs(
+    batch_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> models.QuerySet:
+    """Growth observations in ``[start, end)``, oldest first per batch."""
+    from apps.seed.models import GrowthLogEntry
+
+    logs = GrowthLogEntry.objects.all()
+    if batch_id is not None:
+        logs = logs.filter(seed_batch_id=batch_id)
+    return _in_range(logs, start, end).order_by("seed_batch_id", "timestamp", "id")
+
+
+def iter_export(
+    queryset: models.QuerySet,
+    fields: Sequence[str],
+    format: ExportFormat,
+    chunk_size: Optional[int] = None,
+) -> Iterable[bytes]:
+    if format == "parquet":
+        return iter_parquet(queryset, fields, chunk_size)
+    return iter_csv(queryset, fields, chunk_size)
+
+
+def export_filename(
+    stem: str, format: ExportFormat, start: Optional[datetime], end: Optional[datetime]
+) -> str:
+    parts = [stem]
+    parts += [moment.strftime("%Y%m%dT%H%M%S") for moment in (start, end) if moment]
+    return f"{'-'.join(parts)}.{format}"
+
+
+async def _aiter(chunks: Iterable[bytes]):
+    # Each step runs in the request's sync thread, next to the open cursor
+    step = sync_to_async(next, thread_sensitive=True)
+    chunks = iter(chunks)
+    while (chunk := await step(chunks, None)) is not None:
+        yield chunk
+
+
+def streaming_export(
+    request: HttpRequest,
+    queryset: models.QuerySet,
+    fields: Sequence[str],
+    format: ExportFormat,
+    filename: str,
+) -> StreamingHttpResponse:
+    """Stream ``queryset`` as an attachment in ``format`` (see ``EXPORT_FORMATS``).
+
+    Django buffers the whole body when a streaming response's iterator does
+    not match the server (sync under WSGI, async under ASGI), so the chunks
+    are handed out in whichever form the serving handler consumes.
+    """
+    chunks = iter_export(queryset, fields, format)
+    if isinstance(request, ASGIRequest):
+        chunks = _aiter(chunks)
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,310 @@
+"""Out-of-range alerting on environment readings.
+
+Every garden has an envelope per metric: the intersection of the optimal
+bands of the seeds planted in its pods, so a reading outside it is bad for at
+least one plant. The engine keeps, per garden, a count of planted pods per
+seed and derives the envelope from those counts in memory. Pod saves and
+deletes adjust the counts through signals, so no seed is queried while
+readings stream in; a garden is (re)loaded with one query on first use and
+after ``ALERT_ENVELOPE_TTL_SECONDS`` to pick up changes made by other
+processes.
+
+Alerts have hysteresis: one is raised as soon as a reading leaves the
+envelope, but only cleared once a reading is back inside by the metric's
+deadband, so a value hovering at the edge does not flap.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import GardenAlert, GardenEnvironmentLog, GardenPod
+
+logger = logging.getLogger(__name__)
+
+# Reading field -> the Seed fields holding its optimal band
+BAND_FIELDS = {
+    "ph_level": ("optimal_ph_min", "optimal_ph_max"),
+    "ec_level": ("optimal_ec_min", "optimal_ec_max"),
+    "water_temp_c": ("optimal_temp_c_min", "optimal_temp_c_max"),
+    "air_temp_c": ("optimal_temp_c_min", "optimal_temp_c_max"),
+}
+SEED_BAND_FIELDS = sorted({name for pair in BAND_FIELDS.values() for name in pair})
+
+Band = tuple[float, float]
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    garden_id: int
+    metric: str
+    raised: bool  # False when the alert clears
+    value: float
+    low: Optional[float]
+    high: Optional[float]
+    timestamp: datetime
+
+
+AlertHandler = Callable[[AlertEvent], None]
+
+
+def log_alert(event: AlertEvent) -> None:
+    """Default handler: log raised and cleared alerts."""
+    logger.warning(
+        "Garden %s %s %s at %s: %s (envelope %s..%s)",
+        event.garden_id,
+        event.metric,
+        "out of range" if event.raised else "back in range",
+        event.timestamp.isoformat(),
+        event.value,
+        event.low,
+        event.high,
+    )
+
+
+def _bounds(value: float) -> Optional[float]:
+    return None if math.isinf(value) else value
+
+
+@dataclass
+class _GardenState:
+    pods: dict[int, int] = field(default_factory=dict)  # pod id -> seed id
+    seeds: Counter = field(default_factory=Counter)  # seed id -> planted pods
+    envelope: Optional[dict[str, Band]] = None  # None until recomputed
+    active: set[str] = field(default_factory=set)  # metrics with an open alert
+    loaded_at: float = 0.0
+
+
+class AlertEngine:
+    """Evaluates readings against per-garden envelopes and emits alert events."""
+
+    def __init__(
+        self,
+        handlers: Optional[Iterable[AlertHandler]] = None,
+        deadbands: Optional[dict[str, float]] = None,
+        ttl: float = 60.0,
+    ):
+        self.handlers = list(handlers) if handlers is not None else [log_alert]
+        self.deadbands = deadbands or {}
+        self.ttl = ttl
+        self._bands: dict[int, dict[str, Band]] = {}
+        self._gardens: dict[int, _GardenState] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(cls) -> "AlertEngine":
+        return cls(
+            handlers=[import_string(path) for path in settings.ALERT_HANDLERS],
+            deadbands=settings.ALERT_DEADBANDS,
+            ttl=settings.ALERT_ENVELOPE_TTL_SECONDS,
+        )
+
+    def _remember_seed(self, seed_id: int, limits: dict[str, Optional[float]]) -> None:
+        self._bands[seed_id] = {
+            metric: (
+                -math.inf if limits[low] is None else limits[low],
+                math.inf if limits[high] is None else limits[high],
+            )
+            for metric, (low, high) in BAND_FIELDS.items()
+        }
+
+    def _load(self, garden_id: int) -> _GardenState:
+        state = _GardenState(loaded_at=time.monotonic())
+        planted = GardenPod.objects.filter(
+            garden_id=garden_id,
+            seed_batch__is_active=True,
+            seed_batch__actual_harvest_date__isnull=True,
+        ).values_list(
+            "id", "seed_batch__seed_id", *(f"seed_batch__seed__{name}" for name in SEED_BAND_FIELDS)
+        )
+        for pod_id, seed_id, *limits in planted:
+            self._remember_seed(seed_id, dict(zip(SEED_BAND_FIELDS, limits)))
+            state.pods[pod_id] = seed_id
+            state.seeds[seed_id] += 1
+        state.active = set(
+            GardenAlert.objects.filter(garden_id=garden_id, cleared_at__isnull=True).values_list(
+                "metric", flat=True
+            )
+        )
+        self._gardens[garden_id] = state
+        return state
+
+    def _state(self, garden_id: int) -> _GardenState:
+        state = self._gardens.get(garden_id)
+        if state is None or time.monotonic() - state.loaded_at > self.ttl:
+            state = self._load(garden_id)
+        return state
+
+    def envelope(self, garden_id: int) -> dict[str, Band]:
+        """Return the garden's metric -> (low, high) envelope, infinite where unbounded."""
+        with self._lock:
+            state = self._state(garden_id)
+            if state.envelope is None:
+                bands = [self._bands[seed_id] for seed_id in state.seeds]
+                state.envelope = {
+                    metric: (
+                        max((band[metric][0] for band in bands), default=-math.inf),
+                        min((band[metric][1] for band in bands), default=math.inf),
+                    )
+                    for metric in BAND_FIELDS
+                }
+            return state.envelope
+
+    def pod_changed(self, pod: GardenPod) -> None:
+        """Apply a pod's (re)planting or clearing to its garden's envelope."""
+        with self._lock:
+            state = self._gardens.get(pod.garden_id)
+            if state is None:
+                return  # loaded fresh on first use
+            seed_id = None
+            if pod.seed_batch_id is not None:
+                batch = pod.seed_batch
+                if batch.is_active and batch.actual_harvest_date is None:
+                    seed_id = batch.seed_id
+                    if seed_id not in self._bands:
+                        seed = batch.seed
+                        limits = {name: getattr(seed, name) for name in SEED_BAND_FIELDS}
+                        self._remember_seed(seed_id, limits)
+            previous = state.pods.get(pod.pk)
+            if previous == seed_id:
+                return
+            if previous is not None:
+                state.seeds[previous] -= 1
+                if not state.seeds[previous]:
+                    del state.seeds[previous]
+                del state.pods[pod.pk]
+            if seed_id is not None:
+                state.pods[pod.pk] = seed_id
+                state.seeds[seed_id] += 1
+            state.envelope = None
+
+    def pod_removed(self, pod: GardenPod) -> None:
+        with self._lock:
+            state = self._gardens.get(pod.garden_id)
+            if state is None or pod.pk not in state.pods:
+                return
+            seed_id = state.pods.pop(pod.pk)
+            state.seeds[seed_id] -= 1
+            if not state.seeds[seed_id]:
+                del state.seeds[seed_id]
+            state.envelope = None
+
+    def reset(self) -> None:
+        """Forget everything; seeds or batches changed in ways pods do not show."""
+        with self._lock:
+            self._bands.clear()
+            self._gardens.clear()
+
+    def evaluate(self, garden_id: int, logs: Iterable[GardenEnvironmentLog]) -> list[AlertEvent]:
+        """Check readings in time order and persist alert changes.
+
+        Run it in the transaction that inserted them; the handlers are
+        notified once it commits.
+        """
+        events = []
+        with self._lock:
+            envelope = self.envelope(garden_id)
+            active = self._gardens[garden_id].active
+            # Open alerts on metrics that lost their bounds clear on the next reading
+            checked = {
+                metric: band
+                for metric, band in envelope.items()
+                if band != (-math.inf, math.inf) or metric in active
+            }
+            if not checked:
+                return []
+            for log in sorted(logs, key=lambda log: log.timestamp):
+                for metric, (low, high) in checked.items():
+                    value = getattr(log, metric)
+                    if value is None:
+                        continue
+                    if metric in active:
+                        # Clear only once back inside by the deadband, capped
+                        # at the middle of a narrow envelope
+                        margin = self.deadbands.get(metric, 0.0)
+                        if high - low < 2 * margin:
+                            margin = (high - low) / 2
+                        if not low + margin <= value <= high - margin:
+                            continue
+                        active.discard(metric)
+                    elif low <= value <= high:
+                        continue
+                    else:
+                        active.add(metric)
+                    events.append(
+                        AlertEvent(
+                            garden_id=garden_id,
+                            metric=metric,
+                            raised=metric in active,
+                            value=value,
+                            low=_bounds(low),
+                            high=_bounds(high),
+                            timestamp=log.timestamp,
+                        )
+                    )
+        if events:
+            self._persist(events)
+            transaction.on_commit(lambda: self._notify(events))
+        return events
+
+    def _notify(self, events: list[AlertEvent]) -> None:
+        for event in events:
+            for handler in self.handlers:
+                try:
+                    handler(event)
+                except Exception:
+                    logger.exception("Alert handler %r failed", handler)
+
+    def _persist(self, events: list[AlertEvent]) -> None:
+        with transaction.atomic():
+            for event in events:
+                if event.raised:
+                    GardenAlert.objects.bulk_create(
+                        [
+                            GardenAlert(
+                                garden_id=event.garden_id,
+                                metric=event.metric,
+                                low=event.low,
+                                high=event.high,
+                                value=event.value,
+                                raised_at=event.timestamp,
+                            )
+                        ],
+                        ignore_conflicts=True,  # another worker raised it already
+                    )
+                else:
+                    GardenAlert.objects.filter(
+                        garden_id=event.garden_id, metric=event.metric, cleared_at__isnull=True
+                    ).update(cleared_at=event.timestamp, clear_value=event.value)
+
+
+alert_engine = AlertEngine.from_settings()
+
+
+@receiver(post_save, sender=GardenPod)
+def _pod_saved(sender, instance, **kwargs):
+    alert_engine.pod_changed(instance)
+
+
+@receiver(post_delete, sender=GardenPod)
+def _pod_deleted(sender, instance, **kwargs):
+    alert_engine.pod_removed(instance)
+
+
+@receiver(post_save, sender="seed.Seed")
+@receiver(post_save, sender="seed.SeedBatch")
+@receiver(post_delete, sender="seed.Seed")
+@receiver(post_delete, sender="seed.SeedBatch")
+def _seeds_changed(sender, **kwargs):
+    alert_engine.reset()
@@ -0,0 +1,313 @@
+"""Anomaly detection on environment readings with rolling statistics.
+
+Fixed envelopes (see :mod:`apps.garden.alerts`) catch readings that are bad
+for the plants; this catches readings that are unusual for the garden. For
+every garden and analysed metric the detector keeps a few floats: a mean and
+variance, exact (Welford) over the first readings and then exponentially
+weighted over ``ANOMALY_FAST_HOURS``, plus a daily level and a weekly
+baseline. Weights follow the time between readings, not their count, so the
+windows hold whatever the upload interval. Each reading updates them in
+constant time, and is flagged as
+
+* a spike when it is more than ``ANOMALY_SPIKE_SIGMAS`` standard deviations
+  from the mean; it is clipped to that distance before it is folded in, so
+  one bad reading barely moves the statistics;
+* a stuck sensor when it is the ``ANOMALY_STUCK_READINGS``-th identical
+  reading in a row of a metric that normally varies; stuck readings are left
+  out of the statistics;
+* drift when the daily level is more than ``ANOMALY_DRIFT_SIGMAS`` standard
+  deviations from the weekly baseline, as a failing probe or evaporation
+  creeps; flagged once, until the level is back within half that.
+
+The detector runs inside the ingest transaction, which holds SQLite's write
+lock, and saves each garden's statistics to its :class:`AnomalyCheckpoint`
+row along with the last reading folded in. A restarted process, or another
+worker, picks the statistics up from there with one query instead of
+rereading the history.
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import AnomalyCheckpoint, AnomalyKind, GardenAnomaly, GardenEnvironmentLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AnomalyEvent:
+    garden_id: int
+    metric: str
+    kind: AnomalyKind
+    value: float
+    expected: float
+    score: float
+    timestamp: datetime
+
+
+AnomalyHandler = Callable[[AnomalyEvent], None]
+
+
+def log_anomaly(event: AnomalyEvent) -> None:
+    """Default handler: log every anomaly."""
+    logger.warning(
+        "Garden %s %s %s at %s: %s (expected %.3g, score %.1f)",
+        event.garden_id,
+        event.metric,
+        event.kind,
+        event.timestamp.isoformat(),
+        event.value,
+        event.expected,
+        event.score,
+    )
+
+
+class MetricStats:
+    """Rolling statistics of one metric of one garden."""
+
+    __slots__ = (
+        "count",
+        "seen_at",
+        "mean",
+        "variance",
+        "level",
+        "baseline",
+        "last",
+        "repeats",
+        "spread",
+        "drifting",
+    )
+
+    def __init__(
+        self,
+        count: int = 0,
+        seen_at: float = 0.0,
+        mean: float = 0.0,
+        variance: float = 0.0,
+        level: Optional[float] = None,
+        baseline: Optional[float] = None,
+        last: Optional[float] = None,
+        repeats: int = 0,
+        spread: float = 0.0,
+        drifting: bool = False,
+    ):
+        self.count = count
+        self.seen_at = seen_at  # POSIX time of the latest reading
+        self.mean = mean
+        self.variance = variance
+        self.level = level
+        self.baseline = baseline
+        self.last = last
+        self.repeats = repeats
+        self.spread = spread  # standard deviation when the run of identical readings began
+        self.drifting = drifting
+
+    def dump(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+
+@dataclass
+class _GardenState:
+    last_reading_id: int = 0
+    metrics: dict[str, MetricStats] = field(default_factory=dict)
+
+
+def _weight(elapsed: float, hours: float) -> float:
+    return -math.expm1(-elapsed / (hours * 3600))
+
+
+class AnomalyDetector:
+    """Folds readings into per-garden rolling statistics and flags the unusual ones."""
+
+    def __init__(
+        self,
+        noise_floors: dict[str, float],
+        handlers: Optional[Iterable[AnomalyHandler]] = None,
+        warmup: int = 20,
+        spike_sigmas: float = 5.0,
+        stuck_readings: int = 12,
+        drift_sigmas: float = 4.0,
+        fast_hours: float = 6,
+        level_hours: float = 24,
+        baseline_hours: float = 7 * 24,
+        gap_hours: float = 6,
+    ):
+        self.noise_floors = noise_floors
+        self.handlers = list(handlers) if handlers is not None else [log_anomaly]
+        self.warmup = warmup
+        self.spike_sigmas = spike_sigmas
+        self.stuck_readings = stuck_readings
+        self.drift_sigmas = drift_sigmas
+        self.fast_hours = fast_hours
+        self.level_hours = level_hours
+        self.baseline_hours = baseline_hours
+        self.gap = gap_hours * 3600
+        self._gardens: dict[int, _GardenState] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "AnomalyDetector":
+        return cls(
+            settings.ANOMALY_NOISE_FLOORS,
+            handlers=[import_string(path) for path in settings.ANOMALY_HANDLERS],
+            warmup=settings.ANOMALY_WARMUP_READINGS,
+            spike_sigmas=settings.ANOMALY_SPIKE_SIGMAS,
+            stuck_readings=settings.ANOMALY_STUCK_READINGS,
+            drift_sigmas=settings.ANOMALY_DRIFT_SIGMAS,
+            fast_hours=settings.ANOMALY_FAST_HOURS,
+            level_hours=settings.ANOMALY_LEVEL_HOURS,
+            baseline_hours=settings.ANOMALY_BASELINE_HOURS,
+            gap_hours=settings.ANOMALY_GAP_HOURS,
+        )
+
+    def update(
+        self, stats: MetricStats, value: float, seen_at: float, floor: float
+    ) -> list[tuple[AnomalyKind, float, float]]:
+        """Fold one reading in; returns ``(kind, expected, score)`` for each anomaly."""
+        found = []
+        elapsed = max(seen_at - stats.seen_at, 1.0)
+        if stats.count and elapsed > self.gap:
+            stats.count = 0
+        stats.seen_at = max(stats.seen_at, seen_at)
+
+        if value == stats.last:
+            stats.repeats += 1
+        else:
+            stats.last = value
+            stats.repeats = 1
+            stats.spread = math.sqrt(stats.variance) if stats.count >= self.warmup else 0.0
+        if stats.repeats >= self.stuck_readings:
+            if stats.repeats == self.stuck_readings and stats.spread >= floor:
+                found.append((AnomalyKind.STUCK, stats.mean, float(stats.repeats)))
+            return found
+
+        if stats.count < self.warmup:
+            stats.count += 1
+            delta = value - stats.mean
+            stats.mean += delta / stats.count
+            stats.variance += (delta * (value - stats.mean) - stats.variance) / stats.count
+        else:
+            std = max(math.sqrt(stats.variance), floor)
+            score = (value - stats.mean) / std
+            if abs(score) > self.spike_sigmas:
+                found.append((AnomalyKind.SPIKE, stats.mean, score))
+                value = stats.mean + math.copysign(self.spike_sigmas * std, score)
+            weight = _weight(elapsed, self.fast_hours)
+            delta = value - stats.mean
+            stats.mean += weight * delta
+            stats.variance = (1 - weight) * (stats.variance + weight * delta * delta)
+
+        if stats.level is None:
+            stats.level = stats.baseline = value
+        else:
+            stats.level += _weight(elapsed, self.level_hours) * (value - stats.level)
+            stats.baseline += _weight(elapsed, self.baseline_hours) * (value - stats.baseline)
+        if stats.count >= self.warmup:
+            score = (stats.level - stats.baseline) / max(math.sqrt(stats.variance), floor)
+            if not stats.drifting and abs(score) > self.drift_sigmas:
+                stats.drifting = True
+                found.append((AnomalyKind.DRIFT, stats.baseline, score))
+            elif stats.drifting and abs(score) < self.drift_sigmas / 2:
+                stats.drifting = False
+        return found
+
+    def _state(self, garden_id: int) -> _GardenState:
+        """The garden's statistics, reloaded when another process checkpointed since."""
+        last_reading_id = (
+            AnomalyCheckpoint.objects.filter(garden_id=garden_id)
+            .values_list("last_reading_id", flat=True)
+            .first()
+        )
+        state = self._gardens.get(garden_id)
+        if state is None or state.last_reading_id != (last_reading_id or 0):
+            state = _GardenState()
+            if last_reading_id is not None:
+                checkpoint = AnomalyCheckpoint.objects.get(garden_id=garden_id)
+                state.last_reading_id = checkpoint.last_reading_id
+                state.metrics = {
+                    metric: MetricStats(*values) for metric, values in checkpoint.state.items()
+                }
+            self._gardens[garden_id] = state
+        return state
+
+    def observe(self, garden_id: int, logs: Iterable[GardenEnvironmentLog]) -> list[AnomalyEvent]:
+        """Fold freshly inserted readings in, in order, and checkpoint the garden.
+
+        Run it in the transaction that inserted them; anomalies are stored
+        with them and handed to the handlers once it commits.
+        """
+        events = []
+        with self._lock:
+            state = self._state(garden_id)
+            for log in logs:
+                if log.pk <= state.last_reading_id:
+                    continue
+                seen_at = log.timestamp.timestamp()
+                for metric, floor in self.noise_floors.items():
+                    value = getattr(log, metric)
+                    if value is None:
+                        continue
+                    stats = state.metrics.get(metric)
+                    if stats is None:
+                        stats = state.metrics[metric] = MetricStats()
+                    for kind, expected, score in self.update(stats, value, seen_at, floor):
+                        events.append(
+                            AnomalyEvent(
+                                garden_id, metric, kind, value, expected, score, log.timestamp
+                            )
+                        )
+                state.last_reading_id = log.pk
+            self._checkpoint(garden_id, state)
+        if events:
+            GardenAnomaly.objects.bulk_create(
+                GardenAnomaly(
+                    garden_id=event.garden_id,
+                    metric=event.metric,
+                    kind=event.kind,
+                    value=event.value,
+                    expected=event.expected,
+                    score=event.score,
+                    detected_at=event.timestamp,
+                )
+                for event in events
+            )
+            transaction.on_commit(lambda: self._notify(events))
+        return events
+
+    def _checkpoint(self, garden_id: int, state: _GardenState) -> None:
+        AnomalyCheckpoint.objects.bulk_create(
+            [
+                AnomalyCheckpoint(
+                    garden_id=garden_id,
+                    last_reading_id=state.last_reading_id,
+                    state={metric: stats.dump() for metric, stats in state.metrics.items()},
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["garden"],
+            update_fields=["last_reading_id", "state"],
+        )
+
+    def _notify(self, events: list[AnomalyEvent]) -> None:
+        for event in events:
+            for handler in self.handlers:
+                try:
+                    handler(event)
+                except Exception:
+                    logger.exception("Anomaly handler %r failed", handler)
+
+    def reset(self) -> None:
+        """Forget the statistics held in memory; checkpoints are reloaded on next use."""
+        with self._lock:
+            self._gardens.clear()
+
+
+anomaly_detector = AnomalyDetector.from_settings()
@@ -1,58 +1,321 @@
-from typing import List
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.utils import timezone
-from ninja import Router
+from ninja import Query, Router
+from ninja.decorators import decorate_view
+from ninja.errors import HttpError
+from ninja.pagination import paginate
+
+from apps import export
+from apps.cache import cached_response, garden_scope
+from apps.pagination import CursorPagination
 
-from .models import Garden, GardenPod
-from .schemas import GardenSchema, PodSchema as GardenPodSchema
+from . import live, planner, pods, sync
+from .dashboard import garden_dashboards
+from .ingest import ingest_readings, iter_ndjson
+from .models import (
+    AnomalyKind,
+    Garden,
+    GardenAlert,
+    GardenAnomaly,
+    GardenEnvironmentLog,
+    GardenPod,
+    RollupResolution,
+)
+from .rollups import ENVIRONMENT_METRICS, pick_resolution, query_rollups
+from .schemas import (
+    ChangeFeedSchema,
+    GardenAlertSchema,
+    GardenAnomalySchema,
+    GardenDashboardSchema,
+    GardenEnvironmentSchema,
+    GardenSchema,
+    IngestResultSchema,
+    PlanRequestSchema,
+    PlantingPlanSchema,
+    PodCreateSchema,
+    PodProvisionResultSchema,
+    PodProvisionSchema,
+    PodSchema as GardenPodSchema,
+    PodStatusTransitionResultSchema,
+    PodStatusTransitionSchema,
+    RollupSeriesSchema,
+)
 
 router = Router(tags=["gardens"])
 
 
 @router.get("/", response=List[GardenSchema])
-def get_gardens(request):
+@paginate(CursorPagination, ordering=("id",))
+async def get_gardens(request):
     gardens = Garden.objects.all()
     return gardens
 
 
 @router.post("/", response=GardenSchema)
-def create_garden(request, garden: GardenSchema):
-    garden = Garden.objects.create(**garden.dict())
-    garden.save()
-    return garden
+async def create_garden(request, garden: GardenSchema):
+    return await Garden.objects.acreate(**garden.dict())
+
+
+@router.get("/dashboard", response=List[GardenDashboardSchema])
+def get_dashboards(request):
+    """Overview of every garden in a fixed number of queries."""
+    return garden_dashboards()
+
+
+@router.get("/changes", response=ChangeFeedSchema)
+def get_changes(request, cursor: int = Query(0, ge=0), limit: int = Query(1000, ge=1, le=5000)):
+    """Gardens and pods changed since ``cursor``, with the ids of those deleted.
+
+    Start from 0 and pass each response's ``cursor`` to the next call, while
+    ``has_more`` is true and on later syncs.
+    """
+    return sync.changes_since(cursor, limit)
 
 
 @router.get("/{garden_id}", response=GardenSchema)
-def get(request, garden_id: int):
-    return Garden.objects.get(pk=garden_id)
+@decorate_view(cached_response(garden_scope))
+async def get(request, garden_id: int):
+    return await aget_object_or_404(Garden, pk=garden_id)
+
+
+@router.get("/{garden_id}/dashboard", response=GardenDashboardSchema)
+def get_dashboard(request, garden_id: int):
+    dashboards = garden_dashboards(garden_id)
+    if not dashboards:
+        raise Http404("No Garden matches the given query.")
+    return dashboards[0]
 
 
 @router.put("/{garden_id}", response=GardenSchema)
-def update_garden(request, garden_id: int, payload: GardenSchema):
-    garden = Garden.objects.get(pk=garden_id)
+async def update_garden(request, garden_id: int, payload: GardenSchema):
+    garden = await aget_object_or_404(Garden, pk=garden_id)
     for attr, value in payload.dict(exclude_unset=True).items():
         setattr(garden, attr, value)
     garden.updated_at = timezone.now()
-    garden.save()
+    await garden.asave()
     return garden
 
 
 @router.delete("/{garden_id}")
-def delete_garden(request, garden_id: int):
-    garden = Garden.objects.get(pk=garden_id)
-    garden.delete()
+async def delete_garden(request, garden_id: int):
+    garden = await aget_object_or_404(Garden, pk=garden_id)
+    await garden.adelete()
     return {"status": "deleted"}
 
 
 @router.get("/{garden_id}/pods/", response=List[GardenPodSchema])
-def get_pods(request, garden_id: int):
+@decorate_view(cached_response(garden_scope))
+@paginate(CursorPagination, ordering=("pod_number",))
+async def get_pods(request, garden_id: int):
     return GardenPod.objects.filter(garden_id=garden_id)
 
 
 @router.post("/{garden_id}/pods/", response=GardenPodSchema)
-def create_pod(request, garden_id: int, pod: GardenPodSchema):
-    return GardenPod.objects.create(garden_id=garden_id, **pod.dict())
+async def create_pod(request, garden_id: int, pod: PodCreateSchema):
+    garden = await aget_object_or_404(Garden, pk=garden_id)
+    try:
+        return await GardenPod.objects.acreate(garden=garden, **pod.dict())
+    except IntegrityError:
+        raise HttpError(409, f"Pod {pod.pod_number} already exists in garden {garden_id}")
+
+
+@router.post("/{garden_id}/pods/provision", response=PodProvisionResultSchema)
+def provision_pods(request, garden_id: int, payload: PodProvisionSchema):
+    """Create every missing pod numbered 1..total_pods in one transaction."""
+    garden = get_object_or_404(Garden, pk=garden_id)
+    return pods.provision_pods(garden, payload.status)
+
+
+@router.post("/{garden_id}/pods/status", response=PodStatusTransitionResultSchema)
+def transition_pods(request, garden_id: int, payload: PodStatusTransitionSchema):
+    """Move a set of pods to a new status; all of them or, on any error, none."""
+    garden = get_object_or_404(Garden, pk=garden_id)
+    try:
+        updated = pods.transition_pods(
+            garden, payload.pod_numbers, payload.status, payload.from_status
+        )
+    except pods.PodBulkError as exc:
+        raise HttpError(400, str(exc))
+    return {"updated": updated}
+
+
+@router.post("/{garden_id}/plan", response=PlantingPlanSchema)
+def plan_plantings(request, garden_id: int, payload: PlanRequestSchema):
+    """Assign pending seed batches to the garden's pods and planting dates.
+
+    With ``apply`` the plantings are stored as transplant tasks on the pods.
+    """
+    garden = get_object_or_404(Garden, pk=garden_id)
+    plan = planner.plan_garden(
+        garden, payload.start, payload.horizon_days, payload.max_harvests_per_day
+    )
+    if payload.apply:
+        planner.apply_plan(plan)
+    return plan
 
 
 @router.get("/{garden_id}/pods/{pod_number}", response=GardenPodSchema)
-def get_pod(request, garden_id: int, pod_number: int):
-    return GardenPod.objects.get(garden_id=garden_id, pod_number=pod_number)
+@decorate_view(cached_response(garden_scope))
+async def get_pod(request, garden_id: int, pod_number: int):
+    return await aget_object_or_404(GardenPod, garden_id=garden_id, pod_number=pod_number)
+
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+
+
+@router.post(
+    "/{garden_id}/environment/",
+    response=IngestResultSchema,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": GardenEnvironmentSchema.model_json_schema(),
+                    }
+                },
+                "application/x-ndjson": {"schema": GardenEnvironmentSchema.model_json_schema()},
+            }
+        }
+    },
+)
+def ingest_environment(request, garden_id: int):
+    """Bulk-insert readings sent as a JSON array or as an NDJSON stream."""
+    get_object_or_404(Garden, pk=garden_id)
+    if request.content_type in NDJSON_CONTENT_TYPES:
+        rows = iter_ndjson(request)
+    else:
+        try:
+            rows = json.loads(request.body)
+        except ValueError:
+            raise HttpError(400, "Request body must be a JSON array of readings")
+        if not isinstance(rows, list):
+            raise HttpError(400, "Request body must be a JSON array of readings")
+
+    result = ingest_readings(garden_id, rows)
+    return {
+        "accepted": result.accepted,
+        "rejected": result.rejected,
+        "batches": result.batches,
+        "errors": result.errors,
+    }
+
+
+@router.get("/{garden_id}/environment/", response=List[GardenEnvironmentSchema])
+@paginate(CursorPagination, ordering=("-timestamp", "-id"))
+async def get_environment_logs(
+    request,
+    garden_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Raw readings, newest first."""
+    logs = GardenEnvironmentLog.objects.filter(garden_id=garden_id)
+    if start is not None:
+        logs = logs.filter(timestamp__gte=start)
+    if end is not None:
+        logs = logs.filter(timestamp__lt=end)
+    return logs
+
+
+@router.get("/{garden_id}/environment/export")
+def export_environment_logs(
+    request,
+    garden_id: int,
+    format: export.ExportFormat = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Stream raw readings in ``[start, end)``, oldest first, as CSV or Parquet."""
+    get_object_or_404(Garden, pk=garden_id)
+    logs = export.environment_logs(garden_id, start, end)
+    filename = export.export_filename(f"garden-{garden_id}-environment", format, start, end)
+    try:
+        return export.streaming_export(
+            request, logs, export.ENVIRONMENT_EXPORT_FIELDS, format, filename
+        )
+    except export.ExportUnavailable as exc:
+        raise HttpError(501, str(exc))
+
+
+@router.get("/{garden_id}/environment/rollups", response=RollupSeriesSchema)
+def get_environment_rollups(
+    request,
+    garden_id: int,
+    start: datetime,
+    end: Optional[datetime] = None,
+    resolution: Optional[RollupResolution] = None,
+    step_seconds: Optional[int] = None,
+    max_points: int = 500,
+    metrics: List[str] = Query(None),
+):
+    """Downsampled min/max/mean history served from the rollup tables.
+
+    Without an explicit ``resolution`` the coarsest bucket no wider than
+    ``step_seconds`` (or ``(end - start) / max_points``) is used.
+    """
+    end = end or timezone.now()
+    if end <= start:
+        raise HttpError(400, "end must be after start")
+    metrics = metrics or list(ENVIRONMENT_METRICS)
+    unknown = set(metrics) - set(ENVIRONMENT_METRICS)
+    if unknown:
+        raise HttpError(400, f"Unknown metrics: {', '.join(sorted(unknown))}")
+    if resolution is None:
+        step = timedelta(seconds=step_seconds) if step_seconds else None
+        resolution = pick_resolution(start, end, step, max_points)
+    return {
+        "resolution": resolution,
+        "start": start,
+        "end": end,
+        "points": query_rollups(garden_id, start, end, resolution, metrics),
+    }
+
+
+@router.get("/{garden_id}/stream")
+async def stream_garden(request, garden_id: int):
+    """Server-Sent Events: ``reading`` for each new reading, ``pod`` for each pod status
+    change, and ``lagged`` with the number of events dropped while the client fell behind."""
+    if not isinstance(request, ASGIRequest):
+        raise HttpError(501, "Live streams need the ASGI server (make serve)")
+    await aget_object_or_404(Garden, pk=garden_id)
+    response = StreamingHttpResponse(
+        live.events(garden_id, settings.LIVE_STREAM_KEEPALIVE_SECONDS),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # proxies must pass events through as they come
+    return response
+
+
+@router.get("/{garden_id}/alerts", response=List[GardenAlertSchema])
+@paginate(CursorPagination, ordering=("-raised_at", "-id"))
+async def get_alerts(request, garden_id: int, active: Optional[bool] = None):
+    """Out-of-range alerts, newest first; ``active`` keeps only the open ones."""
+    alerts = GardenAlert.objects.filter(garden_id=garden_id)
+    if active is not None:
+        alerts = alerts.filter(cleared_at__isnull=active)
+    return alerts
+
+
+@router.get("/{garden_id}/anomalies", response=List[GardenAnomalySchema])
+@paginate(CursorPagination, ordering=("-detected_at", "-id"))
+async def get_anomalies(
+    request, garden_id: int, kind: Optional[AnomalyKind] = None, metric: Optional[str] = None
+):
+    """Spikes, stuck sensors and drift in the garden's readings, newest first."""
+    anomalies = GardenAnomaly.objects.filter(garden_id=garden_id)
+    if kind is not None:
+        anomalies = anomalies.filter(kind=kind)
+    if metric is not None:
+        anomalies = anomalies.filter(metric=metric)
+    return anomalies
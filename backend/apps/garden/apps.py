@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class GardenConfig(AppConfig):
+    name = "apps.garden"
+    label = "garden"
+
+    def ready(self):
+        # Connect the signal handlers
+        from . import alerts, signals  # noqa: F401
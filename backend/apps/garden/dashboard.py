@@ -0,0 +1,127 @@
+"""Garden overview: pod counts, latest reading, overdue tasks and active batches.
+
+Each overview takes three queries however many gardens and pods there are:
+the gardens annotated with pod counts per status, their overdue task count
+and the id of their latest reading; the latest readings by id; and the pods
+holding an active batch, with batch and seed joined in.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.task.models import OPEN_STATUSES, Task, TaskStatus
+
+from .models import Garden, GardenEnvironmentLog, GardenPod, PodStatus
+
+
+@dataclass
+class DashboardBatch:
+    id: int
+    batch_number: Optional[str]
+    seed_name: str
+    current_stage: str
+    predicted_harvest_date: Optional[date]
+    pod_numbers: list[int] = field(default_factory=list)
+
+
+@dataclass
+class GardenDashboard:
+    id: int
+    name: str
+    total_pods: int
+    is_active: bool
+    pods_by_status: dict[str, int]
+    overdue_tasks: int
+    latest_reading: Optional[GardenEnvironmentLog]
+    active_batches: list[DashboardBatch]
+
+
+def _status_key(status: PodStatus) -> str:
+    return status.name.lower()
+
+
+def _overdue_task_count(now: datetime) -> Coalesce:
+    # Tasks belong to a garden directly or through one of its pods; a series is
+    # due when its current occurrence is
+    overdue = Task.objects.alias(due=Coalesce("next_due", "due_date")).filter(
+        Q(garden=OuterRef("pk")) | Q(pod__garden=OuterRef("pk")),
+        Q(status=TaskStatus.OVERDUE)
+        | Q(status__in=OPEN_STATUSES, due_date__isnull=False, due__lt=now),
+    )
+    count = overdue.order_by().annotate(n=Func(F("pk"), function="COUNT")).values("n")
+    return Coalesce(Subquery(count, output_field=IntegerField()), 0)
+
+
+def _latest_reading_id() -> Subquery:
+    latest = GardenEnvironmentLog.objects.filter(garden=OuterRef("pk")).order_by(
+        "-timestamp", "-id"
+    )
+    return Subquery(latest.values("id")[:1])
+
+
+def garden_dashboards(garden_id: Optional[int] = None) -> list[GardenDashboard]:
+    """Overviews of every garden, or only of ``garden_id``, ordered by id."""
+    now = timezone.now()
+    gardens = Garden.objects.order_by("id")
+    if garden_id is not None:
+        gardens = gardens.filter(pk=garden_id)
+    gardens = gardens.annotate(
+        **{
+            f"pods_{_status_key(status)}": Count("pods", filter=Q(pods__status=status))
+            for status in PodStatus
+        },
+        overdue_tasks=_overdue_task_count(now),
+        latest_reading_id=_latest_reading_id(),
+    ).prefetch_related(
+        Prefetch(
+            "pods",
+            queryset=GardenPod.objects.filter(
+                seed_batch__is_active=True, seed_batch__actual_harvest_date__isnull=True
+            )
+            .select_related("seed_batch__seed")
+            .order_by("pod_number"),
+            to_attr="planted_pods",
+        )
+    )
+    gardens = list(gardens)
+
+    reading_ids = [garden.latest_reading_id for garden in gardens if garden.latest_reading_id]
+    readings = GardenEnvironmentLog.objects.in_bulk(reading_ids) if reading_ids else {}
+
+    return [
+        GardenDashboard(
+            id=garden.pk,
+            name=garden.name,
+            total_pods=garden.total_pods,
+            is_active=garden.is_active,
+            pods_by_status={
+                _status_key(status): getattr(garden, f"pods_{_status_key(status)}")
+                for status in PodStatus
+            },
+            overdue_tasks=garden.overdue_tasks,
+            latest_reading=readings.get(garden.latest_reading_id),
+            active_batches=_active_batches(garden.planted_pods),
+        )
+        for garden in gardens
+    ]
+
+
+def _active_batches(pods: list[GardenPod]) -> list[DashboardBatch]:
+    batches: dict[int, DashboardBatch] = {}
+    for pod in pods:
+        batch = pod.seed_batch
+        if batch.pk not in batches:
+            batches[batch.pk] = DashboardBatch(
+                id=batch.pk,
+                batch_number=batch.batch_number,
+                seed_name=batch.seed.name,
+                current_stage=batch.current_stage,
+                predicted_harvest_date=batch.predicted_harvest_date,
+            )
+        batches[batch.pk].pod_numbers.append(pod.pod_number)
+    return list(batches.values())
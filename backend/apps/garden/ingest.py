@@ -0,0 +1,125 @@
+"""Batched ingestion of environment readings pushed by garden controllers."""
+
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from django.db import transaction
+from pydantic import ValidationError
+
+from . import live
+from .alerts import alert_engine
+from .anomalies import anomaly_detector
+from .models import GardenEnvironmentLog
+from .rollups import record_readings
+from .schemas import GardenEnvironmentSchema
+
+INGEST_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class BatchResult:
+    accepted: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class IngestResult:
+    batches: list[BatchResult] = field(default_factory=list)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> int:
+        return sum(batch.accepted for batch in self.batches)
+
+    @property
+    def rejected(self) -> int:
+        return sum(batch.rejected for batch in self.batches)
+
+
+class RejectedRow:
+    """Placeholder for a payload that could not even be decoded."""
+
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+def iter_ndjson(lines: Iterable[bytes | str]) -> Iterator[Any]:
+    """Decode one JSON document per line, skipping blank lines.
+
+    Undecodable lines are yielded as rejects so they are counted instead of
+    aborting the whole stream.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield RejectedRow(f"invalid JSON: {exc}")
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _validate(
+    garden_id: int, chunk: list[Any], first: int, result: IngestResult
+) -> list[GardenEnvironmentLog]:
+    batch = BatchResult()
+    logs = []
+    for index, raw in enumerate(chunk, first):
+        try:
+            if isinstance(raw, RejectedRow):
+                raise ValueError(raw.detail)
+            reading = GardenEnvironmentSchema.model_validate(raw)
+        except (ValidationError, ValueError) as exc:
+            batch.rejected += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                detail = (
+                    exc.errors(include_url=False, include_context=False)
+                    if isinstance(exc, ValidationError)
+                    else str(exc)
+                )
+                result.errors.append({"index": index, "detail": detail})
+        else:
+            logs.append(GardenEnvironmentLog(garden_id=garden_id, **reading.model_dump()))
+    batch.accepted = len(logs)
+    result.batches.append(batch)
+    return logs
+
+
+def ingest_readings(
+    garden_id: int, rows: Iterable[Any], batch_size: int = INGEST_BATCH_SIZE
+) -> IngestResult:
+    """Validate ``rows`` and insert them for ``garden_id`` with batched ``bulk_create``.
+
+    Everything is written in one transaction, together with the matching
+    rollup updates, anomaly statistics and alert changes, so a crash
+    mid-stream leaves no partial upload behind. Each batch is written as soon
+    as it is validated, so only one batch of the upload is held in memory;
+    alert and anomaly handlers and live subscribers hear of it once it
+    commits. Rows failing validation are counted as rejected and the first
+    ``MAX_REPORTED_ERRORS`` of them are reported by position.
+    """
+    result = IngestResult()
+    index = 0
+    with transaction.atomic():
+        for chunk in _chunks(rows, batch_size):
+            logs = _validate(garden_id, chunk, index, result)
+            index += len(chunk)
+            if not logs:
+                continue
+            GardenEnvironmentLog.objects.bulk_create(logs, batch_size=batch_size)
+            record_readings(logs)
+            anomaly_detector.observe(garden_id, logs)
+            alert_engine.evaluate(garden_id, logs)
+        live.changed()
+    return result
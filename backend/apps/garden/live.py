@@ -0,0 +1,259 @@
+"""Live garden telemetry for Server-Sent Events streams.
+
+Each worker process runs one :class:`LiveFeed`. While any client is
+subscribed, a single task on the event loop tails the database: readings with
+an id past its cursor, and pods of the subscribed gardens updated since its
+last look. Each change is encoded once as an SSE frame and the
+same bytes are appended to the queue of every subscriber of the garden, so a
+hundred wall displays cost one query per tick and one encoding per change,
+not a hundred polls.
+
+The tail runs every ``LIVE_STREAM_POLL_SECONDS``, which picks up writes made
+by other worker processes. Writes committed in this process also call
+:func:`changed`, which wakes it right away.
+
+Subscriber queues hold at most ``LIVE_STREAM_QUEUE_SIZE`` frames. The feed
+never waits for a client: when a slow client's queue is full the oldest
+frame is dropped, and the client gets a ``lagged`` event with the number
+missed before its next frame, so it can refetch the current state over REST.
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import GardenEnvironmentLog, GardenPod
+from .rollups import ENVIRONMENT_METRICS
+
+READING_FIELDS = ("id", "garden_id", "timestamp", *ENVIRONMENT_METRICS)
+KEEPALIVE_FRAME = b": keepalive\n\n"
+# Browsers reconnect after this many milliseconds when the stream drops
+RETRY_FRAME = b"retry: 3000\n\n"
+
+# Pods are looked up from this far before the previous tail, since auto_now
+# stamps a pod before its transaction commits; already seen statuses are skipped
+POD_OVERLAP = timedelta(seconds=5)
+
+
+def frame(event: str, data: dict) -> bytes:
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+class Subscriber:
+    """A client's bounded queue of encoded frames."""
+
+    def __init__(self, garden_id: int, queue_size: int):
+        self.garden_id = garden_id
+        self.queue: deque[bytes] = deque()
+        self.queue_size = queue_size
+        self.missed = 0
+        self._ready = asyncio.Event()
+
+    def push(self, data: bytes) -> bool:
+        """Queue ``data``, dropping the oldest frame when full; False if one was dropped."""
+        dropped = len(self.queue) >= self.queue_size
+        if dropped:
+            self.queue.popleft()
+            self.missed += 1
+        self.queue.append(data)
+        self._ready.set()
+        return not dropped
+
+    async def frames(self, keepalive: float):
+        """Yield queued frames as they arrive, and a comment after ``keepalive`` idle seconds."""
+        while True:
+            if not self.queue:
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), keepalive)
+                except TimeoutError:
+                    yield KEEPALIVE_FRAME
+                    continue
+            if self.missed:
+                yield frame("lagged", {"missed": self.missed})
+                self.missed = 0
+            yield self.queue.popleft()
+
+
+@dataclass
+class LiveStats:
+    subscribers: int = 0
+    tails: int = 0
+    events: int = 0
+    frames_queued: int = 0
+    frames_dropped: int = 0
+
+
+class LiveFeed:
+    def __init__(self, queue_size: int, poll_seconds: float, batch_size: int):
+        self.queue_size = queue_size
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.stats = LiveStats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._pod_statuses: dict[int, dict[int, int]] = {}
+        self._reading_cursor = 0
+        self._pods_since: Optional[datetime] = None
+
+    @classmethod
+    def from_settings(cls) -> "LiveFeed":
+        return cls(
+            settings.LIVE_STREAM_QUEUE_SIZE,
+            settings.LIVE_STREAM_POLL_SECONDS,
+            settings.LIVE_STREAM_BATCH_SIZE,
+        )
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._subscribers = {}
+        self._pod_statuses = {}
+        self.stats.subscribers = 0
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def subscribe(self, garden_id: int) -> Subscriber:
+        """Register a client of ``garden_id``; it gets changes committed from now on."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The first client of this event loop (tests run one per test)
+            self._start(loop)
+        async with self._lock:
+            if not self._subscribers:
+                # The tail was idle, so start from the current state
+                self._reading_cursor = await sync_to_async(self._last_reading_id)()
+                self._pods_since = timezone.now()
+            if garden_id not in self._subscribers:
+                self._pod_statuses[garden_id] = await sync_to_async(self._pod_snapshot)(garden_id)
+            subscriber = Subscriber(garden_id, self.queue_size)
+            self._subscribers.setdefault(garden_id, set()).add(subscriber)
+        self.stats.subscribers += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.garden_id, set())
+        if subscriber in subscribers:
+            subscribers.discard(subscriber)
+            self.stats.subscribers -= 1
+            if not subscribers:
+                del self._subscribers[subscriber.garden_id]
+                self._pod_statuses.pop(subscriber.garden_id, None)
+
+    def notify(self) -> None:
+        """Wake the tail now; callable from any thread."""
+        if self._loop is None or not self._subscribers:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:  # the loop has closed
+            pass
+
+    def publish(self, garden_id: int, data: bytes) -> None:
+        """Hand one encoded frame to every subscriber of ``garden_id``."""
+        subscribers = self._subscribers.get(garden_id)
+        if not subscribers:
+            return
+        self.stats.events += 1
+        for subscriber in subscribers:
+            if subscriber.push(data):
+                self.stats.frames_queued += 1
+            else:
+                self.stats.frames_dropped += 1
+
+    async def _run(self) -> None:
+        while True:
+            # Without subscribers the task sleeps until woken and reads nothing
+            timeout = self.poll_seconds if self._subscribers else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            if self._subscribers:
+                async with self._lock:
+                    await self.tail()
+
+    async def tail(self) -> None:
+        """Publish every change since the previous tail."""
+        while True:
+            gardens = list(self._subscribers)
+            readings, pods = await sync_to_async(self._changes)(gardens)
+            self.stats.tails += 1
+            for reading in readings:
+                self._reading_cursor = reading["id"]
+                self.publish(reading["garden_id"], frame("reading", reading))
+            for pod in pods:
+                self.publish(pod["garden_id"], frame("pod", pod))
+            if len(readings) < self.batch_size:
+                return
+
+    def _last_reading_id(self) -> int:
+        return GardenEnvironmentLog.objects.aggregate(last=Max("id"))["last"] or 0
+
+    def _pod_snapshot(self, garden_id: int) -> dict[int, int]:
+        return dict(
+            GardenPod.objects.filter(garden_id=garden_id).values_list("pod_number", "status")
+        )
+
+    def _changes(self, gardens: list[int]) -> tuple[list[dict], list[dict]]:
+        readings = list(
+            GardenEnvironmentLog.objects.filter(pk__gt=self._reading_cursor, garden_id__in=gardens)
+            .order_by("pk")
+            .values(*READING_FIELDS)[: self.batch_size]
+        )
+        now = timezone.now()
+        pods = []
+        updated = GardenPod.objects.filter(
+            garden_id__in=gardens, updated_at__gte=self._pods_since - POD_OVERLAP
+        ).values("garden_id", "pod_number", "status", "updated_at")
+        for pod in updated:
+            statuses = self._pod_statuses.get(pod["garden_id"])
+            if statuses is not None and statuses.get(pod["pod_number"]) != pod["status"]:
+                statuses[pod["pod_number"]] = pod["status"]
+                pods.append(pod)
+        self._pods_since = now
+        return readings, pods
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self.stats)
+
+    def reset(self) -> None:
+        """Drop every subscriber and stop the tail."""
+        if self._task is not None and not self._loop.is_closed():
+            self._task.cancel()
+        self._loop = self._task = None
+        self._subscribers = {}
+        self._pod_statuses = {}
+        self.stats = LiveStats()
+
+
+live_feed = LiveFeed.from_settings()
+
+
+def changed() -> None:
+    """Wake the feed once the current transaction commits."""
+    transaction.on_commit(live_feed.notify)
+
+
+async def events(garden_id: int, keepalive: float):
+    """The SSE body of a client of ``garden_id``, subscribed until it disconnects."""
+    subscriber = await live_feed.subscribe(garden_id)
+    try:
+        yield RETRY_FRAME
+        async for data in subscriber.frames(keepalive):
+            yield data
+    finally:
+        live_feed.unsubscribe(subscriber)
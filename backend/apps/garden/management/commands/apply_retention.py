@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.garden.retention import apply_retention, enable_incremental_vacuum
+
+
+class Command(BaseCommand):
+    help = "Delete raw environment readings past retention and reclaim their space"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Keep this many days instead of the setting")
+        parser.add_argument(
+            "--enable-incremental-vacuum",
+            action="store_true",
+            help="First switch the database to auto_vacuum=INCREMENTAL (runs a full VACUUM)",
+        )
+
+    def handle(self, *args, **options):
+        if options["enable_incremental_vacuum"] and enable_incremental_vacuum():
+            self.stdout.write("Switched to auto_vacuum=INCREMENTAL.")
+        result = apply_retention(days=options["days"])
+        if result.cutoff is None:
+            self.stdout.write("Retention is disabled; only vacuumed and optimized.")
+        else:
+            self.stdout.write(
+                f"Deleted {result.deleted} readings before {result.cutoff:%Y-%m-%d} "
+                f"in {result.chunks} chunks; rebuilt rollups of {len(result.rebuilt_gardens)} "
+                f"gardens."
+            )
+        self.stdout.write(
+            f"Reclaimed {result.reclaimed_bytes / 1e6:.1f} MB "
+            f"({result.free_bytes / 1e6:.1f} MB still free in the file) in {result.elapsed:.2f}s."
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0002_alter_gardenenvironmentlog_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GardenEnvironmentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=8)),
+                ('bucket_start', models.DateTimeField()),
+                ('metric', models.CharField(max_length=32)),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0.0)),
+                ('minimum', models.FloatField()),
+                ('maximum', models.FloatField()),
+                ('garden', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='environment_rollups', to='garden.garden')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('garden', 'resolution', 'metric', 'bucket_start'), name='unique_environment_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def renumber_duplicate_pods(apps, schema_editor):
+    """Give every pod sharing a number with an older pod of its garden a new
+    number past the garden's highest, so the unique constraint can be added."""
+    GardenPod = apps.get_model('garden', 'GardenPod')
+    duplicated = (
+        GardenPod.objects.values('garden_id', 'pod_number')
+        .annotate(copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for row in duplicated:
+        pods = GardenPod.objects.filter(garden_id=row['garden_id'])
+        next_number = pods.aggregate(highest=Max('pod_number'))['highest']
+        for pod in pods.filter(pod_number=row['pod_number']).order_by('id')[1:]:
+            next_number += 1
+            note = f'Renumbered from pod {pod.pod_number}'
+            pod.notes = f'{pod.notes}\n{note}' if pod.notes else note
+            pod.pod_number = next_number
+            pod.save(update_fields=['pod_number', 'notes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0003_gardenenvironmentrollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gardenenvironmentlog',
+            name='garden',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='environment_logs', to='garden.garden'),
+        ),
+        migrations.AlterField(
+            model_name='gardenpod',
+            name='garden',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='pods', to='garden.garden'),
+        ),
+        migrations.AddIndex(
+            model_name='gardenenvironmentlog',
+            index=models.Index(fields=['garden', 'timestamp'], name='env_log_garden_time_idx'),
+        ),
+        migrations.RunPython(renumber_duplicate_pods, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gardenpod',
+            constraint=models.UniqueConstraint(fields=('garden', 'pod_number'), name='unique_pod_number_per_garden'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0004_pod_and_log_indexes'),
+        ('seed', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gardenpod',
+            name='planted_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gardenpod',
+            name='seed_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pods', to='seed.seedbatch'),
+        ),
+    ]
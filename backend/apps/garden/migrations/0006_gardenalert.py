@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0005_gardenpod_planted_date_gardenpod_seed_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GardenAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=32)),
+                ('low', models.FloatField(blank=True, null=True)),
+                ('high', models.FloatField(blank=True, null=True)),
+                ('value', models.FloatField()),
+                ('raised_at', models.DateTimeField()),
+                ('cleared_at', models.DateTimeField(blank=True, null=True)),
+                ('clear_value', models.FloatField(blank=True, null=True)),
+                ('garden', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='garden.garden')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['garden', 'raised_at'], name='garden_alert_time_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('cleared_at__isnull', True)), fields=('garden', 'metric'), name='unique_open_garden_alert')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-17 14:06
+
+from django.db import migrations, models
+
+
+def log_existing(apps, schema_editor):
+    """Log every garden and pod once, so a sync from cursor 0 returns all of them."""
+    Garden = apps.get_model("garden", "Garden")
+    GardenPod = apps.get_model("garden", "GardenPod")
+    GardenChange = apps.get_model("garden", "GardenChange")
+    for entity, model in (("garden", Garden), ("pod", GardenPod)):
+        ids = model.objects.order_by("id").values_list("id", flat=True).iterator(chunk_size=2000)
+        GardenChange.objects.bulk_create(
+            (GardenChange(entity=entity, object_id=pk) for pk in ids), batch_size=2000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0006_gardenalert'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GardenChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('garden', 'Garden'), ('pod', 'Pod')], max_length=8)),
+                ('object_id', models.PositiveIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity', 'object_id'], name='garden_change_object_idx')],
+            },
+        ),
+        migrations.RunPython(log_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-17 14:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0007_gardenchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnomalyCheckpoint',
+            fields=[
+                ('garden', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='anomaly_checkpoint', serialize=False, to='garden.garden')),
+                ('last_reading_id', models.PositiveBigIntegerField(default=0)),
+                ('state', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GardenAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=32)),
+                ('kind', models.CharField(choices=[('spike', 'Spike'), ('stuck', 'Stuck'), ('drift', 'Drift')], max_length=8)),
+                ('value', models.FloatField()),
+                ('expected', models.FloatField()),
+                ('score', models.FloatField()),
+                ('detected_at', models.DateTimeField()),
+                ('garden', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='anomalies', to='garden.garden')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['garden', 'detected_at'], name='garden_anomaly_time_idx')],
+            },
+        ),
+    ]
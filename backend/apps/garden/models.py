@@ -1,7 +1,5 @@
-from datetime import datetime
-from typing import Optional
-
 from django.db import models
+from django.utils import timezone
 
 
 class PodStatus(models.IntegerChoices):
@@ -12,6 +10,16 @@ class PodStatus(models.IntegerChoices):
     MAINTENANCE = 4
 
 
+# Status changes a pod may go through; any status can go to maintenance
+POD_TRANSITIONS = {
+    PodStatus.EMPTY: {PodStatus.PLANTED, PodStatus.MAINTENANCE},
+    PodStatus.PLANTED: {PodStatus.GROWING, PodStatus.EMPTY, PodStatus.MAINTENANCE},
+    PodStatus.GROWING: {PodStatus.HARVESTING, PodStatus.EMPTY, PodStatus.MAINTENANCE},
+    PodStatus.HARVESTING: {PodStatus.GROWING, PodStatus.EMPTY, PodStatus.MAINTENANCE},
+    PodStatus.MAINTENANCE: {PodStatus.EMPTY},
+}
+
+
 class Garden(models.Model):
     """Hydroponic garden system configuration"""
 
@@ -36,29 +44,51 @@ class GardenPod(models.Model):
 
     pod_number = models.PositiveIntegerField()
     name = models.CharField(max_length=100, null=True, blank=True)
-    garden = models.ForeignKey(Garden, on_delete=models.CASCADE, related_name="pods")
+    # Indexed through the (garden, pod_number) unique constraint below
+    garden = models.ForeignKey(
+        Garden, on_delete=models.CASCADE, related_name="pods", db_index=False
+    )
     status = models.IntegerField(choices=PodStatus, default=PodStatus.EMPTY)
 
     # Seed assignment
-    seed_batch_id: Optional[str] = None  # Reference to SeedBatch if planted
+    seed_batch = models.ForeignKey(
+        "seed.SeedBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="pods",
+    )
 
     # Planting info
-    planted_date: Optional[datetime] = None
+    planted_date = models.DateTimeField(null=True, blank=True)
 
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["garden", "pod_number"], name="unique_pod_number_per_garden"
+            )
+        ]
+
     def __str__(self):
-        return f"Pod {self.pod_number} in {self.garden.name}"
+        # Never load the garden just to print a pod
+        if GardenPod.garden.is_cached(self):
+            return f"Pod {self.pod_number} in {self.garden.name}"
+        return f"Pod {self.pod_number} in garden {self.garden_id}"
 
 
 class GardenEnvironmentLog(models.Model):
     """Environmental measurements for the entire garden system"""
 
-    garden = models.ForeignKey(Garden, on_delete=models.CASCADE, related_name="environment_logs")
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Indexed through the (garden, timestamp) index below
+    garden = models.ForeignKey(
+        Garden, on_delete=models.CASCADE, related_name="environment_logs", db_index=False
+    )
+    timestamp = models.DateTimeField(default=timezone.now)
 
     # Water quality
     ph_level = models.FloatField(null=True, blank=True)
@@ -74,5 +104,134 @@ class GardenEnvironmentLog(models.Model):
     # Notes
     notes = models.TextField(null=True, blank=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["garden", "timestamp"], name="env_log_garden_time_idx")]
+
+    def __str__(self):
+        if GardenEnvironmentLog.garden.is_cached(self):
+            return f"Env Log for {self.garden.name} at {self.timestamp}"
+        return f"Env Log for garden {self.garden_id} at {self.timestamp}"
+
+
+class RollupResolution(models.TextChoices):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class GardenEnvironmentRollup(models.Model):
+    """Pre-aggregated bucket of one environment metric for a garden"""
+
+    garden = models.ForeignKey(Garden, on_delete=models.CASCADE, related_name="environment_rollups")
+    resolution = models.CharField(max_length=8, choices=RollupResolution)
+    bucket_start = models.DateTimeField()
+    metric = models.CharField(max_length=32)
+
+    # Running aggregates; the mean is total / sample_count
+    sample_count = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0.0)
+    minimum = models.FloatField()
+    maximum = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["garden", "resolution", "metric", "bucket_start"],
+                name="unique_environment_rollup_bucket",
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.metric} {self.resolution} rollup for garden {self.garden_id} "
+            f"at {self.bucket_start}"
+        )
+
+
+class GardenAlert(models.Model):
+    """A metric outside the band every seed planted in the garden tolerates"""
+
+    garden = models.ForeignKey(
+        Garden, on_delete=models.CASCADE, related_name="alerts", db_index=False
+    )
+    metric = models.CharField(max_length=32)
+    # The envelope when the alert was raised; NULL means unbounded on that side
+    low = models.FloatField(null=True, blank=True)
+    high = models.FloatField(null=True, blank=True)
+    value = models.FloatField()
+    raised_at = models.DateTimeField()
+    cleared_at = models.DateTimeField(null=True, blank=True)
+    clear_value = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["garden", "raised_at"], name="garden_alert_time_idx")]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["garden", "metric"],
+                condition=models.Q(cleared_at__isnull=True),
+                name="unique_open_garden_alert",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.metric} alert raised at {self.raised_at}"
+
+
+class AnomalyKind(models.TextChoices):
+    SPIKE = "spike"
+    STUCK = "stuck"
+    DRIFT = "drift"
+
+
+class GardenAnomaly(models.Model):
+    """A reading the garden's rolling statistics of the metric did not expect"""
+
+    garden = models.ForeignKey(
+        Garden, on_delete=models.CASCADE, related_name="anomalies", db_index=False
+    )
+    metric = models.CharField(max_length=32)
+    kind = models.CharField(max_length=8, choices=AnomalyKind)
+    value = models.FloatField()
+    # The rolling mean for spikes and stuck sensors, the long-run baseline for drift
+    expected = models.FloatField()
+    # Standard deviations off, or identical readings in a row for a stuck sensor
+    score = models.FloatField()
+    detected_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["garden", "detected_at"], name="garden_anomaly_time_idx")]
+
+    def __str__(self):
+        return f"{self.metric} {self.kind} at {self.detected_at}"
+
+
+class AnomalyCheckpoint(models.Model):
+    """Rolling statistics of a garden's metrics, as of its reading ``last_reading_id``"""
+
+    garden = models.OneToOneField(
+        Garden, on_delete=models.CASCADE, primary_key=True, related_name="anomaly_checkpoint"
+    )
+    last_reading_id = models.PositiveBigIntegerField(default=0)
+    state = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"Anomaly checkpoint of garden {self.garden_id}"
+
+
+class SyncEntity(models.TextChoices):
+    GARDEN = "garden"
+    POD = "pod"
+
+
+class GardenChange(models.Model):
+    """A write to a garden or pod, logged for delta sync; the id is the sync cursor"""
+
+    entity = models.CharField(max_length=8, choices=SyncEntity)
+    # No foreign key: tombstones outlive the rows they stand for
+    object_id = models.PositiveIntegerField()
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["entity", "object_id"], name="garden_change_object_idx")]
+
     def __str__(self):
-        return f"Env Log for {self.garden.name} at {self.timestamp}"
+        return f"{self.entity} {self.object_id} {'deleted' if self.deleted else 'changed'}"
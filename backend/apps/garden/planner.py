@@ -0,0 +1,289 @@
+"""Planting planner: which pending seed batch goes into which pod, and when.
+
+Pod occupancy is kept in a segment tree over the pods holding, per node, the
+earliest day any pod below it becomes free. The planner walks forward in
+time: on the earliest day a pod frees up it plants the released batch whose
+harvest day is least crowded (longest crop first on ties), so pods are never
+left idle while a batch could use them and harvests spread out across days.
+When even the best choice would exceed ``max_harvests_per_day`` the planting
+slips a day. Each placement costs ``O(durations + log pods)``, so a year for
+a thousand pods plans in milliseconds.
+
+Planned plantings are stored as open ``transplant`` tasks on their pods; they
+count as occupancy for later plans, and their batches are no longer pending.
+"""
+
+import math
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.seed.models import SeedBatch
+from apps.task.models import OPEN_STATUSES, Task, TaskScope, TaskType
+
+from .models import Garden, GardenPod, PodStatus
+
+INFINITY = math.inf
+
+
+class OccupancyTree:
+    """Segment tree over pods of the first day each pod is free for good."""
+
+    def __init__(self, free_from: Sequence[float]):
+        self.size = 1
+        while self.size < max(len(free_from), 1):
+            self.size *= 2
+        self.nodes = [INFINITY] * (2 * self.size)
+        self.nodes[self.size : self.size + len(free_from)] = free_from
+        for i in range(self.size - 1, 0, -1):
+            self.nodes[i] = min(self.nodes[2 * i], self.nodes[2 * i + 1])
+
+    def earliest(self) -> float:
+        """First day any pod is free."""
+        return self.nodes[1]
+
+    def first_free(self, day: int) -> int:
+        """Lowest-numbered pod free on ``day``; there must be one."""
+        i = 1
+        while i < self.size:
+            i = 2 * i if self.nodes[2 * i] <= day else 2 * i + 1
+        return i - self.size
+
+    def book(self, pod: int, until: int) -> None:
+        """Occupy ``pod`` up to (excluding) day ``until``."""
+        i = pod + self.size
+        self.nodes[i] = until
+        i //= 2
+        while i:
+            self.nodes[i] = min(self.nodes[2 * i], self.nodes[2 * i + 1])
+            i //= 2
+
+
+@dataclass(frozen=True)
+class Placement:
+    batch: int  # index into the batches given to plan_plantings
+    pod: int  # index into free_from
+    start: int
+    end: int
+
+
+def plan_plantings(
+    releases: Sequence[int],
+    durations: Sequence[int],
+    free_from: Sequence[float],
+    last_day: int,
+    max_harvests_per_day: int,
+) -> list[Placement]:
+    """Place batches (released on ``releases[i]``, growing ``durations[i]`` days)
+    into pods (free from ``free_from[j]``), planting no later than ``last_day``.
+
+    Days are plain integers (e.g. ordinals). Batches that do not fit are left out.
+    """
+    # One queue per crop length, each in release order
+    queues: dict[int, deque[int]] = defaultdict(deque)
+    for i in sorted(range(len(releases)), key=lambda i: releases[i]):
+        queues[durations[i]].append(i)
+    tree = OccupancyTree(free_from)
+    harvests: Counter[int] = Counter()
+    placements = []
+    day = -INFINITY
+    while queues:
+        day = max(day, tree.earliest())
+        if day > last_day:
+            break
+        ready = [length for length, queue in queues.items() if releases[queue[0]] <= day]
+        if not ready:
+            day = min(releases[queue[0]] for queue in queues.values())
+            continue
+        length = min(ready, key=lambda length: (harvests[day + length], -length))
+        if harvests[day + length] >= max_harvests_per_day:
+            day += 1
+            continue
+        batch = queues[length].popleft()
+        if not queues[length]:
+            del queues[length]
+        pod = tree.first_free(day)
+        tree.book(pod, day + length)
+        harvests[day + length] += 1
+        placements.append(Placement(batch=batch, pod=pod, start=int(day), end=int(day + length)))
+    return placements
+
+
+@dataclass
+class PlannedPlanting:
+    batch_id: int
+    pod_id: int
+    pod_number: int
+    plant_on: date
+    harvest_on: date
+
+
+@dataclass
+class PlantingPlan:
+    garden_id: int
+    start: date
+    end: date
+    max_harvests_per_day: int
+    plantings: list[PlannedPlanting] = field(default_factory=list)
+    unplanned: list[int] = field(default_factory=list)
+    utilization: float = 0.0
+
+
+def growing_days(batch: SeedBatch) -> int:
+    """Days a batch holds its pod, from planting to harvest."""
+    if batch.actual_germination_date is not None:
+        return max(batch.seed.days_to_harvest, 1)
+    return max(batch.seed.germination_days + batch.seed.days_to_harvest, 1)
+
+
+def _planned_tasks():
+    return Task.objects.filter(
+        task_type=TaskType.TRANSPLANT, status__in=OPEN_STATUSES, seed_batch__isnull=False
+    )
+
+
+def _pending():
+    return SeedBatch.objects.filter(
+        is_active=True, actual_harvest_date__isnull=True, pods__isnull=True
+    ).exclude(Exists(_planned_tasks().filter(seed_batch=OuterRef("pk"))))
+
+
+def pending_batches() -> list[SeedBatch]:
+    """Active, unharvested batches not in a pod and not already planned."""
+    return list(_pending().select_related("seed").order_by("id"))
+
+
+def _pod_free_from(garden: Garden, today: date) -> tuple[list[GardenPod], list[int]]:
+    in_use = GardenPod.objects.filter(garden=garden).exclude(status=PodStatus.MAINTENANCE)
+    pods = list(in_use.select_related("seed_batch__seed").order_by("pod_number"))
+    free_from = {}
+    for pod in pods:
+        free = today
+        batch = pod.seed_batch
+        if batch is not None and batch.is_active and batch.actual_harvest_date is None:
+            if batch.predicted_harvest_date is not None:
+                free = batch.predicted_harvest_date
+            elif pod.planted_date is not None:
+                free = pod.planted_date.date() + timedelta(days=growing_days(batch))
+        free_from[pod.pk] = max(free, today)
+
+    planned = _planned_tasks().filter(pod__in=in_use).select_related("seed_batch__seed")
+    for task in planned:
+        until = task.scheduled_date.date() + timedelta(days=growing_days(task.seed_batch))
+        free_from[task.pod_id] = max(free_from[task.pod_id], until)
+    return pods, [free_from[pod.pk].toordinal() for pod in pods]
+
+
+def plan_garden(
+    garden: Garden,
+    start: Optional[date] = None,
+    horizon_days: Optional[int] = None,
+    max_harvests_per_day: Optional[int] = None,
+) -> PlantingPlan:
+    """Plan the pending batches into ``garden``'s pods over ``horizon_days``.
+
+    Without ``max_harvests_per_day`` the cap is the garden's steady-state rate:
+    its pods divided by the mean growing time of the pending batches.
+    """
+    today = start or timezone.localdate()
+    horizon_days = horizon_days or settings.PLANTING_HORIZON_DAYS
+    last_day = today.toordinal() + horizon_days - 1
+    pods, free_from = _pod_free_from(garden, today)
+    batches = pending_batches()
+    releases = [max(batch.germination_start_date, today).toordinal() for batch in batches]
+    durations = [growing_days(batch) for batch in batches]
+    if max_harvests_per_day is None:
+        mean = sum(durations) / len(durations) if durations else 1
+        max_harvests_per_day = max(math.ceil(len(pods) / mean), 1)
+
+    plan = PlantingPlan(
+        garden_id=garden.pk,
+        start=today,
+        end=date.fromordinal(last_day),
+        max_harvests_per_day=max_harvests_per_day,
+    )
+    placements = plan_plantings(releases, durations, free_from, last_day, max_harvests_per_day)
+    placed = set()
+    for placement in placements:
+        pod = pods[placement.pod]
+        placed.add(placement.batch)
+        plan.plantings.append(
+            PlannedPlanting(
+                batch_id=batches[placement.batch].pk,
+                pod_id=pod.pk,
+                pod_number=pod.pod_number,
+                plant_on=date.fromordinal(placement.start),
+                harvest_on=date.fromordinal(placement.end),
+            )
+        )
+    plan.plantings.sort(key=lambda planting: (planting.plant_on, planting.pod_number))
+    plan.unplanned = [batch.pk for i, batch in enumerate(batches) if i not in placed]
+    plan.utilization = _utilization(plan, free_from)
+    return plan
+
+
+def _utilization(plan: PlantingPlan, free_from: Sequence[int]) -> float:
+    """Share of pod-days in the plan's horizon growing something, old or new."""
+    if not free_from:
+        return 0.0
+    first_day, window_end = plan.start.toordinal(), plan.end.toordinal() + 1
+    busy = sum(min(free, window_end) - first_day for free in free_from)
+    busy += sum(
+        min(p.harvest_on.toordinal(), window_end) - p.plant_on.toordinal() for p in plan.plantings
+    )
+    return busy / (len(free_from) * (window_end - first_day))
+
+
+def apply_plan(plan: PlantingPlan) -> list[Task]:
+    """Store the plan's plantings as open transplant tasks on their pods.
+
+    The plan is checked again against the pods and batches as they are now,
+    in the transaction that stores it, so plans applied at once can book
+    neither a batch nor a pod twice. Plantings whose batch was planned since
+    are dropped; those whose pod is taken by then go back to ``unplanned``.
+    The plan's utilization is recomputed to match what was stored.
+    """
+    with transaction.atomic():
+        garden = Garden.objects.get(pk=plan.garden_id)
+        pods, free_from = _pod_free_from(garden, plan.start)
+        free = {pod.pk: day for pod, day in zip(pods, free_from)}
+        pending = set(_pending().values_list("pk", flat=True))
+        kept = []
+        for planting in plan.plantings:
+            if planting.batch_id not in pending:
+                continue
+            plant_on = planting.plant_on.toordinal()
+            if planting.pod_id not in free or plant_on < free[planting.pod_id]:
+                plan.unplanned.append(planting.batch_id)
+                continue
+            free[planting.pod_id] = planting.harvest_on.toordinal()
+            kept.append(planting)
+        plan.plantings = kept
+        plan.unplanned.sort()
+        plan.utilization = _utilization(plan, free_from)
+        return Task.objects.bulk_create(_transplant_tasks(plan), batch_size=500)
+
+
+def _transplant_tasks(plan: PlantingPlan) -> list[Task]:
+    tasks = []
+    for planting in plan.plantings:
+        scheduled = timezone.make_aware(datetime.combine(planting.plant_on, time()))
+        task = Task(
+            task_type=TaskType.TRANSPLANT,
+            scope=TaskScope.POD,
+            title=f"Plant batch {planting.batch_id} in pod {planting.pod_number}",
+            seed_batch_id=planting.batch_id,
+            garden_id=plan.garden_id,
+            pod_id=planting.pod_id,
+            scheduled_date=scheduled,
+            due_date=scheduled + timedelta(days=1),
+        )
+        task.reset_schedule()  # bulk_create skips Task.save
+        tasks.append(task)
+    return tasks
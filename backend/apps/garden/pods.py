@@ -0,0 +1,110 @@
+"""Bulk pod provisioning and status transitions.
+
+Both operations validate everything first and then write with a single
+statement inside one transaction, so a request either applies to every pod
+or to none. Bulk writes skip model signals, so the cached garden responses
+are invalidated, live streams woken and the pods logged for sync explicitly.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.cache import garden_scope, invalidate
+
+from . import live, sync
+from .models import POD_TRANSITIONS, Garden, GardenPod, PodStatus, SyncEntity
+
+# Offending pod numbers listed in an error message before it is cut short
+MAX_REPORTED_PODS = 20
+
+
+class PodBulkError(ValueError):
+    """A bulk request that cannot be applied as a whole."""
+
+
+def _listed(numbers: Iterable[int]) -> str:
+    numbers = sorted(numbers)
+    listed = ", ".join(str(n) for n in numbers[:MAX_REPORTED_PODS])
+    if len(numbers) > MAX_REPORTED_PODS:
+        listed += f" and {len(numbers) - MAX_REPORTED_PODS} more"
+    return listed
+
+
+@dataclass
+class ProvisionResult:
+    created: int
+    existing: int
+
+
+def provision_pods(garden: Garden, status: PodStatus = PodStatus.EMPTY) -> ProvisionResult:
+    """Create every missing pod numbered 1..``garden.total_pods``."""
+    with transaction.atomic():
+        pods = GardenPod.objects.filter(garden=garden, pod_number__lte=garden.total_pods)
+        existing = set(pods.values_list("pod_number", flat=True))
+        last_pk = GardenPod.objects.aggregate(last=Max("pk"))["last"] or 0
+        missing = [
+            GardenPod(garden=garden, pod_number=number, status=status)
+            for number in range(1, garden.total_pods + 1)
+            if number not in existing
+        ]
+        # A concurrent provision of the same garden cannot create duplicates,
+        # so what was created is counted from the table, not from ``missing``
+        GardenPod.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+        created = pods.count() - len(existing)
+        if created:
+            sync.log_changes(
+                SyncEntity.POD, pods.filter(pk__gt=last_pk).values_list("pk", flat=True)
+            )
+            invalidate(garden_scope(garden.pk))
+            live.changed()
+    return ProvisionResult(created=created, existing=len(existing))
+
+
+def transition_pods(
+    garden: Garden,
+    pod_numbers: list[int],
+    status: PodStatus,
+    from_status: Optional[PodStatus] = None,
+) -> int:
+    """Move the given pods to ``status``; returns the number of pods updated.
+
+    Raises :class:`PodBulkError` without writing anything when a pod does not
+    exist, is not in ``from_status`` or cannot move to ``status``.
+    """
+    requested = set(pod_numbers)
+    if len(requested) != len(pod_numbers):
+        raise PodBulkError("Pod numbers must not repeat")
+
+    with transaction.atomic():
+        rows = list(
+            GardenPod.objects.filter(garden=garden, pod_number__in=requested).values_list(
+                "pod_number", "status", "pk"
+            )
+        )
+        current = {number: status for number, status, _ in rows}
+        unknown = requested - current.keys()
+        if unknown:
+            raise PodBulkError(f"Unknown pod numbers: {_listed(unknown)}")
+        if from_status is not None:
+            unexpected = [n for n, s in current.items() if s != from_status]
+            if unexpected:
+                raise PodBulkError(
+                    f"Pods not in status {PodStatus(from_status).label}: {_listed(unexpected)}"
+                )
+        blocked = [
+            n for n, s in current.items() if s != status and status not in POD_TRANSITIONS[s]
+        ]
+        if blocked:
+            raise PodBulkError(f"Pods cannot move to {PodStatus(status).label}: {_listed(blocked)}")
+
+        updated = GardenPod.objects.filter(garden=garden, pod_number__in=requested).update(
+            status=status, updated_at=timezone.now()
+        )
+        sync.log_changes(SyncEntity.POD, [pk for *_, pk in rows])
+        invalidate(garden_scope(garden.pk))
+        live.changed()
+    return updated
@@ -0,0 +1,160 @@
+"""Retention of raw environment readings.
+
+Readings older than ``RETENTION_RAW_DAYS`` are deleted, garden by garden,
+``RETENTION_DELETE_CHUNK`` rows per transaction with a short pause in between,
+so ingestion never waits long for the SQLite write lock. The cutoff is floored
+to a UTC day so only whole rollup buckets lose their raw rows, and before
+deleting, the hourly and daily rollups of the range are checked against the
+raw readings and rebuilt when they disagree (for readings that bypassed
+ingestion). History stays available from the rollups.
+
+Deleted pages go to SQLite's freelist. When the database uses
+``auto_vacuum=INCREMENTAL`` (see :func:`enable_incremental_vacuum`) up to
+``RETENTION_VACUUM_PAGES`` of them are returned to the filesystem after each
+run; ``PRAGMA optimize`` then refreshes the planner statistics.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import Garden, GardenEnvironmentLog, GardenEnvironmentRollup, RollupResolution
+from .rollups import BUCKET_WIDTHS, ENVIRONMENT_METRICS, bucket_start, rebuild_rollups
+
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class RetentionResult:
+    cutoff: Optional[datetime] = None
+    deleted: int = 0
+    chunks: int = 0
+    rebuilt_gardens: list[int] = field(default_factory=list)
+    reclaimed_bytes: int = 0
+    free_bytes: int = 0
+    elapsed: float = 0.0
+
+
+def _pragma(name: str) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def database_size() -> int:
+    return _pragma("page_count") * _pragma("page_size")
+
+
+def retention_cutoff(days: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the UTC day ``days`` before ``now``; older readings are dropped."""
+    moment = (now or timezone.now()).astimezone(dt_timezone.utc) - timedelta(days=days)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rollups_cover(garden_id: int, start: datetime, cutoff: datetime) -> bool:
+    """Whether every reading in ``[start, cutoff)`` is counted in both rollup resolutions.
+
+    Both bounds are day-aligned, so the buckets in the range hold exactly the
+    readings in it.
+    """
+    raw = GardenEnvironmentLog.objects.filter(
+        garden_id=garden_id, timestamp__gte=start, timestamp__lt=cutoff
+    ).aggregate(**{metric: Count(metric) for metric in ENVIRONMENT_METRICS})
+    counted = {
+        (row["resolution"], row["metric"]): row["samples"]
+        for row in GardenEnvironmentRollup.objects.filter(
+            garden_id=garden_id, bucket_start__gte=start, bucket_start__lt=cutoff
+        )
+        .values("resolution", "metric")
+        .annotate(samples=Sum("sample_count"))
+        .order_by()
+    }
+    return all(
+        counted.get((str(resolution), metric), 0) == raw[metric]
+        for resolution in BUCKET_WIDTHS
+        for metric in ENVIRONMENT_METRICS
+    )
+
+
+def _delete_before(garden_id: int, cutoff: datetime, chunk: int, pause: float) -> tuple[int, int]:
+    deleted = chunks = 0
+    old = GardenEnvironmentLog.objects.filter(garden_id=garden_id, timestamp__lt=cutoff)
+    while ids := list(old.order_by("timestamp").values_list("id", flat=True)[:chunk]):
+        # Autocommit: each chunk is its own short write transaction
+        deleted += GardenEnvironmentLog.objects.filter(id__in=ids).delete()[0]
+        chunks += 1
+        if pause and len(ids) == chunk:
+            time.sleep(pause)
+    return deleted, chunks
+
+
+def apply_retention(
+    days: Optional[int] = None,
+    now: Optional[datetime] = None,
+    chunk: Optional[int] = None,
+    pause: Optional[float] = None,
+    vacuum_pages: Optional[int] = None,
+) -> RetentionResult:
+    """Delete raw readings past retention and give the freed space back."""
+    started = time.perf_counter()
+    days = settings.RETENTION_RAW_DAYS if days is None else days
+    chunk = chunk or settings.RETENTION_DELETE_CHUNK
+    pause = settings.RETENTION_CHUNK_PAUSE_SECONDS if pause is None else pause
+    vacuum_pages = settings.RETENTION_VACUUM_PAGES if vacuum_pages is None else vacuum_pages
+
+    result = RetentionResult()
+    size_before = database_size()
+    if days:
+        result.cutoff = cutoff = retention_cutoff(days, now)
+        for garden_id in Garden.objects.order_by("id").values_list("id", flat=True):
+            oldest = (
+                GardenEnvironmentLog.objects.filter(garden_id=garden_id, timestamp__lt=cutoff)
+                .order_by("timestamp")
+                .values_list("timestamp", flat=True)
+                .first()
+            )
+            if oldest is None:
+                continue
+            # Earlier buckets already lost their raw readings; leave their rollups alone
+            start = bucket_start(oldest, RollupResolution.DAY)
+            if not _rollups_cover(garden_id, start, cutoff):
+                rebuild_rollups(garden_id, start, cutoff)
+                result.rebuilt_gardens.append(garden_id)
+            deleted, chunks = _delete_before(garden_id, cutoff, chunk, pause)
+            result.deleted += deleted
+            result.chunks += chunks
+
+    if _pragma("auto_vacuum") == AUTO_VACUUM_INCREMENTAL:
+        # The pragma frees one page per step and Cursor.execute only steps once;
+        # executescript runs it to completion.
+        connection.ensure_connection()
+        connection.connection.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA optimize")
+    result.reclaimed_bytes = max(size_before - database_size(), 0)
+    result.free_bytes = _pragma("freelist_count") * _pragma("page_size")
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def enable_incremental_vacuum() -> bool:
+    """Switch the database to ``auto_vacuum=INCREMENTAL``.
+
+    Takes a full ``VACUUM``, which rewrites the whole file and blocks writers
+    while it runs, so do it once during maintenance. Returns False when the
+    mode was already set.
+    """
+    if _pragma("auto_vacuum") == AUTO_VACUUM_INCREMENTAL:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+    return True
@@ -0,0 +1,212 @@
+"""Hourly and daily rollups of environment readings.
+
+Rollup rows keep a running count/sum/min/max per garden, resolution, metric and
+bucket, so they can be merged incrementally as readings arrive and charts over
+months of data read a few hundred rows instead of every raw reading.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import GardenEnvironmentLog, GardenEnvironmentRollup, RollupResolution
+
+ENVIRONMENT_METRICS = (
+    "ph_level",
+    "ec_level",
+    "water_temp_c",
+    "dissolved_oxygen",
+    "air_temp_c",
+    "humidity_percent",
+    "light_intensity_lux",
+)
+
+# Bucket widths, finest first
+BUCKET_WIDTHS = {
+    RollupResolution.HOUR: timedelta(hours=1),
+    RollupResolution.DAY: timedelta(days=1),
+}
+
+_TRUNC_FUNCTIONS = {RollupResolution.HOUR: TruncHour, RollupResolution.DAY: TruncDay}
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Floor ``timestamp`` to the UTC start of its bucket."""
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    if resolution == RollupResolution.DAY:
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def pick_resolution(start: datetime, end: datetime, step: Optional[timedelta], max_points: int):
+    """Return the coarsest bucket no wider than the requested step.
+
+    Without an explicit ``step`` the range is divided into ``max_points``
+    points. Requests finer than the narrowest bucket get the narrowest bucket.
+    """
+    if step is None:
+        step = (end - start) / max(max_points, 1)
+    chosen = RollupResolution.HOUR
+    for resolution, width in BUCKET_WIDTHS.items():
+        if width <= step:
+            chosen = resolution
+    return chosen
+
+
+def _merge_sql() -> str:
+    table = connection.ops.quote_name(GardenEnvironmentRollup._meta.db_table)
+    return (
+        f"INSERT INTO {table} "
+        "(garden_id, resolution, bucket_start, metric, sample_count, total, minimum, maximum) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+        "ON CONFLICT (garden_id, resolution, metric, bucket_start) DO UPDATE SET "
+        "sample_count = sample_count + excluded.sample_count, "
+        "total = total + excluded.total, "
+        "minimum = MIN(minimum, excluded.minimum), "
+        "maximum = MAX(maximum, excluded.maximum)"
+    )
+
+
+def record_readings(logs: Iterable[GardenEnvironmentLog]) -> int:
+    """Fold freshly inserted readings into every rollup resolution.
+
+    The readings are pre-aggregated in memory and merged with a single upsert
+    per bucket, so the cost depends on the number of buckets touched rather
+    than on the existing table size. Returns the number of bucket rows merged.
+    """
+    buckets: dict[tuple, list[float]] = {}
+    for log in logs:
+        for resolution in BUCKET_WIDTHS:
+            start = bucket_start(log.timestamp, resolution)
+            for metric in ENVIRONMENT_METRICS:
+                value = getattr(log, metric)
+                if value is None:
+                    continue
+                key = (log.garden_id, resolution, start, metric)
+                agg = buckets.get(key)
+                if agg is None:
+                    buckets[key] = [1, value, value, value]
+                else:
+                    agg[0] += 1
+                    agg[1] += value
+                    agg[2] = min(agg[2], value)
+                    agg[3] = max(agg[3], value)
+
+    if not buckets:
+        return 0
+    params = [
+        (
+            garden_id,
+            str(resolution),
+            connection.ops.adapt_datetimefield_value(start),
+            metric,
+            count,
+            total,
+            minimum,
+            maximum,
+        )
+        for (garden_id, resolution, start, metric), (count, total, minimum, maximum) in (
+            buckets.items()
+        )
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(_merge_sql(), params)
+    return len(params)
+
+
+def rebuild_rollups(
+    garden_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> int:
+    """Recompute rollups for whole buckets overlapping ``[start, end)`` from raw readings.
+
+    Used to backfill data that bypassed :func:`record_readings`. Returns the
+    number of bucket rows written.
+    """
+    written = 0
+    with transaction.atomic():
+        for resolution, width in BUCKET_WIDTHS.items():
+            logs = GardenEnvironmentLog.objects.filter(garden_id=garden_id)
+            rollups = GardenEnvironmentRollup.objects.filter(
+                garden_id=garden_id, resolution=resolution
+            )
+            if start is not None:
+                lower = bucket_start(start, resolution)
+                logs = logs.filter(timestamp__gte=lower)
+                rollups = rollups.filter(bucket_start__gte=lower)
+            if end is not None:
+                upper = bucket_start(end, resolution)
+                if upper < end:
+                    upper += width
+                logs = logs.filter(timestamp__lt=upper)
+                rollups = rollups.filter(bucket_start__lt=upper)
+            rollups.delete()
+
+            bucket = _TRUNC_FUNCTIONS[resolution]("timestamp", tzinfo=dt_timezone.utc)
+            rows = []
+            for metric in ENVIRONMENT_METRICS:
+                aggregates = (
+                    logs.filter(**{f"{metric}__isnull": False})
+                    .annotate(bucket=bucket)
+                    .values("bucket")
+                    .annotate(
+                        sample_count=Count(metric),
+                        total=Sum(metric),
+                        minimum=Min(metric),
+                        maximum=Max(metric),
+                    )
+                    .order_by()
+                )
+                rows.extend(
+                    GardenEnvironmentRollup(
+                        garden_id=garden_id,
+                        resolution=resolution,
+                        bucket_start=agg["bucket"],
+                        metric=metric,
+                        sample_count=agg["sample_count"],
+                        total=agg["total"],
+                        minimum=agg["minimum"],
+                        maximum=agg["maximum"],
+                    )
+                    for agg in aggregates
+                )
+            GardenEnvironmentRollup.objects.bulk_create(rows, batch_size=1000)
+            written += len(rows)
+    return written
+
+
+def query_rollups(
+    garden_id: int,
+    start: datetime,
+    end: datetime,
+    resolution: str,
+    metrics: Iterable[str] = ENVIRONMENT_METRICS,
+) -> list[dict]:
+    """Return buckets in ``[start, end)`` as ``{"bucket_start", "metrics": {name: stats}}``."""
+    points: dict[datetime, dict] = defaultdict(dict)
+    rows = (
+        GardenEnvironmentRollup.objects.filter(
+            garden_id=garden_id,
+            resolution=resolution,
+            metric__in=list(metrics),
+            bucket_start__gte=bucket_start(start, resolution),
+            bucket_start__lt=end,
+        )
+        .order_by("bucket_start")
+        .values_list("bucket_start", "metric", "sample_count", "total", "minimum", "maximum")
+    )
+    for start_at, metric, count, total, minimum, maximum in rows:
+        points[start_at][metric] = {
+            "count": count,
+            "min": minimum,
+            "max": maximum,
+            "mean": total / count if count else None,
+        }
+    return [{"bucket_start": start_at, "metrics": stats} for start_at, stats in points.items()]
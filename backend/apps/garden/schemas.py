@@ -1,6 +1,16 @@
-from ninja import ModelSchema
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
-from .models import Garden, GardenEnvironmentLog, GardenPod
+from ninja import Field, ModelSchema, Schema
+
+from .models import (
+    Garden,
+    GardenAlert,
+    GardenAnomaly,
+    GardenEnvironmentLog,
+    GardenPod,
+    PodStatus,
+)
 
 
 class GardenSchema(ModelSchema):
@@ -12,16 +22,183 @@ class GardenSchema(ModelSchema):
 
 
 class PodSchema(ModelSchema):
-    """Schema for creating a new pod"""
+    """Pod as returned by the API"""
 
     class Meta:
         model = GardenPod
         exclude = ["id", "created_at", "updated_at"]
 
 
+class PodCreateSchema(ModelSchema):
+    """Schema for creating a new pod; the garden comes from the URL"""
+
+    class Meta:
+        model = GardenPod
+        exclude = ["id", "garden", "created_at", "updated_at"]
+
+
+class PodProvisionSchema(Schema):
+    """Status given to the pods created by provisioning"""
+
+    status: PodStatus = PodStatus.EMPTY
+
+
+class PodProvisionResultSchema(Schema):
+    created: int
+    existing: int
+
+
+class PodStatusTransitionSchema(Schema):
+    """Move a set of pods to a new status, optionally only from an expected one"""
+
+    pod_numbers: List[int] = Field(..., min_length=1)
+    status: PodStatus
+    from_status: Optional[PodStatus] = None
+
+    class Config:
+        json_schema_extra = {"example": {"pod_numbers": [1, 2, 3], "status": 2, "from_status": 1}}
+
+
+class PodStatusTransitionResultSchema(Schema):
+    updated: int
+
+
 class GardenEnvironmentSchema(ModelSchema):
-    """Schema for creating an environment log entry"""
+    """Schema for a single environment reading; the garden comes from the URL"""
 
     class Meta:
         model = GardenEnvironmentLog
-        exclude = ["id", "timestamp"]
+        exclude = ["id", "garden"]
+
+
+class GardenEnvironmentImport(GardenEnvironmentSchema):
+    """Schema for a historical reading; unlike live ones it must carry its own time"""
+
+    timestamp: datetime
+
+
+class IngestBatchSchema(Schema):
+    accepted: int
+    rejected: int
+
+
+class IngestResultSchema(Schema):
+    """Outcome of a bulk environment reading upload"""
+
+    accepted: int
+    rejected: int
+    batches: List[IngestBatchSchema]
+    errors: List[Dict[str, Any]]
+
+
+class RollupStatsSchema(Schema):
+    count: int
+    min: float
+    max: float
+    mean: Optional[float]
+
+
+class RollupPointSchema(Schema):
+    bucket_start: datetime
+    metrics: Dict[str, RollupStatsSchema]
+
+
+class RollupSeriesSchema(Schema):
+    """Downsampled environment history at the chosen bucket resolution"""
+
+    resolution: str
+    start: datetime
+    end: datetime
+    points: List[RollupPointSchema]
+
+
+class GardenAlertSchema(ModelSchema):
+    """An out-of-range alert; low/high are the envelope when it was raised"""
+
+    class Meta:
+        model = GardenAlert
+        exclude = ["garden"]
+
+
+class GardenAnomalySchema(ModelSchema):
+    """A spike, stuck sensor or drift found by the rolling statistics of a metric"""
+
+    class Meta:
+        model = GardenAnomaly
+        exclude = ["garden"]
+
+
+class DashboardBatchSchema(Schema):
+    id: int
+    batch_number: Optional[str]
+    seed_name: str
+    current_stage: str
+    predicted_harvest_date: Optional[date]
+    pod_numbers: List[int]
+
+
+class GardenDashboardSchema(Schema):
+    """Overview of a garden: pods per status, overdue tasks, latest reading, active batches"""
+
+    id: int
+    name: str
+    total_pods: int
+    is_active: bool
+    pods_by_status: Dict[str, int]
+    overdue_tasks: int
+    latest_reading: Optional[GardenEnvironmentSchema]
+    active_batches: List[DashboardBatchSchema]
+
+
+class PlanRequestSchema(Schema):
+    """Plan pending seed batches into the garden's pods; ``apply`` stores the plan"""
+
+    start: Optional[date] = None
+    horizon_days: int = Field(365, ge=1, le=3 * 365)
+    max_harvests_per_day: Optional[int] = Field(None, ge=1)
+    apply: bool = False
+
+
+class PlannedPlantingSchema(Schema):
+    batch_id: int
+    pod_number: int
+    plant_on: date
+    harvest_on: date
+
+
+class PlantingPlanSchema(Schema):
+    """Pod/date assignment of pending batches and the resulting pod utilization"""
+
+    start: date
+    end: date
+    max_harvests_per_day: int
+    utilization: float
+    plantings: List[PlannedPlantingSchema]
+    unplanned: List[int]
+
+
+class GardenSyncSchema(ModelSchema):
+    """A garden as stored by offline clients, keyed by its id"""
+
+    class Meta:
+        model = Garden
+        fields = "__all__"
+
+
+class PodSyncSchema(ModelSchema):
+    """A pod as stored by offline clients, keyed by its id"""
+
+    class Meta:
+        model = GardenPod
+        fields = "__all__"
+
+
+class ChangeFeedSchema(Schema):
+    """Gardens and pods changed since the request cursor; send ``cursor`` next time"""
+
+    cursor: int
+    has_more: bool
+    gardens: List[GardenSyncSchema]
+    pods: List[PodSyncSchema]
+    deleted_gardens: List[int]
+    deleted_pods: List[int]
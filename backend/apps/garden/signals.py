@@ -0,0 +1,63 @@
+"""Keep cached garden and pod responses, live streams and the sync change log in step
+with model writes."""
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.cache import garden_scope, invalidate
+
+from . import live, sync
+from .models import Garden, GardenEnvironmentLog, GardenPod, SyncEntity
+
+
+@receiver(post_save, sender=Garden)
+@receiver(post_delete, sender=Garden)
+def _garden_written(sender, instance, **kwargs):
+    invalidate(garden_scope(instance.pk))
+
+
+@receiver(post_save, sender=Garden)
+def _garden_saved(sender, instance, **kwargs):
+    sync.log_changes(SyncEntity.GARDEN, [instance.pk])
+
+
+@receiver(pre_delete, sender=Garden)
+def _garden_deleted(sender, instance, **kwargs):
+    # Tombstones for the garden and, in the same insert, the pods the delete cascades to
+    sync.log_changes(SyncEntity.GARDEN, [instance.pk], deleted=True)
+    pod_ids = GardenPod.objects.filter(garden=instance).values_list("pk", flat=True)
+    sync.log_changes(SyncEntity.POD, pod_ids, deleted=True)
+
+
+@receiver(post_save, sender=GardenPod)
+@receiver(post_delete, sender=GardenPod)
+def _pod_written(sender, instance, **kwargs):
+    invalidate(garden_scope(instance.garden_id))
+    live.changed()
+
+
+@receiver(post_save, sender=GardenPod)
+def _pod_saved(sender, instance, **kwargs):
+    sync.log_changes(SyncEntity.POD, [instance.pk])
+
+
+@receiver(post_delete, sender=GardenPod)
+def _pod_deleted(sender, instance, origin=None, **kwargs):
+    # A garden delete has logged its pods already
+    if not isinstance(origin, Garden) and getattr(origin, "model", None) is not Garden:
+        sync.log_changes(SyncEntity.POD, [instance.pk], deleted=True)
+
+
+@receiver(post_save, sender=GardenEnvironmentLog)
+def _reading_saved(sender, instance, created, **kwargs):
+    if created:
+        live.changed()
+
+
+@receiver(pre_delete, sender="seed.SeedBatch")
+def _batch_deleted(sender, instance, **kwargs):
+    # Pods are detached with a queryset update, which sends no pod signals
+    pods = list(GardenPod.objects.filter(seed_batch=instance).values_list("pk", "garden_id"))
+    for garden_id in {garden_id for _, garden_id in pods}:
+        invalidate(garden_scope(garden_id))
+    sync.log_changes(SyncEntity.POD, [pk for pk, _ in pods])
@@ -0,0 +1,221 @@
+"""Bulk import of historical environment readings and tasks.
+
+Rows are streamed from CSV or NDJSON files (optionally gzipped), validated
+with the same schemas as the API, except that readings must carry their own
+timestamp, and inserted with ``bulk_create`` in transactions of
+``batch_size`` rows, so a file of any size is read once and never held in
+memory. Rejected rows are counted and the first of them are
+reported by position; a failing batch does not undo the batches before it.
+
+With ``defer_indexes`` the target table's secondary indexes (those declared
+in ``Meta.indexes``) are dropped for the duration of the import and rebuilt
+once at the end, which is much cheaper than updating them row by row.
+"""
+
+import csv
+import gzip
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+from pydantic import BaseModel, ValidationError
+
+from apps.garden.ingest import MAX_REPORTED_ERRORS, RejectedRow, iter_ndjson
+from apps.garden.models import Garden, GardenEnvironmentLog, GardenPod
+from apps.garden.rollups import ENVIRONMENT_METRICS, record_readings
+from apps.garden.schemas import GardenEnvironmentImport
+from apps.task.models import Task
+from apps.task.recurrence import next_run_after
+from apps.task.schemas import TaskImport
+
+IMPORT_BATCH_SIZE = 20_000
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.imported + self.rejected) / self.elapsed if self.elapsed else 0.0
+
+
+def guess_format(path: Path) -> str:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    if suffixes and suffixes[-1] in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    return "csv"
+
+
+def _open(path: Path) -> TextIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def _csv_rows(file: TextIO) -> Iterator[dict]:
+    # Empty cells mean "not given", so schema defaults apply
+    for row in csv.DictReader(file):
+        yield {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def read_rows(path: Path, format: Optional[str] = None) -> Iterator[Any]:
+    """Stream the rows of ``path`` as dicts (or ``RejectedRow`` for undecodable lines)."""
+    format = format or guess_format(path)
+    with _open(path) as file:
+        if format == "ndjson":
+            yield from iter_ndjson(file)
+        else:
+            yield from _csv_rows(file)
+
+
+class _Importer(ABC):
+    model: type[models.Model]
+    schema: type[BaseModel]
+
+    @abstractmethod
+    def build(self, raw: dict) -> models.Model:
+        """Validate one row; raise ``ValueError`` or ``ValidationError`` to reject it."""
+
+    def save(self, objs: list) -> None:
+        self.model.objects.bulk_create(objs, batch_size=1000)
+
+
+class EnvironmentImporter(_Importer):
+    """Readings of ``garden_id``, or of each row's ``garden_id`` column when not given."""
+
+    model = GardenEnvironmentLog
+    schema = GardenEnvironmentImport
+
+    def __init__(self, garden_id: Optional[int] = None):
+        self.garden_id = garden_id
+        self.garden_ids = set(Garden.objects.values_list("id", flat=True))
+
+    def build(self, raw: dict) -> GardenEnvironmentLog:
+        garden_id = raw.pop("garden_id", None) or self.garden_id
+        if garden_id is None:
+            raise ValueError("garden_id is missing")
+        if int(garden_id) not in self.garden_ids:
+            raise ValueError(f"garden {garden_id} does not exist")
+        reading = self.schema.model_validate(raw)
+        return GardenEnvironmentLog(garden_id=int(garden_id), **reading.model_dump())
+
+    def save(self, objs: list[GardenEnvironmentLog]) -> None:
+        # A plain executemany: compiling bulk_create's INSERTs costs more than running them
+        columns = ("garden_id", "timestamp", *ENVIRONMENT_METRICS, "notes")
+        quote = connection.ops.quote_name
+        sql = (
+            f"INSERT INTO {quote(self.model._meta.db_table)} "
+            f"({', '.join(quote(column) for column in columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        adapt = connection.ops.adapt_datetimefield_value
+        rows = [
+            (
+                log.garden_id,
+                adapt(log.timestamp),
+                *(getattr(log, metric) for metric in ENVIRONMENT_METRICS),
+                log.notes,
+            )
+            for log in objs
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        record_readings(objs)
+
+
+class TaskImporter(_Importer):
+    """Tasks with their status; open recurring series resume from now, not from history."""
+
+    model = Task
+    schema = TaskImport
+
+    def __init__(self):
+        self.now = timezone.now()
+        self.garden_ids = set(Garden.objects.values_list("id", flat=True))
+        self.pod_ids = set(GardenPod.objects.values_list("id", flat=True))
+
+    def build(self, raw: dict) -> Task:
+        fields = self.schema.model_validate(raw).model_dump()
+        if fields["garden_id"] is not None and fields["garden_id"] not in self.garden_ids:
+            raise ValueError(f"garden {fields['garden_id']} does not exist")
+        if fields["pod_id"] is not None and fields["pod_id"] not in self.pod_ids:
+            raise ValueError(f"pod {fields['pod_id']} does not exist")
+        task = Task(**fields)
+        # bulk_create skips Task.save, which initializes the schedule
+        task.reset_schedule()
+        if task.is_recurring and task.next_run_at < self.now:
+            task.next_run_at = next_run_after(task, self.now)
+        return task
+
+
+@contextmanager
+def deferred_indexes(model: type[models.Model]):
+    """Drop ``model``'s ``Meta.indexes`` and rebuild them on exit."""
+    indexes = list(model._meta.indexes)
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(model, index)
+
+
+def import_rows(
+    importer: _Importer,
+    rows: Iterator[Any],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    defer_indexes: bool = False,
+    progress: Optional[Callable[[ImportResult], None]] = None,
+) -> ImportResult:
+    """Validate and insert ``rows``, committing every ``batch_size`` rows.
+
+    ``progress`` is called with the running totals after each commit.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    position = 0
+    rows = iter(rows)
+    with deferred_indexes(importer.model) if defer_indexes else nullcontext():
+        while chunk := list(islice(rows, batch_size)):
+            objs = []
+            for raw in chunk:
+                position += 1
+                try:
+                    if isinstance(raw, RejectedRow):
+                        raise ValueError(raw.detail)
+                    if not isinstance(raw, dict):
+                        raise ValueError("expected an object")
+                    objs.append(importer.build(raw))
+                except (ValidationError, ValueError) as exc:
+                    result.rejected += 1
+                    if len(result.errors) < MAX_REPORTED_ERRORS:
+                        detail = (
+                            exc.errors(include_url=False, include_context=False)
+                            if isinstance(exc, ValidationError)
+                            else str(exc)
+                        )
+                        result.errors.append({"row": position, "detail": detail})
+            with transaction.atomic():
+                importer.save(objs)
+            result.imported += len(objs)
+            result.batches += 1
+            result.elapsed = time.perf_counter() - started
+            if progress is not None:
+                progress(result)
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,51 @@
+import sys
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps import export
+
+
+class Command(BaseCommand):
+    help = "Stream environment readings or growth logs to a CSV or Parquet file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=["environment", "growth"])
+        parser.add_argument("--garden", type=int, help="Only readings of this garden")
+        parser.add_argument("--batch", type=int, help="Only growth logs of this seed batch")
+        parser.add_argument("--start", type=datetime.fromisoformat, help="ISO 8601, inclusive")
+        parser.add_argument("--end", type=datetime.fromisoformat, help="ISO 8601, exclusive")
+        parser.add_argument("--format", choices=sorted(export.EXPORT_FORMATS), default="csv")
+        parser.add_argument("--output", default="-", help="File to write, '-' for stdout")
+        parser.add_argument("--chunk-size", type=int, help="Rows fetched and written per step")
+
+    def handle(self, *args, **options):
+        start, end = options["start"], options["end"]
+        if options["kind"] == "environment":
+            rows = export.environment_logs(options["garden"], start, end)
+            fields = export.ENVIRONMENT_EXPORT_FIELDS
+        else:
+            rows = export.growth_logs(options["batch"], start, end)
+            fields = export.GROWTH_LOG_EXPORT_FIELDS
+
+        try:
+            chunks = export.iter_export(rows, fields, options["format"], options["chunk_size"])
+        except export.ExportUnavailable as exc:
+            raise CommandError(str(exc))
+
+        started = time.perf_counter()
+        written = 0
+        to_stdout = options["output"] == "-"
+        output = sys.stdout.buffer if to_stdout else open(options["output"], "wb")
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if not to_stdout:
+                output.close()
+        elapsed = time.perf_counter() - started
+        self.stderr.write(
+            f"Wrote {written / 1e6:.1f} MB of {options['kind']} data in {elapsed:.2f}s."
+        )
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps import importer
+
+
+class Command(BaseCommand):
+    help = "Stream environment readings or tasks from a CSV or NDJSON file into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=["environment", "tasks"])
+        parser.add_argument("path", type=Path, help="CSV or NDJSON file, optionally .gz")
+        parser.add_argument(
+            "--garden", type=int, help="Garden of the readings when rows have no garden_id"
+        )
+        parser.add_argument("--format", choices=importer.IMPORT_FORMATS)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=importer.IMPORT_BATCH_SIZE,
+            help="Rows inserted per transaction",
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Drop secondary indexes during the import and rebuild them once at the end",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.is_file():
+            raise CommandError(f"{path} does not exist")
+        if options["kind"] == "environment":
+            target = importer.EnvironmentImporter(options["garden"])
+        else:
+            target = importer.TaskImporter()
+
+        result = importer.import_rows(
+            target,
+            importer.read_rows(path, options["format"]),
+            batch_size=options["batch_size"],
+            defer_indexes=options["defer_indexes"],
+            progress=self._progress,
+        )
+        for error in result.errors:
+            self.stderr.write(f"row {error['row']}: {error['detail']}")
+        self.stdout.write(
+            f"Imported {result.imported} {options['kind']} rows, rejected {result.rejected}, "
+            f"in {result.elapsed:.2f}s ({result.rows_per_second:,.0f} rows/s)."
+        )
+
+    def _progress(self, result: importer.ImportResult) -> None:
+        self.stderr.write(
+            f"batch {result.batches}: {result.imported} imported, {result.rejected} rejected, "
+            f"{result.rows_per_second:,.0f} rows/s"
+        )
@@ -0,0 +1,106 @@
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots the service in a fresh interpreter phase by phase, printing a marker
+# to stderr before each so the -X importtime lines can be attributed to it
+PROBE = """
+import json, sys, time
+
+phases = []
+
+def phase(name, step):
+    print(f"startup-phase: {name}", file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    step()
+    phases.append((name, time.perf_counter() - started))
+
+def setup():
+    import django
+    django.setup()
+
+def urls():
+    from django.urls import get_resolver
+    get_resolver().resolve("/api/v1/health")
+
+phase("django.setup()", setup)
+phase("ASGI application", lambda: __import__("seedr.asgi"))
+phase("URLconf and core routes", urls)
+from django.urls import resolve
+from apps.api import api
+for prefix in api._lazy_routers:
+    phase(f"{prefix} router", lambda: resolve(f"/api/v1/{prefix}/"))
+phase("OpenAPI schema", lambda: api.get_openapi_schema(path_prefix="/api/v1/"))
+print(json.dumps(phases))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, str, int, int, int]]:
+    """``(phase, module, depth, self_us, cumulative_us)`` for every import logged."""
+    imports = []
+    phase = "interpreter"
+    for line in stderr.splitlines():
+        if line.startswith("startup-phase: "):
+            phase = line.removeprefix("startup-phase: ")
+        elif line.startswith("import time:") and "[us]" not in line:
+            self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            imports.append((phase, name.strip(), depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+class Command(BaseCommand):
+    help = "Time each startup phase of the service and break its imports down by package"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Report the fastest of N boots")
+        parser.add_argument("--top", type=int, default=15, help="Packages and modules listed")
+
+    def _boot(self) -> tuple[list, list]:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            raise CommandError(f"The service failed to start:\n{completed.stderr[-2000:]}")
+        phases = json.loads(completed.stdout.splitlines()[-1])
+        return phases, parse_importtime(completed.stderr)
+
+    def handle(self, *args, **options):
+        runs = [self._boot() for _ in range(options["runs"])]
+        phases, imports = min(runs, key=lambda run: sum(seconds for _, seconds in run[0]))
+        top = options["top"]
+
+        self.stdout.write(f"Startup of {settings.SETTINGS_MODULE}, fastest of {len(runs)}\n")
+        by_phase = defaultdict(lambda: [0, 0])
+        for phase, _, _, self_us, _ in imports:
+            by_phase[phase][0] += self_us
+            by_phase[phase][1] += 1
+        self.stdout.write(f"{'phase':<28}{'ms':>9}{'imports ms':>12}{'modules':>9}")
+        for name, seconds in phases:
+            import_us, modules = by_phase[name]
+            self.stdout.write(
+                f"{name:<28}{seconds * 1000:>9.1f}{import_us / 1000:>12.1f}{modules:>9}"
+            )
+        total = sum(seconds for _, seconds in phases)
+        self.stdout.write(f"{'total':<28}{total * 1000:>9.1f}\n")
+
+        packages = defaultdict(lambda: [0, 0])
+        for _, module, _, self_us, _ in imports:
+            packages[module.split(".")[0]][0] += self_us
+            packages[module.split(".")[0]][1] += 1
+        self.stdout.write(f"{'package (own import time)':<40}{'ms':>9}{'modules':>9}")
+        ranked = sorted(packages.items(), key=lambda item: -item[1][0])
+        for package, (self_us, modules) in ranked[:top]:
+            self.stdout.write(f"{package:<40}{self_us / 1000:>9.1f}{modules:>9}")
+
+        self.stdout.write(f"\n{'slowest top-level imports':<40}{'ms':>9}  phase")
+        roots = sorted((entry for entry in imports if entry[2] == 0), key=lambda entry: -entry[4])
+        for phase, module, _, _, cumulative_us in roots[:top]:
+            self.stdout.write(f"{module:<40}{cumulative_us / 1000:>9.1f}  {phase}")
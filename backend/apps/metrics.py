@@ -0,0 +1,421 @@
+"""Per-operation request metrics in the Prometheus text format.
+
+:class:`MetricsMiddleware` times every request and files it under its URL
+route (e.g. ``api/v1/tasks/<task_id>``), so each Ninja operation gets a
+latency histogram, a histogram of queries per request, and running totals of
+database and serialization time. Queries are counted by an execute wrapper
+installed on every database connection. It follows the request through
+``sync_to_async`` via a context variable. Serialization is the time Ninja
+spends validating, dumping and rendering a view's result, minus any queries
+that run meanwhile (lazy querysets). :func:`instrument` hooks that step into
+every operation of an API.
+
+When ``METRICS_SLOW_REQUEST_MS`` is set, a share of the requests
+(``METRICS_PROFILE_SAMPLE_RATE``) have the threads running them sampled
+every ``METRICS_PROFILE_INTERVAL_MS`` by a background thread. Requests
+slower than the threshold are passed to the ``METRICS_SLOW_REQUEST_HANDLERS``
+with their collapsed stacks, which flamegraph tools read as they are.
+
+Metrics are kept per worker process, like the response cache counters.
+"""
+
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+# Frames kept per sampled stack, innermost first
+MAX_STACK_DEPTH = 64
+
+
+@dataclass
+class RequestMetrics:
+    """What one request did, collected while it runs."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+    # Threads running the request and their stack samples, when profiled
+    threads: set[int] = field(default_factory=set)
+    samples: Optional[Counter] = None
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_number(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+@dataclass
+class OperationStats:
+    responses: Counter = field(default_factory=Counter)
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERY_BUCKETS))
+    db_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+
+
+class Registry:
+    """Request metrics of this process, by method and route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: dict[tuple[str, str], OperationStats] = {}
+
+    def observe(
+        self, method: str, route: str, status: int, elapsed: float, metrics: RequestMetrics
+    ) -> None:
+        with self._lock:
+            stats = self._operations.get((method, route))
+            if stats is None:
+                stats = self._operations[(method, route)] = OperationStats()
+            stats.responses[status] += 1
+            stats.latency.observe(elapsed)
+            stats.queries.observe(metrics.queries)
+            stats.db_seconds += metrics.db_seconds
+            stats.serialization_seconds += metrics.serialization_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations = {}
+
+    def totals(self) -> dict[str, float]:
+        """Requests, queries and time in queries and serialization over all operations."""
+        with self._lock:
+            operations = list(self._operations.values())
+        return {
+            "requests": sum(stats.latency.count for stats in operations),
+            "queries": sum(stats.queries.sum for stats in operations),
+            "db_seconds": sum(stats.db_seconds for stats in operations),
+            "serialization_seconds": sum(stats.serialization_seconds for stats in operations),
+        }
+
+    def render(self) -> list[str]:
+        with self._lock:
+            operations = sorted(self._operations.items())
+            lines = _header("seedr_http_requests_total", "counter", "Responses by operation")
+            for (method, route), stats in operations:
+                for status, count in sorted(stats.responses.items()):
+                    labels = {"method": method, "route": route, "status": status}
+                    lines.append(_sample("seedr_http_requests_total", labels, count))
+            for name, kind, help_text, value in (
+                ("seedr_http_request_duration_seconds", "histogram", "Latency", "latency"),
+                ("seedr_http_db_queries", "histogram", "Queries per request", "queries"),
+                ("seedr_http_db_seconds_total", "counter", "Time in queries", "db_seconds"),
+                (
+                    "seedr_http_serialization_seconds_total",
+                    "counter",
+                    "Time validating and rendering responses",
+                    "serialization_seconds",
+                ),
+            ):
+                lines += _header(name, kind, help_text)
+                for (method, route), stats in operations:
+                    labels = {"method": method, "route": route}
+                    metric = getattr(stats, value)
+                    if isinstance(metric, Histogram):
+                        lines += _histogram(name, labels, metric)
+                    else:
+                        lines.append(_sample(name, labels, metric))
+            return lines
+
+
+registry = Registry()
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample(name: str, labels: dict, value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+        return f"{name}{{{rendered}}} {_number(value)}"
+    return f"{name} {_number(value)}"
+
+
+def _header(name: str, kind: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram(name: str, labels: dict, histogram: Histogram) -> list[str]:
+    lines = [
+        _sample(f"{name}_bucket", {**labels, "le": bound}, count)
+        for bound, count in histogram.cumulative()
+    ]
+    lines.append(_sample(f"{name}_sum", labels, histogram.sum))
+    lines.append(_sample(f"{name}_count", labels, histogram.count))
+    return lines
+
+
+def render_counters(prefix: str, values: dict, kinds: dict[str, str]) -> list[str]:
+    """Render flat ``values`` as ``{prefix}_{name}`` metrics of the given kinds."""
+    lines = []
+    for name, value in values.items():
+        kind = kinds.get(name, "counter")
+        metric = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+        lines += _header(metric, kind, name.replace("_", " ").capitalize())
+        lines.append(_sample(metric, {}, value or 0))
+    return lines
+
+
+# Database queries
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper adding each query to the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    if metrics.samples is not None:
+        metrics.threads.add(threading.get_ident())
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver installing :func:`record_query`."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Ninja operations
+
+
+def _timed_serialization(method: Callable) -> Callable:
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return method(*args, **kwargs)
+        started, db_before = time.perf_counter(), metrics.db_seconds
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.serialization_seconds += elapsed - (metrics.db_seconds - db_before)
+
+    return wrapper
+
+
+def _tracked_thread(run: Callable) -> Callable:
+    # Sync operations run in a worker thread; the profiler needs to sample it
+    if iscoroutinefunction(run):
+        return run
+
+    @wraps(run)
+    def wrapper(request, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is not None and metrics.samples is not None:
+            metrics.threads.add(threading.get_ident())
+        return run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def instrument(api) -> None:
+    """Time the serialization step of every operation registered on ``api``.
+
+    This rebinds Ninja internals, so pyproject.toml pins the minor release it
+    was checked against and the tests fail if the hooks stop firing.
+    """
+    for _, router in api._routers:
+        for path_view in router.path_operations.values():
+            for operation in path_view.operations:
+                if getattr(operation, "_metrics_instrumented", False):
+                    continue
+                operation._result_to_response = _timed_serialization(operation._result_to_response)
+                operation.run = _tracked_thread(operation.run)
+                operation._metrics_instrumented = True
+
+
+# Slow request profiling
+
+
+def collapse(frame) -> str:
+    """``module:function`` of each frame, outermost first, joined with ``;``."""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples the stacks of the threads running profiled requests.
+
+    The sampling thread only runs while some request is being profiled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: dict[int, RequestMetrics] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, metrics: RequestMetrics, interval: float) -> None:
+        metrics.samples = Counter()
+        metrics.threads.add(threading.get_ident())
+        with self._lock:
+            self._active[id(metrics)] = metrics
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, args=(interval,), name="seedr-stack-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            self._active.pop(id(metrics), None)
+
+    def _run(self, interval: float) -> None:
+        own = threading.get_ident()
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active.values())
+            frames = sys._current_frames()
+            for metrics in active:
+                for ident in list(metrics.threads):
+                    frame = frames.get(ident)
+                    if frame is not None and ident != own:
+                        metrics.samples[collapse(frame)] += 1
+
+
+sampler = StackSampler()
+
+
+@dataclass
+class SlowRequest:
+    method: str
+    path: str
+    route: str
+    status: int
+    elapsed: float
+    metrics: RequestMetrics
+
+
+def log_slow_request(slow: SlowRequest) -> None:
+    """Default slow request handler: log the request and its hottest stacks."""
+    lines = [
+        f"{count} {stack}"
+        for stack, count in (slow.metrics.samples or Counter()).most_common(
+            settings.METRICS_PROFILE_TOP_STACKS
+        )
+    ]
+    logger.warning(
+        "Slow request %s %s took %.0f ms (%s queries, %.0f ms in the database)%s",
+        slow.method,
+        slow.path,
+        slow.elapsed * 1000,
+        slow.metrics.queries,
+        slow.metrics.db_seconds * 1000,
+        "".join(f"\n  {line}" for line in lines),
+    )
+
+
+def _slow_request_handlers() -> list[Callable[[SlowRequest], None]]:
+    return [import_string(path) for path in settings.METRICS_SLOW_REQUEST_HANDLERS]
+
+
+# Middleware
+
+
+class MetricsMiddleware:
+    """Records latency, queries and serialization time of every request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.slow_ms = settings.METRICS_SLOW_REQUEST_MS
+        self.handlers = _slow_request_handlers() if self.slow_ms is not None else []
+
+    def _begin(self) -> tuple[RequestMetrics, object, float]:
+        metrics = RequestMetrics()
+        if self.slow_ms is not None and random.random() < settings.METRICS_PROFILE_SAMPLE_RATE:
+            sampler.start(metrics, settings.METRICS_PROFILE_INTERVAL_MS / 1000)
+        return metrics, _current.set(metrics), time.perf_counter()
+
+    def _finish(self, request, response, metrics, token, started) -> None:
+        elapsed = time.perf_counter() - started
+        _current.reset(token)
+        if metrics.samples is not None:
+            sampler.stop(metrics)
+        match = request.resolver_match
+        route = match.route if match is not None else "unmatched"
+        registry.observe(request.method, route, response.status_code, elapsed, metrics)
+        if self.slow_ms is not None and elapsed * 1000 >= self.slow_ms:
+            slow = SlowRequest(
+                request.method, request.path, route, response.status_code, elapsed, metrics
+            )
+            for handler in self.handlers:
+                try:
+                    handler(slow)
+                except Exception:
+                    logger.exception("Slow request handler %r failed", handler)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics, token, started = self._begin()
+        response = self.get_response(request)
+        self._finish(request, response, metrics, token, started)
+        return response
+
+    async def __acall__(self, request):
+        metrics, token, started = self._begin()
+        response = await self.get_response(request)
+        self._finish(request, response, metrics, token, started)
+        return response
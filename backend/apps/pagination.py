@@ -0,0 +1,103 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Offset pagination gets slower the deeper a client pages because the database
+still walks every skipped row. Keyset pagination instead filters on the
+ordering key of the last row returned, which an index can seek to directly,
+so every page costs the same regardless of table size.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from ninja import Field, Schema
+from ninja.errors import HttpError
+from ninja.pagination import AsyncPaginationBase
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise HttpError(400, "Invalid pagination cursor")
+    if not isinstance(values, list):
+        raise HttpError(400, "Invalid pagination cursor")
+    return values
+
+
+class CursorPagination(AsyncPaginationBase):
+    """Paginate on a unique ordering such as ``("pod_number",)`` or ``("-timestamp", "-id")``.
+
+    The last ordering field must make the ordering unique (usually the
+    primary key), otherwise rows sharing a key could be skipped.
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+        limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+    class Output(Schema):
+        items: List[Any]
+        next_cursor: Optional[str] = None
+
+    def __init__(self, *, ordering: Sequence[str] = ("id",), **kwargs: Any) -> None:
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip("-") for name in self.ordering]
+        super().__init__(**kwargs)
+
+    def _after(self, queryset: QuerySet, cursor: str) -> Q:
+        values = decode_cursor(cursor)
+        if len(values) != len(self.fields):
+            raise HttpError(400, "Invalid pagination cursor")
+        meta = queryset.model._meta
+        try:
+            values = [meta.get_field(name).to_python(v) for name, v in zip(self.fields, values)]
+        except ValidationError:
+            raise HttpError(400, "Invalid pagination cursor")
+
+        # (a, b) > (x, y)  <=>  a >= x AND (a > x OR (a = x AND b > y)); the
+        # redundant leading bound lets the database seek the index to x.
+        condition = Q()
+        for position, name in enumerate(self.ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            term = Q(**{f"{self.fields[position]}__{lookup}": values[position]})
+            for prior in range(position):
+                term &= Q(**{self.fields[prior]: values[prior]})
+            condition |= term
+        if len(self.fields) > 1:
+            lookup = "lte" if self.ordering[0].startswith("-") else "gte"
+            condition &= Q(**{f"{self.fields[0]}__{lookup}": values[0]})
+        return condition
+
+    def _page(self, queryset: QuerySet, pagination: Input) -> QuerySet:
+        queryset = queryset.order_by(*self.ordering)
+        if pagination.cursor:
+            queryset = queryset.filter(self._after(queryset, pagination.cursor))
+        return queryset[: pagination.limit + 1]
+
+    def _result(self, items: list, pagination: Input) -> dict:
+        next_cursor = None
+        if len(items) > pagination.limit:
+            items = items[: pagination.limit]
+            last = items[-1]
+            next_cursor = encode_cursor([getattr(last, name) for name in self.fields])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def paginate_queryset(self, queryset: QuerySet, pagination: Input, **params: Any) -> Any:
+        return self._result(list(self._page(queryset, pagination)), pagination)
+
+    async def apaginate_queryset(self, queryset: QuerySet, pagination: Input, **params: Any) -> Any:
+        items = [obj async for obj in self._page(queryset, pagination)]
+        return self._result(items, pagination)
@@ -0,0 +1,102 @@
+"""A NinjaAPI that imports its routers on first use.
+
+Routers added with :meth:`LazyNinjaAPI.add_lazy_router` are given by dotted
+path. Each gets a URL resolver under its prefix whose patterns Django only
+reads when a request path starts with that prefix, so the router module, its
+schemas and their pydantic models are imported by the first request that
+needs them rather than at boot: a worker answering its health check has not
+paid for the garden, seed or task routes yet.
+
+The OpenAPI schema needs every router, so building it loads them all. It is
+built on the first ``/openapi.json`` request (the ``/docs`` page fetches it)
+and kept until another router is added.
+"""
+
+import threading
+from functools import cached_property
+from typing import Any, Callable, Optional
+
+from django.urls import path
+from django.utils.module_loading import import_string
+from ninja import NinjaAPI, Router
+from ninja.openapi.urls import get_openapi_urls, get_root_url
+
+
+class _RouterURLConf:
+    """Stands in for a URLconf module; loads the router when Django first reads the patterns."""
+
+    def __init__(self, api: "LazyNinjaAPI", prefix: str):
+        self.api = api
+        self.prefix = prefix
+
+    @cached_property
+    def urlpatterns(self) -> list:
+        self.api.load_router(self.prefix)
+        return [
+            pattern
+            for prefix, router in self.api._routers_under(self.prefix)
+            for pattern in router.urls_paths(prefix[len(self.prefix) :].lstrip("/"))
+        ]
+
+
+class LazyNinjaAPI(NinjaAPI):
+    def __init__(
+        self, *args, on_router_loaded: Optional[Callable[[NinjaAPI], None]] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.on_router_loaded = on_router_loaded
+        self._lazy_routers: dict[str, str] = {}
+        self._loaded: dict[str, Router] = {}
+        self._load_lock = threading.Lock()
+        self._schemas: dict[tuple, Any] = {}
+
+    def add_lazy_router(self, prefix: str, router: str) -> None:
+        """Mount the router at dotted path ``router`` under ``prefix`` when first requested."""
+        self._lazy_routers[prefix.strip("/")] = router
+
+    def load_router(self, prefix: str) -> Router:
+        with self._load_lock:
+            router = self._loaded.get(prefix)
+            if router is None:
+                router = import_string(self._lazy_routers[prefix])
+                self.add_router(prefix, router)
+                self._loaded[prefix] = router
+                self._schemas.clear()
+                if self.on_router_loaded is not None:
+                    self.on_router_loaded(self)
+        return router
+
+    def load_routers(self) -> None:
+        for prefix in self._lazy_routers:
+            self.load_router(prefix)
+
+    def _routers_under(self, lazy_prefix: str) -> list[tuple[str, Router]]:
+        """The routers mounted at ``lazy_prefix`` (the router and any nested in it)."""
+        return [
+            (prefix, router)
+            for prefix, router in self._routers
+            if prefix == lazy_prefix or prefix.startswith(f"{lazy_prefix}/")
+        ]
+
+    def _get_urls(self) -> list:
+        urls = get_openapi_urls(self)
+        lazy = {router for prefix in self._loaded for _, router in self._routers_under(prefix)}
+        for prefix, router in self._routers:
+            if router not in lazy:
+                urls.extend(router.urls_paths(prefix))
+        for prefix in self._lazy_routers:
+            urls.append(path(f"{prefix}/", (_RouterURLConf(self, prefix), None, None)))
+        urls.append(get_root_url(self))
+        return urls
+
+    def get_openapi_schema(
+        self, *, path_prefix: Optional[str] = None, path_params: Optional[dict] = None
+    ):
+        self.load_routers()
+        key = (path_prefix, tuple(sorted((path_params or {}).items())))
+        schema = self._schemas.get(key)
+        if schema is None:
+            schema = self._schemas[key] = super().get_openapi_schema(
+                path_prefix=path_prefix, path_params=path_params
+            )
+        return schema
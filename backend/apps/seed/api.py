@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import List, Optional
+
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from ninja import Query, Router
+from ninja.errors import HttpError
+from ninja.pagination import paginate
+
+from apps import export
+from apps.pagination import CursorPagination
+
+from .models import GrowthLogEntry, Seed, SeedBatch, SeedType
+from .schemas import (
+    GrowthLogCreate,
+    GrowthLogEntrySchema,
+    SeedBatchCreate,
+    SeedBatchSchema,
+    SeedBatchUpdate,
+    SeedCreate,
+    SeedSchema,
+    SeedUpdate,
+)
+from .search import search_seeds
+
+router = Router(tags=["seeds"])
+batch_router = Router(tags=["seed batches"])
+
+
+@router.get("/", response=List[SeedSchema])
+@paginate(CursorPagination, ordering=("id",))
+def get_seeds(request, seed_type: Optional[SeedType] = None):
+    seeds = Seed.objects.all()
+    if seed_type is not None:
+        seeds = seeds.filter(seed_type=seed_type)
+    return seeds
+
+
+@router.get("/search", response=List[SeedSchema])
+def search(request, q: str, limit: int = Query(20, ge=1, le=100)):
+    """Type-ahead catalog search over name, variety, supplier and seed type."""
+    return search_seeds(q, limit)
+
+
+@router.post("/", response=SeedSchema)
+def create_seed(request, payload: SeedCreate):
+    return Seed.objects.create(**payload.dict())
+
+
+@router.get("/{seed_id}", response=SeedSchema)
+def get_seed(request, seed_id: int):
+    return get_object_or_404(Seed, pk=seed_id)
+
+
+@router.put("/{seed_id}", response=SeedSchema)
+def update_seed(request, seed_id: int, payload: SeedUpdate):
+    seed = get_object_or_404(Seed, pk=seed_id)
+    for attr, value in payload.dict(exclude_unset=True).items():
+        setattr(seed, attr, value)
+    seed.save()
+    return seed
+
+
+@router.delete("/{seed_id}")
+def delete_seed(request, seed_id: int):
+    get_object_or_404(Seed, pk=seed_id).delete()
+    return {"status": "deleted"}
+
+
+@batch_router.get("/", response=List[SeedBatchSchema])
+@paginate(CursorPagination, ordering=("id",))
+def get_batches(request, seed_id: Optional[int] = None, is_active: Optional[bool] = None):
+    batches = SeedBatch.objects.all()
+    if seed_id is not None:
+        batches = batches.filter(seed_id=seed_id)
+    if is_active is not None:
+        batches = batches.filter(is_active=is_active)
+    return batches
+
+
+@batch_router.post("/", response=SeedBatchSchema)
+def create_batch(request, payload: SeedBatchCreate):
+    get_object_or_404(Seed, pk=payload.seed_id)
+    return SeedBatch.objects.create(**payload.dict())
+
+
+@batch_router.get("/{batch_id}", response=SeedBatchSchema)
+def get_batch(request, batch_id: int):
+    return get_object_or_404(SeedBatch, pk=batch_id)
+
+
+@batch_router.put("/{batch_id}", response=SeedBatchSchema)
+def update_batch(request, batch_id: int, payload: SeedBatchUpdate):
+    batch = get_object_or_404(SeedBatch, pk=batch_id)
+    for attr, value in payload.dict(exclude_unset=True).items():
+        setattr(batch, attr, value)
+    batch.save()
+    return batch
+
+
+@batch_router.delete("/{batch_id}")
+def delete_batch(request, batch_id: int):
+    get_object_or_404(SeedBatch, pk=batch_id).delete()
+    return {"status": "deleted"}
+
+
+@batch_router.get("/{batch_id}/logs", response=List[GrowthLogEntrySchema])
+@paginate(CursorPagination, ordering=("-timestamp", "-id"))
+def get_growth_logs(request, batch_id: int):
+    """Growth observations of a batch, newest first."""
+    return GrowthLogEntry.objects.filter(seed_batch_id=batch_id)
+
+
+@batch_router.get("/{batch_id}/logs/export")
+def export_growth_logs(
+    request,
+    batch_id: int,
+    format: export.ExportFormat = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Stream a batch's growth history, oldest first, as CSV or Parquet."""
+    get_object_or_404(SeedBatch, pk=batch_id)
+    logs = export.growth_logs(batch_id, start, end)
+    filename = export.export_filename(f"batch-{batch_id}-growth", format, start, end)
+    try:
+        return export.streaming_export(
+            request, logs, export.GROWTH_LOG_EXPORT_FIELDS, format, filename
+        )
+    except export.ExportUnavailable as exc:
+        raise HttpError(501, str(exc))
+
+
+@batch_router.post("/{batch_id}/logs", response=GrowthLogEntrySchema)
+def create_growth_log(request, batch_id: int, payload: GrowthLogCreate):
+    batch = get_object_or_404(SeedBatch, pk=batch_id)
+    fields = payload.dict()
+    fields["timestamp"] = fields["timestamp"] or timezone.now()
+    return GrowthLogEntry.objects.create(seed_batch=batch, **fields)
@@ -0,0 +1,203 @@
+"""Harvest-date forecasting.
+
+A batch needs ``germination_days + days_to_harvest`` days at its reference
+temperature, i.e. a fixed budget of growing degree-days (GDD) above
+``HARVEST_BASE_TEMP_C``. Each day a garden reports a temperature spends
+``max(temp - base, 0)`` of that budget instead of the reference amount, so
+warm gardens finish early and cold ones late. The rest of the budget is
+projected at the garden's recent rate.
+
+Temperatures come from the daily environment rollups (root-zone water
+temperature, falling back to air temperature). The forecast runs as a handful
+of array operations over all growing batches at once: per-garden prefix sums
+of GDD turn each batch's accumulated heat into two lookups.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Min, Q, Sum
+from django.utils import timezone as dj_timezone
+
+from apps.garden.models import GardenEnvironmentRollup, RollupResolution
+
+from .models import SeedBatch
+
+# Days of history used for the projected rate of the remaining budget
+RECENT_DAYS = 7
+# Never project slower than this fraction of the reference rate
+MIN_RATE_FRACTION = 0.1
+
+UPDATE_BATCH_SIZE = 5000
+
+
+@dataclass
+class ForecastResult:
+    forecast: int = 0
+    updated: int = 0
+
+
+def _growing_batches() -> dict[str, np.ndarray]:
+    rows = list(
+        SeedBatch.objects.filter(is_active=True, actual_harvest_date__isnull=True)
+        .annotate(planted_garden=Min("pods__garden_id"))
+        .values_list(
+            "id",
+            "planted_garden",
+            "germination_start_date",
+            "actual_germination_date",
+            "predicted_harvest_date",
+            "seed__germination_days",
+            "seed__days_to_harvest",
+            "seed__optimal_temp_c_min",
+            "seed__optimal_temp_c_max",
+        )
+        .iterator(chunk_size=5000)
+    )
+    if not rows:
+        return {}
+    ids, gardens, starts, germinated, predicted, germ_days, harvest_days, t_min, t_max = zip(*rows)
+
+    def ordinals(dates):
+        return np.array([d.toordinal() if d else -1 for d in dates], dtype=np.int64)
+
+    def floats(values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "garden": np.array([g if g is not None else -1 for g in gardens], dtype=np.int64),
+        "start": ordinals(starts),
+        "germinated": ordinals(germinated),
+        "predicted": ordinals(predicted),
+        "germination_days": np.array(germ_days, dtype=np.float64),
+        "days_to_harvest": np.array(harvest_days, dtype=np.float64),
+        "temp_min": floats(t_min),
+        "temp_max": floats(t_max),
+    }
+
+
+def _daily_temperatures(garden_ids: np.ndarray, first_day: int, days: int) -> np.ndarray:
+    """Return a (gardens, days) matrix of mean daily temperature, NaN where unknown."""
+    water = np.full((len(garden_ids), days), np.nan)
+    air = np.full((len(garden_ids), days), np.nan)
+    if days == 0 or len(garden_ids) == 0:
+        return water
+    window_start = datetime.combine(date.fromordinal(first_day), datetime.min.time(), timezone.utc)
+    # One row per garden-day with both means, rather than one per metric
+    means = {
+        metric: Sum("total", filter=Q(metric=metric)) / Sum("sample_count", filter=Q(metric=metric))
+        for metric in ("water_temp_c", "air_temp_c")
+    }
+    rows = list(
+        GardenEnvironmentRollup.objects.filter(
+            resolution=RollupResolution.DAY,
+            metric__in=list(means),
+            bucket_start__gte=window_start,
+        )
+        .values("garden_id", "bucket_start")
+        .annotate(**means)
+        .values_list("garden_id", "bucket_start", *means)
+        .order_by()
+        .iterator(chunk_size=5000)
+    )
+    if not rows:
+        return water
+    garden, bucket, water_mean, air_mean = zip(*rows)
+    garden = np.array(garden, dtype=np.int64)
+    day = np.array([b.date().toordinal() for b in bucket], dtype=np.int64) - first_day
+    row = np.minimum(np.searchsorted(garden_ids, garden), len(garden_ids) - 1)
+    keep = (garden_ids[row] == garden) & (day < days)
+    water[row[keep], day[keep]] = np.array(water_mean, dtype=np.float64)[keep]
+    air[row[keep], day[keep]] = np.array(air_mean, dtype=np.float64)[keep]
+    return np.where(np.isnan(water), air, water)
+
+
+def predict_harvest_dates(
+    batches: dict[str, np.ndarray], temperatures: np.ndarray, garden_ids: np.ndarray, today: int
+) -> np.ndarray:
+    """Vectorized forecast; returns predicted harvest day ordinals per batch.
+
+    ``temperatures`` covers the days ``today - n .. today - 1`` for each of the
+    sorted ``garden_ids``; batches whose garden is not listed use the baseline.
+    """
+    base = settings.HARVEST_BASE_TEMP_C
+    reference = np.where(
+        np.isnan(batches["temp_min"]) | np.isnan(batches["temp_max"]),
+        settings.HARVEST_REFERENCE_TEMP_C,
+        (batches["temp_min"] + batches["temp_max"]) / 2,
+    )
+    reference_rate = np.maximum(reference - base, 1.0)
+
+    # Once germination is observed, only the growing period is left to forecast
+    germinated = batches["germinated"] >= 0
+    start = np.where(germinated, batches["germinated"], batches["start"])
+    budget_days = np.where(
+        germinated,
+        batches["days_to_harvest"],
+        batches["germination_days"] + batches["days_to_harvest"],
+    )
+
+    # One extra all-unknown row for batches without (reporting) gardens
+    days = temperatures.shape[1]
+    observed = ~np.isnan(temperatures)
+    gdd = np.where(observed, np.maximum(np.nan_to_num(temperatures) - base, 0.0), 0.0)
+    heat = np.zeros((len(garden_ids) + 1, days + 1))
+    seen = np.zeros((len(garden_ids) + 1, days + 1))
+    heat[:-1, 1:] = np.cumsum(gdd, axis=1)
+    seen[:-1, 1:] = np.cumsum(observed, axis=1)
+
+    row = np.searchsorted(garden_ids, batches["garden"])
+    found = garden_ids[np.minimum(row, max(len(garden_ids) - 1, 0))] == batches["garden"]
+    row = np.where(found, row, len(garden_ids)) if len(garden_ids) else np.zeros_like(row)
+
+    first_day = today - days
+    lo = np.clip(start - first_day, 0, days)
+    elapsed = np.maximum(today - start, 0)
+    heat_so_far = heat[row, days] - heat[row, lo]
+    seen_days = seen[row, days] - seen[row, lo]
+    # Days without readings count as reference days
+    spent_days = heat_so_far / reference_rate + (elapsed - seen_days)
+    remaining_days = np.maximum(budget_days - spent_days, 0.0)
+
+    recent = max(days - RECENT_DAYS, 0)
+    recent_seen = seen[row, days] - seen[row, recent]
+    recent_heat = heat[row, days] - heat[row, recent]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = np.where(recent_seen > 0, recent_heat / recent_seen, reference_rate)
+    rate = np.maximum(rate, reference_rate * MIN_RATE_FRACTION)
+
+    # A batch not yet started waits for its start date first
+    begin = np.maximum(start, today)
+    return begin + np.ceil(remaining_days * reference_rate / rate).astype(np.int64)
+
+
+def _write_predictions(ids: np.ndarray, predicted: np.ndarray) -> None:
+    table = SeedBatch._meta.db_table
+    sql = f'UPDATE "{table}" SET "predicted_harvest_date" = %s WHERE "id" = %s'
+    adapt = connection.ops.adapt_datefield_value
+    rows = [(adapt(date.fromordinal(int(day))), int(pk)) for pk, day in zip(ids, predicted)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(0, len(rows), UPDATE_BATCH_SIZE):
+            cursor.executemany(sql, rows[offset : offset + UPDATE_BATCH_SIZE])
+
+
+def forecast_harvests(today: Optional[date] = None) -> ForecastResult:
+    """Re-forecast ``predicted_harvest_date`` for every growing batch."""
+    today_ordinal = (today or dj_timezone.localdate()).toordinal()
+    batches = _growing_batches()
+    if not batches:
+        return ForecastResult()
+
+    garden_ids = np.unique(batches["garden"][batches["garden"] >= 0])
+    first_day = min(int(batches["start"].min()), today_ordinal)
+    temperatures = _daily_temperatures(garden_ids, first_day, today_ordinal - first_day)
+    predicted = predict_harvest_dates(batches, temperatures, garden_ids, today_ordinal)
+
+    changed = predicted != batches["predicted"]
+    _write_predictions(batches["id"][changed], predicted[changed])
+    return ForecastResult(forecast=len(predicted), updated=int(changed.sum()))
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.seed.forecast import forecast_harvests
+
+
+class Command(BaseCommand):
+    help = "Re-forecast the harvest date of every growing seed batch"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = forecast_harvests()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Forecast {result.forecast} batches ({result.updated} changed) in {elapsed:.2f}s."
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Seed',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('seed_type', models.CharField(choices=[('vegetable', 'Vegetable'), ('fruit', 'Fruit'), ('herb', 'Herb'), ('flower', 'Flower'), ('other', 'Other')], max_length=16)),
+                ('variety', models.CharField(blank=True, max_length=100, null=True)),
+                ('supplier', models.CharField(blank=True, max_length=100, null=True)),
+                ('germination_days', models.PositiveIntegerField(default=7, help_text='Expected days for germination')),
+                ('days_to_harvest', models.PositiveIntegerField(default=60, help_text='Expected days from germination to harvest')),
+                ('optimal_ph_min', models.FloatField(blank=True, null=True)),
+                ('optimal_ph_max', models.FloatField(blank=True, null=True)),
+                ('optimal_ec_min', models.FloatField(blank=True, null=True)),
+                ('optimal_ec_max', models.FloatField(blank=True, null=True)),
+                ('optimal_temp_c_min', models.FloatField(blank=True, null=True)),
+                ('optimal_temp_c_max', models.FloatField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SeedBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_number', models.CharField(blank=True, max_length=64, null=True)),
+                ('germination_start_date', models.DateField()),
+                ('actual_germination_date', models.DateField(blank=True, null=True)),
+                ('current_stage', models.CharField(choices=[('germination', 'Germination'), ('seedling', 'Seedling'), ('vegetative', 'Vegetative'), ('flowering', 'Flowering'), ('fruiting', 'Fruiting'), ('harvest_ready', 'Harvest Ready'), ('harvested', 'Harvested')], default='germination', max_length=16)),
+                ('predicted_harvest_date', models.DateField(blank=True, null=True)),
+                ('actual_harvest_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('seed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batches', to='seed.seed')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('actual_harvest_date__isnull', True), ('is_active', True)), fields=['id'], name='seed_batch_growing_idx')],
+            },
+        ),
+    ]
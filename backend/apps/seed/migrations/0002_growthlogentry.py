@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seed', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GrowthLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('observation', models.TextField(blank=True, null=True)),
+                ('height_cm', models.FloatField(blank=True, null=True)),
+                ('leaf_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('photo_urls', models.JSONField(blank=True, default=list)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('seed_batch', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='growth_logs', to='seed.seedbatch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['seed_batch', 'timestamp'], name='growth_log_batch_time_idx')],
+            },
+        ),
+    ]
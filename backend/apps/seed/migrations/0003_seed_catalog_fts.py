@@ -0,0 +1,66 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:20
+
+from django.db import migrations
+
+# External-content FTS5 index over the seed catalog. Triggers keep it in step
+# with every write to seed_seed, including bulk and queryset updates. The
+# prefix indexes make type-ahead prefix queries index lookups.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE seed_seed_fts USING fts5(
+        name, variety, supplier, seed_type,
+        content='seed_seed', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER seed_seed_fts_insert AFTER INSERT ON seed_seed BEGIN
+        INSERT INTO seed_seed_fts(rowid, name, variety, supplier, seed_type)
+        VALUES (new.id, new.name, new.variety, new.supplier, new.seed_type);
+    END
+    """,
+    """
+    CREATE TRIGGER seed_seed_fts_delete AFTER DELETE ON seed_seed BEGIN
+        INSERT INTO seed_seed_fts(seed_seed_fts, rowid, name, variety, supplier, seed_type)
+        VALUES ('delete', old.id, old.name, old.variety, old.supplier, old.seed_type);
+    END
+    """,
+    """
+    CREATE TRIGGER seed_seed_fts_update
+    AFTER UPDATE OF name, variety, supplier, seed_type ON seed_seed BEGIN
+        INSERT INTO seed_seed_fts(seed_seed_fts, rowid, name, variety, supplier, seed_type)
+        VALUES ('delete', old.id, old.name, old.variety, old.supplier, old.seed_type);
+        INSERT INTO seed_seed_fts(rowid, name, variety, supplier, seed_type)
+        VALUES (new.id, new.name, new.variety, new.supplier, new.seed_type);
+    END
+    """,
+    "INSERT INTO seed_seed_fts(seed_seed_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS seed_seed_fts_update",
+    "DROP TRIGGER IF EXISTS seed_seed_fts_delete",
+    "DROP TRIGGER IF EXISTS seed_seed_fts_insert",
+    "DROP TABLE IF EXISTS seed_seed_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Other databases fall back to LIKE search (see apps.seed.search)
+        if schema_editor.connection.vendor == "sqlite":
+            for statement in statements:
+                schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seed', '0002_growthlogentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL), _run(DROP_SQL)),
+    ]
@@ -1,10 +1,8 @@
-from datetime import datetime, date
-from typing import Optional
-from enum import StrEnum
-from ninja import Schema, Field
+from django.db import models
+from django.utils import timezone
 
 
-class SeedType(StrEnum):
+class SeedType(models.TextChoices):
     VEGETABLE = "vegetable"
     FRUIT = "fruit"
     HERB = "herb"
@@ -12,7 +10,7 @@ class SeedType(StrEnum):
     OTHER = "other"
 
 
-class GrowthStage(StrEnum):
+class GrowthStage(models.TextChoices):
     GERMINATION = "germination"
     SEEDLING = "seedling"
     VEGETATIVE = "vegetative"
@@ -22,175 +20,98 @@ class GrowthStage(StrEnum):
     HARVESTED = "harvested"
 
 
-class Seed(Schema):
+class Seed(models.Model):
     """Seed information - the variety and its characteristics"""
 
-    id: str
-    name: str  # e.g., "Cherry Tomato", "Basil"
-    seed_type: SeedType
-    variety: Optional[str] = None  # e.g., "Sweet 100", "Genovese"
-    supplier: Optional[str] = None
+    name = models.CharField(max_length=100)  # e.g., "Cherry Tomato", "Basil"
+    seed_type = models.CharField(max_length=16, choices=SeedType)
+    variety = models.CharField(max_length=100, null=True, blank=True)  # e.g., "Sweet 100"
+    supplier = models.CharField(max_length=100, null=True, blank=True)
 
     # Growth characteristics
-    germination_days: int = Field(default=7, description="Expected days for germination")
-    days_to_harvest: int = Field(
-        default=60, description="Expected days from germination to harvest"
+    germination_days = models.PositiveIntegerField(
+        default=7, help_text="Expected days for germination"
+    )
+    days_to_harvest = models.PositiveIntegerField(
+        default=60, help_text="Expected days from germination to harvest"
     )
 
     # Optional growing information
-    optimal_ph_min: Optional[float] = None
-    optimal_ph_max: Optional[float] = None
-    optimal_ec_min: Optional[float] = None
-    optimal_ec_max: Optional[float] = None
-    optimal_temp_c_min: Optional[float] = None
-    optimal_temp_c_max: Optional[float] = None
+    optimal_ph_min = models.FloatField(null=True, blank=True)
+    optimal_ph_max = models.FloatField(null=True, blank=True)
+    optimal_ec_min = models.FloatField(null=True, blank=True)
+    optimal_ec_max = models.FloatField(null=True, blank=True)
+    optimal_temp_c_min = models.FloatField(null=True, blank=True)
+    optimal_temp_c_max = models.FloatField(null=True, blank=True)
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    notes: Optional[str] = None
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "seed_tomato_001",
-                "name": "Cherry Tomato",
-                "seed_type": "vegetable",
-                "variety": "Sweet 100",
-                "supplier": "Burpee Seeds",
-                "germination_days": 7,
-                "days_to_harvest": 65,
-                "optimal_ph_min": 5.5,
-                "optimal_ph_max": 6.5,
-            }
-        }
-
-
-class SeedBatch(Schema):
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    notes = models.TextField(null=True, blank=True)
+
+    def __str__(self):
+        return self.name
+
+
+class SeedBatch(models.Model):
     """A batch of seeds planted - links seed variety to actual planting"""
 
-    id: str
-    seed_id: str  # Reference to Seed
-    batch_number: Optional[str] = None
+    seed = models.ForeignKey(Seed, on_delete=models.CASCADE, related_name="batches")
+    batch_number = models.CharField(max_length=64, null=True, blank=True)
 
     # Planting tracking
-    germination_start_date: date
-    actual_germination_date: Optional[date] = None
+    germination_start_date = models.DateField()
+    actual_germination_date = models.DateField(null=True, blank=True)
 
     # Growth tracking
-    current_stage: GrowthStage = GrowthStage.GERMINATION
-    predicted_harvest_date: Optional[date] = None
-    actual_harvest_date: Optional[date] = None
+    current_stage = models.CharField(
+        max_length=16, choices=GrowthStage, default=GrowthStage.GERMINATION
+    )
+    predicted_harvest_date = models.DateField(null=True, blank=True)
+    actual_harvest_date = models.DateField(null=True, blank=True)
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    is_active: bool = True
-    notes: Optional[str] = None
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "batch_001",
-                "seed_id": "seed_tomato_001",
-                "batch_number": "BATCH-2025-001",
-                "germination_start_date": "2025-10-01",
-                "current_stage": "germination",
-            }
-        }
-
-
-class GrowthLogEntry(Schema):
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    is_active = models.BooleanField(default=True)
+    notes = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The nightly forecast only reads batches still growing
+            models.Index(
+                fields=["id"],
+                condition=models.Q(is_active=True, actual_harvest_date__isnull=True),
+                name="seed_batch_growing_idx",
+            )
+        ]
+
+    def __str__(self):
+        return self.batch_number or f"Batch {self.pk}"
+
+
+class GrowthLogEntry(models.Model):
     """Individual growth observation or measurement for a seed batch"""
 
-    id: str
-    seed_batch_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    # Indexed through the (seed_batch, timestamp) index below
+    seed_batch = models.ForeignKey(
+        SeedBatch, on_delete=models.CASCADE, related_name="growth_logs", db_index=False
+    )
+    timestamp = models.DateTimeField(default=timezone.now)
 
     # Observations
-    observation: Optional[str] = None
-    height_cm: Optional[float] = None
-    leaf_count: Optional[int] = None
+    observation = models.TextField(null=True, blank=True)
+    height_cm = models.FloatField(null=True, blank=True)
+    leaf_count = models.PositiveIntegerField(null=True, blank=True)
 
     # Photos
-    photo_urls: list[str] = Field(default_factory=list)
-    notes: Optional[str] = None
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "log_001",
-                "seed_batch_id": "batch_001",
-                "timestamp": "2025-10-05T10:30:00Z",
-                "observation": "First true leaves emerging",
-                "height_cm": 5.2,
-                "leaf_count": 4,
-            }
-        }
-
-
-# Request/Response schemas for API endpoints
-
-
-class SeedCreate(Schema):
-    """Schema for creating a new seed variety"""
-
-    name: str
-    seed_type: SeedType
-    variety: Optional[str] = None
-    supplier: Optional[str] = None
-    germination_days: int = 7
-    days_to_harvest: int = 60
-    optimal_ph_min: Optional[float] = None
-    optimal_ph_max: Optional[float] = None
-    optimal_ec_min: Optional[float] = None
-    optimal_ec_max: Optional[float] = None
-    optimal_temp_c_min: Optional[float] = None
-    optimal_temp_c_max: Optional[float] = None
-    notes: Optional[str] = None
-
-
-class SeedUpdate(Schema):
-    """Schema for updating a seed variety"""
-
-    name: Optional[str] = None
-    variety: Optional[str] = None
-    supplier: Optional[str] = None
-    germination_days: Optional[int] = None
-    days_to_harvest: Optional[int] = None
-    optimal_ph_min: Optional[float] = None
-    optimal_ph_max: Optional[float] = None
-    optimal_ec_min: Optional[float] = None
-    optimal_ec_max: Optional[float] = None
-    optimal_temp_c_min: Optional[float] = None
-    optimal_temp_c_max: Optional[float] = None
-    notes: Optional[str] = None
-
-
-class SeedBatchCreate(Schema):
-    """Schema for creating a new seed batch"""
-
-    seed_id: str
-    batch_number: Optional[str] = None
-    germination_start_date: date
-    notes: Optional[str] = None
-
-
-class SeedBatchUpdate(Schema):
-    """Schema for updating a seed batch"""
-
-    current_stage: Optional[GrowthStage] = None
-    actual_germination_date: Optional[date] = None
-    actual_harvest_date: Optional[date] = None
-    is_active: Optional[bool] = None
-    notes: Optional[str] = None
-
-
-class GrowthLogCreate(Schema):
-    """Schema for adding a growth log entry"""
-
-    observation: Optional[str] = None
-    height_cm: Optional[float] = None
-    leaf_count: Optional[int] = None
-    photo_urls: list[str] = Field(default_factory=list)
-    notes: Optional[str] = None
+    photo_urls = models.JSONField(default=list, blank=True)
+    notes = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["seed_batch", "timestamp"], name="growth_log_batch_time_idx")
+        ]
+
+    def __str__(self):
+        return f"Growth log for batch {self.seed_batch_id} at {self.timestamp}"
@@ -0,0 +1,139 @@
+from datetime import date, datetime
+from typing import Optional
+
+from ninja import Field, ModelSchema, Schema
+
+from .models import GrowthLogEntry, GrowthStage, Seed, SeedBatch, SeedType
+
+
+class SeedSchema(ModelSchema):
+    """Seed variety as returned by the API"""
+
+    class Meta:
+        model = Seed
+        fields = "__all__"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 1,
+                "name": "Cherry Tomato",
+                "seed_type": "vegetable",
+                "variety": "Sweet 100",
+                "supplier": "Burpee Seeds",
+                "germination_days": 7,
+                "days_to_harvest": 65,
+                "optimal_ph_min": 5.5,
+                "optimal_ph_max": 6.5,
+            }
+        }
+
+
+class SeedBatchSchema(ModelSchema):
+    """Seed batch as returned by the API"""
+
+    class Meta:
+        model = SeedBatch
+        fields = "__all__"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 1,
+                "seed": 1,
+                "batch_number": "BATCH-2025-001",
+                "germination_start_date": "2025-10-01",
+                "current_stage": "germination",
+                "predicted_harvest_date": "2025-12-12",
+            }
+        }
+
+
+class GrowthLogEntrySchema(ModelSchema):
+    """Individual growth observation or measurement for a seed batch"""
+
+    photo_urls: list[str] = []
+
+    class Meta:
+        model = GrowthLogEntry
+        fields = "__all__"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 1,
+                "seed_batch": 1,
+                "timestamp": "2025-10-05T10:30:00Z",
+                "observation": "First true leaves emerging",
+                "height_cm": 5.2,
+                "leaf_count": 4,
+            }
+        }
+
+
+# Request/Response schemas for API endpoints
+
+
+class SeedCreate(Schema):
+    """Schema for creating a new seed variety"""
+
+    name: str
+    seed_type: SeedType
+    variety: Optional[str] = None
+    supplier: Optional[str] = None
+    germination_days: int = 7
+    days_to_harvest: int = 60
+    optimal_ph_min: Optional[float] = None
+    optimal_ph_max: Optional[float] = None
+    optimal_ec_min: Optional[float] = None
+    optimal_ec_max: Optional[float] = None
+    optimal_temp_c_min: Optional[float] = None
+    optimal_temp_c_max: Optional[float] = None
+    notes: Optional[str] = None
+
+
+class SeedUpdate(Schema):
+    """Schema for updating a seed variety"""
+
+    name: Optional[str] = None
+    variety: Optional[str] = None
+    supplier: Optional[str] = None
+    germination_days: Optional[int] = None
+    days_to_harvest: Optional[int] = None
+    optimal_ph_min: Optional[float] = None
+    optimal_ph_max: Optional[float] = None
+    optimal_ec_min: Optional[float] = None
+    optimal_ec_max: Optional[float] = None
+    optimal_temp_c_min: Optional[float] = None
+    optimal_temp_c_max: Optional[float] = None
+    notes: Optional[str] = None
+
+
+class SeedBatchCreate(Schema):
+    """Schema for creating a new seed batch"""
+
+    seed_id: int
+    batch_number: Optional[str] = None
+    germination_start_date: date
+    notes: Optional[str] = None
+
+
+class SeedBatchUpdate(Schema):
+    """Schema for updating a seed batch"""
+
+    current_stage: Optional[GrowthStage] = None
+    actual_germination_date: Optional[date] = None
+    actual_harvest_date: Optional[date] = None
+    is_active: Optional[bool] = None
+    notes: Optional[str] = None
+
+
+class GrowthLogCreate(Schema):
+    """Schema for adding a growth log entry"""
+
+    timestamp: Optional[datetime] = None
+    observation: Optional[str] = None
+    height_cm: Optional[float] = None
+    leaf_count: Optional[int] = None
+    photo_urls: list[str] = Field(default_factory=list)
+    notes: Optional[str] = None
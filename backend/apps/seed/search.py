@@ -0,0 +1,56 @@
+"""Seed catalog search.
+
+On SQLite the catalog is indexed by the ``seed_seed_fts`` FTS5 table, kept in
+sync by triggers (see migration 0003). Every word of the query must match the
+start of a word in name, variety, supplier or seed type, so "cher tom"
+finds "Cherry Tomato". Results are ranked by BM25, with name matches weighing
+most. Other databases fall back to ``icontains`` filters.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Seed
+
+# BM25 column weights: name, variety, supplier, seed_type
+RANK_WEIGHTS = (10.0, 5.0, 1.0, 1.0)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _match_expression(words: list[str]) -> str:
+    # Quoting each word keeps FTS5 operators in user input inert
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_seeds(query: str, limit: int = 20) -> list[Seed]:
+    """Return up to ``limit`` seeds matching ``query``, best matches first."""
+    words = _WORD.findall(query)
+    if not words:
+        return []
+    if connection.vendor != "sqlite":
+        filters = Q()
+        for word in words:
+            filters &= (
+                Q(name__icontains=word)
+                | Q(variety__icontains=word)
+                | Q(supplier__icontains=word)
+                | Q(seed_type__icontains=word)
+            )
+        return list(Seed.objects.filter(filters).order_by("name", "id")[:limit])
+
+    weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+    return list(
+        Seed.objects.raw(
+            f"""
+            SELECT seed_seed.* FROM seed_seed_fts
+            JOIN seed_seed ON seed_seed.id = seed_seed_fts.rowid
+            WHERE seed_seed_fts MATCH %s
+            ORDER BY bm25(seed_seed_fts, {weights}), seed_seed.id
+            LIMIT %s
+            """,
+            [_match_expression(words), limit],
+        )
+    )
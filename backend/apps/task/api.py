@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from ninja import Router
+from ninja.errors import HttpError
+from ninja.pagination import paginate
+
+from apps.pagination import CursorPagination
+
+from . import agenda
+from .models import OPEN_STATUSES, Reminder, Task, TaskPriority, TaskScope, TaskStatus
+from .schemas import (
+    AgendaItemSchema,
+    ReminderCreate,
+    ReminderSchema,
+    TaskCreate,
+    TaskSchema,
+    TaskUpdate,
+)
+
+router = Router(tags=["tasks"])
+reminder_router = Router(tags=["reminders"])
+
+# Changing any of these restarts the task's series from scheduled_date
+SCHEDULE_FIELDS = {"scheduled_date", "is_recurring", "recurrence_pattern", "recurrence_interval"}
+
+
+@router.get("/", response=List[TaskSchema])
+@paginate(CursorPagination, ordering=("scheduled_date", "id"))
+def get_tasks(
+    request,
+    status: Optional[TaskStatus] = None,
+    garden_id: Optional[int] = None,
+):
+    tasks = Task.objects.all()
+    if status is not None:
+        tasks = tasks.filter(status=status)
+    if garden_id is not None:
+        tasks = tasks.filter(garden_id=garden_id)
+    return tasks
+
+
+@router.post("/", response=TaskSchema)
+def create_task(request, payload: TaskCreate):
+    return Task.objects.create(**payload.dict())
+
+
+@router.get("/agenda", response=List[AgendaItemSchema])
+def get_agenda(
+    request,
+    start: datetime,
+    end: datetime,
+    scope: Optional[TaskScope] = None,
+    garden_id: Optional[int] = None,
+    pod_id: Optional[int] = None,
+    priority: Optional[TaskPriority] = None,
+):
+    """Occurrences of one-off and recurring tasks whose scheduled-to-due window
+    overlaps ``[start, end)``, in start order."""
+    if end <= start:
+        raise HttpError(400, "end must be after start")
+    if end - start > timedelta(days=settings.AGENDA_MAX_DAYS):
+        raise HttpError(400, f"The range may span at most {settings.AGENDA_MAX_DAYS} days")
+    return agenda.agenda(start, end, scope, garden_id, pod_id, priority)
+
+
+@router.get("/{task_id}", response=TaskSchema)
+def get_task(request, task_id: int):
+    return get_object_or_404(Task, pk=task_id)
+
+
+@router.put("/{task_id}", response=TaskSchema)
+def update_task(request, task_id: int, payload: TaskUpdate):
+    task = get_object_or_404(Task, pk=task_id)
+    changes = payload.dict(exclude_unset=True)
+    for attr, value in changes.items():
+        setattr(task, attr, value)
+    if "due_date" in changes:
+        task.next_due = None  # the sweep works the current occurrence out again
+    if SCHEDULE_FIELDS & changes.keys():
+        task.reset_schedule()
+    elif "status" in changes and not task.is_recurring:
+        # A closed one-off task stops firing; reopening it fires it again
+        if task.status not in OPEN_STATUSES:
+            task.next_run_at = None
+        elif task.last_run_at is None:
+            task.next_run_at = task.scheduled_date
+    task.save()
+    return task
+
+
+@router.delete("/{task_id}")
+def delete_task(request, task_id: int):
+    get_object_or_404(Task, pk=task_id).delete()
+    return {"status": "deleted"}
+
+
+@reminder_router.get("/", response=List[ReminderSchema])
+@paginate(CursorPagination, ordering=("scheduled_time", "id"))
+def get_reminders(request, sent: Optional[bool] = None):
+    reminders = Reminder.objects.all()
+    if sent is not None:
+        reminders = reminders.filter(sent=sent)
+    return reminders
+
+
+@reminder_router.post("/", response=ReminderSchema)
+def create_reminder(request, payload: ReminderCreate):
+    return Reminder.objects.create(**payload.dict())
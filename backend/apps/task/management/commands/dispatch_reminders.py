@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.task.reminders import ReminderDispatcher, plan_task_reminders
+
+
+class Command(BaseCommand):
+    help = "Plan upcoming task reminders and deliver every reminder that is due"
+
+    def handle(self, *args, **options):
+        planned = plan_task_reminders()
+        result = ReminderDispatcher.from_settings().dispatch_due()
+        self.stdout.write(
+            f"Planned {planned} task reminders; delivered {result.delivered}, "
+            f"failed {result.failed} in {result.batches} batches."
+        )
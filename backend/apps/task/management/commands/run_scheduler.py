@@ -0,0 +1,16 @@
+from apscheduler.schedulers.blocking import BlockingScheduler
+from django.core.management.base import BaseCommand
+
+from apps.task.scheduler import build_scheduler
+
+
+class Command(BaseCommand):
+    help = "Run the task scheduling engine in the foreground"
+
+    def handle(self, *args, **options):
+        scheduler = build_scheduler(scheduler_class=BlockingScheduler)
+        self.stdout.write("Task scheduler started; press Ctrl+C to stop.")
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            scheduler.shutdown()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.task.sweeper import sweep
+
+
+class Command(BaseCommand):
+    help = "Mark open tasks past their due date overdue and roll recurring tasks forward"
+
+    def handle(self, *args, **options):
+        result = sweep()
+        self.stdout.write(
+            f"Marked {result.marked_overdue} tasks overdue; rolled {result.rolled_forward} "
+            f"recurring tasks forward ({result.missed} missed) in {result.elapsed:.2f}s."
+        )
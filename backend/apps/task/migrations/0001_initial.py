@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('garden', '0004_pod_and_log_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_type', models.CharField(choices=[('harvest', 'Harvest'), ('prune', 'Prune'), ('transplant', 'Transplant'), ('thin_seedlings', 'Thin Seedlings'), ('nutrient_refill', 'Nutrient Refill'), ('ph_check', 'Ph Check'), ('ec_check', 'Ec Check'), ('water_change', 'Water Change'), ('cleaning', 'Cleaning'), ('filter_change', 'Filter Change'), ('pump_maintenance', 'Pump Maintenance'), ('temperature_check', 'Temperature Check'), ('other', 'Other')], max_length=32)),
+                ('scope', models.CharField(choices=[('seed', 'Seed'), ('garden', 'Garden'), ('pod', 'Pod')], max_length=16)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('seed_batch_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('scheduled_date', models.DateTimeField()),
+                ('due_date', models.DateTimeField(blank=True, null=True)),
+                ('completed_date', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('skipped', 'Skipped'), ('overdue', 'Overdue')], default='pending', max_length=16)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], default='medium', max_length=16)),
+                ('reminder_sent', models.BooleanField(default=False)),
+                ('reminder_minutes_before', models.PositiveIntegerField(default=60, help_text='Minutes before scheduled_date to send reminder')),
+                ('is_recurring', models.BooleanField(default=False)),
+                ('recurrence_pattern', models.CharField(blank=True, choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=16, null=True)),
+                ('recurrence_interval', models.PositiveIntegerField(blank=True, null=True)),
+                ('next_run_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('garden', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='garden.garden')),
+                ('pod', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='garden.gardenpod')),
+            ],
+        ),
+    ]
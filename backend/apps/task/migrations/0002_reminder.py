@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seed_batch_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('reminder_type', models.CharField(choices=[('task', 'Task'), ('harvest', 'Harvest'), ('custom', 'Custom')], max_length=16)),
+                ('message', models.TextField()),
+                ('scheduled_time', models.DateTimeField()),
+                ('sent', models.BooleanField(default=False)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('claim_token', models.UUIDField(blank=True, null=True)),
+                ('claimed_until', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='task.task')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('sent', False)), fields=['scheduled_time'], name='reminder_due_idx'), models.Index(fields=['claim_token'], name='reminder_claim_idx')],
+                'constraints': [models.UniqueConstraint(fields=('task', 'scheduled_time'), name='unique_task_reminder_time')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:37
+
+from django.db import migrations
+
+# R*Tree interval index over the [scheduled_date, due_date] span of one-off
+# tasks, in Unix seconds, so the agenda can find the tasks overlapping a date
+# range without scanning history. Recurring series are left out; the agenda
+# expands them on the fly. Triggers keep it in step with every write to
+# task_task, including bulk and queryset updates.
+SPAN_START = "CAST(strftime('%s', {row}.scheduled_date) AS INTEGER)"
+SPAN_END = (
+    "CAST(strftime('%s', max({row}.scheduled_date, "
+    "coalesce({row}.due_date, {row}.scheduled_date))) AS INTEGER)"
+)
+
+
+def _span(row):
+    return f"{row}.id, {SPAN_START.format(row=row)}, {SPAN_END.format(row=row)}"
+
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE task_task_span USING rtree(id, starts, ends)",
+    f"""
+    CREATE TRIGGER task_task_span_insert AFTER INSERT ON task_task
+    WHEN NOT new.is_recurring BEGIN
+        INSERT INTO task_task_span VALUES ({_span("new")});
+    END
+    """,
+    """
+    CREATE TRIGGER task_task_span_delete AFTER DELETE ON task_task BEGIN
+        DELETE FROM task_task_span WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER task_task_span_update
+    AFTER UPDATE OF scheduled_date, due_date, is_recurring ON task_task BEGIN
+        DELETE FROM task_task_span WHERE id = old.id;
+        INSERT INTO task_task_span SELECT {_span("new")} WHERE NOT new.is_recurring;
+    END
+    """,
+    f"INSERT INTO task_task_span SELECT {_span('task_task')} FROM task_task "
+    "WHERE NOT is_recurring",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS task_task_span_update",
+    "DROP TRIGGER IF EXISTS task_task_span_delete",
+    "DROP TRIGGER IF EXISTS task_task_span_insert",
+    "DROP TABLE IF EXISTS task_task_span",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Other databases fall back to a range filter (see apps.task.agenda)
+        if schema_editor.connection.vendor == "sqlite":
+            for statement in statements:
+                # No params: keeps strftime's %s away from placeholder handling
+                schema_editor.execute(statement, None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0002_reminder'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL), _run(DROP_SQL)),
+    ]
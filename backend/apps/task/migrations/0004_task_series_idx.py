@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0006_gardenalert'),
+        ('task', '0003_task_span_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_recurring', True)), fields=['scheduled_date'], name='task_series_idx'),
+        ),
+    ]
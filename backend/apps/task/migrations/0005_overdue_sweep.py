@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:43
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0006_gardenalert'),
+        ('task', '0004_task_series_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SweepStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sweeps', models.PositiveBigIntegerField(default=0)),
+                ('marked_overdue', models.PositiveBigIntegerField(default=0)),
+                ('rolled_forward', models.PositiveBigIntegerField(default=0)),
+                ('missed', models.PositiveBigIntegerField(default=0)),
+                ('seconds_total', models.FloatField(default=0.0)),
+                ('last_seconds', models.FloatField(default=0.0)),
+                ('last_rows', models.PositiveIntegerField(default=0)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_recurring', False)), fields=['status', 'due_date'], name='task_overdue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(django.db.models.functions.comparison.Greatest('scheduled_date', django.db.models.functions.comparison.Coalesce('due_date', 'scheduled_date')), condition=models.Q(('is_recurring', True)), name='task_window_end_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 14:23
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garden', '0008_anomalies'),
+        ('task', '0005_overdue_sweep'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_window_end_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='next_due',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('next_due', django.db.models.functions.comparison.Greatest('scheduled_date', django.db.models.functions.comparison.Coalesce('due_date', 'scheduled_date'))), condition=models.Q(('is_recurring', True)), name='task_window_end_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_seed_batches(apps, schema_editor):
+    """Point tasks and reminders at the batch their free-text reference names.
+
+    References that are not the id of an existing batch are dropped; a task
+    keeps the old value in its notes.
+    """
+    SeedBatch = apps.get_model('seed', 'SeedBatch')
+    batch_ids = set(SeedBatch.objects.values_list('pk', flat=True))
+    for model_name in ('Task', 'Reminder'):
+        model = apps.get_model('task', model_name)
+        rows = model.objects.filter(legacy_seed_batch__isnull=False).exclude(legacy_seed_batch='')
+        for row in rows.iterator():
+            reference = row.legacy_seed_batch.strip()
+            if reference.isdigit() and int(reference) in batch_ids:
+                row.seed_batch_id = int(reference)
+                row.save(update_fields=['seed_batch'])
+            elif model_name == 'Task':
+                note = f'Seed batch reference {reference!r} matched no batch'
+                row.notes = f'{row.notes}\n{note}' if row.notes else note
+                row.save(update_fields=['notes'])
+
+
+def unlink_seed_batches(apps, schema_editor):
+    for model_name in ('Task', 'Reminder'):
+        model = apps.get_model('task', model_name)
+        for row in model.objects.filter(seed_batch__isnull=False).iterator():
+            row.legacy_seed_batch = str(row.seed_batch_id)
+            row.save(update_fields=['legacy_seed_batch'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seed', '0003_seed_catalog_fts'),
+        ('task', '0006_task_next_due'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='task',
+            old_name='seed_batch_id',
+            new_name='legacy_seed_batch',
+        ),
+        migrations.RenameField(
+            model_name='reminder',
+            old_name='seed_batch_id',
+            new_name='legacy_seed_batch',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='seed_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks', to='seed.seedbatch'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='seed_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reminders', to='seed.seedbatch'),
+        ),
+        migrations.RunPython(link_seed_batches, unlink_seed_batches),
+        migrations.RemoveField(
+            model_name='task',
+            name='legacy_seed_batch',
+        ),
+        migrations.RemoveField(
+            model_name='reminder',
+            name='legacy_seed_batch',
+        ),
+    ]
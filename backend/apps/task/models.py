@@ -1,10 +1,8 @@
-from datetime import datetime
-from typing import Optional
-from enum import StrEnum
-from ninja import Schema, Field
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
 
 
-class TaskType(StrEnum):
+class TaskType(models.TextChoices):
     # Seed-specific tasks
     HARVEST = "harvest"
     PRUNE = "prune"
@@ -25,7 +23,7 @@ class TaskType(StrEnum):
     OTHER = "other"
 
 
-class TaskStatus(StrEnum):
+class TaskStatus(models.TextChoices):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
@@ -33,14 +31,14 @@ class TaskStatus(StrEnum):
     OVERDUE = "overdue"
 
 
-class TaskPriority(StrEnum):
+class TaskPriority(models.TextChoices):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     URGENT = "urgent"
 
 
-class TaskScope(StrEnum):
+class TaskScope(models.TextChoices):
     """Defines what the task applies to"""
 
     SEED = "seed"  # Task for a specific seed batch
@@ -48,158 +46,176 @@ class TaskScope(StrEnum):
     POD = "pod"  # Task for a specific pod
 
 
-class Task(Schema):
+class RecurrencePattern(models.TextChoices):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
+# Statuses the scheduling engine still fires
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.OVERDUE)
+
+
+class Task(models.Model):
     """Universal task model for both seed and garden tasks"""
 
-    id: str
-    task_type: TaskType
-    scope: TaskScope
-    title: str
-    description: Optional[str] = None
+    task_type = models.CharField(max_length=32, choices=TaskType)
+    scope = models.CharField(max_length=16, choices=TaskScope)
+    title = models.CharField(max_length=200)
+    description = models.TextField(null=True, blank=True)
 
     # References (one will be set based on scope)
-    seed_batch_id: Optional[str] = None  # For seed-specific tasks
-    garden_id: Optional[str] = None  # For garden-wide tasks
-    pod_id: Optional[str] = None  # For pod-specific tasks
+    seed_batch = models.ForeignKey(
+        "seed.SeedBatch", on_delete=models.SET_NULL, null=True, blank=True, related_name="tasks"
+    )
+    garden = models.ForeignKey(
+        "garden.Garden", on_delete=models.CASCADE, null=True, blank=True, related_name="tasks"
+    )
+    pod = models.ForeignKey(
+        "garden.GardenPod", on_delete=models.CASCADE, null=True, blank=True, related_name="tasks"
+    )
 
     # Scheduling
-    scheduled_date: datetime
-    due_date: Optional[datetime] = None
-    completed_date: Optional[datetime] = None
+    scheduled_date = models.DateTimeField()
+    due_date = models.DateTimeField(null=True, blank=True)
+    completed_date = models.DateTimeField(null=True, blank=True)
 
     # Status tracking
-    status: TaskStatus = TaskStatus.PENDING
-    priority: TaskPriority = TaskPriority.MEDIUM
+    status = models.CharField(max_length=16, choices=TaskStatus, default=TaskStatus.PENDING)
+    priority = models.CharField(max_length=16, choices=TaskPriority, default=TaskPriority.MEDIUM)
 
     # Reminders
-    reminder_sent: bool = False
-    reminder_minutes_before: int = Field(
-        default=60, description="Minutes before scheduled_date to send reminder"
+    reminder_sent = models.BooleanField(default=False)
+    reminder_minutes_before = models.PositiveIntegerField(
+        default=60, help_text="Minutes before scheduled_date to send reminder"
     )
 
-    # Recurrence
-    is_recurring: bool = False
-    recurrence_pattern: Optional[str] = None  # e.g., "daily", "weekly", "monthly"
-    recurrence_interval: Optional[int] = None  # e.g., every 7 days
+    # Recurrence: every `recurrence_interval` units of `recurrence_pattern`,
+    # anchored at scheduled_date. Without a pattern the interval counts days.
+    is_recurring = models.BooleanField(default=False)
+    recurrence_pattern = models.CharField(
+        max_length=16, choices=RecurrencePattern, null=True, blank=True
+    )
+    recurrence_interval = models.PositiveIntegerField(null=True, blank=True)
+    # When the series' current occurrence closes (its due time, or its start
+    # without one), moved along by the overdue sweep. NULL means the first
+    # occurrence; scheduled_date stays the anchor either way.
+    next_due = models.DateTimeField(null=True, blank=True)
+
+    # Engine bookkeeping: the next occurrence to fire (NULL once nothing is
+    # left to fire) and the last occurrence fired.
+    next_run_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
 
     # Metadata
-    created_at: datetime = Field(default_factory=lambda: datetime.now(datetime.UTC))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(datetime.UTC))
-    notes: Optional[str] = None
-
-    class Config:
-        json_schema_extra = {
-            "examples": [
-                {
-                    "id": "task_harvest_001",
-                    "task_type": "harvest",
-                    "scope": "seed",
-                    "title": "Harvest cherry tomatoes",
-                    "seed_batch_id": "batch_001",
-                    "scheduled_date": "2025-12-05T09:00:00Z",
-                    "priority": "high",
-                    "status": "pending",
-                },
-                {
-                    "id": "task_refill_001",
-                    "task_type": "nutrient_refill",
-                    "scope": "garden",
-                    "title": "Refill nutrient solution",
-                    "description": "Add 500ml of nutrient solution A and B",
-                    "garden_id": "garden_001",
-                    "scheduled_date": "2025-10-10T09:00:00Z",
-                    "priority": "medium",
-                    "is_recurring": True,
-                    "recurrence_pattern": "weekly",
-                    "recurrence_interval": 7,
-                    "status": "pending",
-                },
-            ]
-        }
-
-
-class Reminder(Schema):
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    notes = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Recurring series, which the agenda expands on the fly
+            models.Index(
+                fields=["scheduled_date"],
+                condition=models.Q(is_recurring=True),
+                name="task_series_idx",
+            ),
+            # One-off tasks by status and due date, for the overdue sweep. The
+            # condition has no parameters so SQLite can match it to queries.
+            models.Index(
+                fields=["status", "due_date"],
+                condition=models.Q(is_recurring=False),
+                name="task_overdue_idx",
+            ),
+            # When each series' current occurrence closes, for rolling them forward
+            models.Index(
+                Coalesce(
+                    "next_due", Greatest("scheduled_date", Coalesce("due_date", "scheduled_date"))
+                ),
+                condition=models.Q(is_recurring=True),
+                name="task_window_end_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def reset_schedule(self):
+        """Restart firing from scheduled_date, or stop firing a closed one-off task."""
+        self.next_due = None
+        if self.status in OPEN_STATUSES or self.is_recurring:
+            self.next_run_at = self.scheduled_date
+        else:
+            self.next_run_at = None
+        self.last_run_at = None
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.next_run_at is None:
+            self.reset_schedule()
+        super().save(*args, **kwargs)
+
+
+class SweepStats(models.Model):
+    """Running totals of the overdue sweep (a single row), shared by every process"""
+
+    sweeps = models.PositiveBigIntegerField(default=0)
+    marked_overdue = models.PositiveBigIntegerField(default=0)
+    rolled_forward = models.PositiveBigIntegerField(default=0)
+    missed = models.PositiveBigIntegerField(default=0)
+    seconds_total = models.FloatField(default=0.0)
+    last_seconds = models.FloatField(default=0.0)
+    last_rows = models.PositiveIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.sweeps} sweeps"
+
+
+class ReminderType(models.TextChoices):
+    TASK = "task"
+    HARVEST = "harvest"
+    CUSTOM = "custom"
+
+
+class Reminder(models.Model):
     """Reminder for tasks or harvest dates"""
 
-    id: str
-    task_id: Optional[str] = None  # Reference to Task
-    seed_batch_id: Optional[str] = None  # For harvest reminders
-    reminder_type: str  # "task", "harvest", "custom"
-    message: str
-    scheduled_time: datetime
-    sent: bool = False
-    sent_at: Optional[datetime] = None
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, null=True, blank=True, related_name="reminders"
+    )
+    # For harvest reminders
+    seed_batch = models.ForeignKey(
+        "seed.SeedBatch", on_delete=models.SET_NULL, null=True, blank=True, related_name="reminders"
+    )
+    reminder_type = models.CharField(max_length=16, choices=ReminderType)
+    message = models.TextField()
+    scheduled_time = models.DateTimeField()
+    sent = models.BooleanField(default=False)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    # Dispatch lease: a dispatcher owns the reminder until claimed_until
+    claim_token = models.UUIDField(null=True, blank=True)
+    claimed_until = models.DateTimeField(null=True, blank=True)
 
     # Metadata
-    created_at: datetime = Field(default_factory=lambda: datetime.now(datetime.UTC))
-
-    class Config:
-        json_schema_extra = {
-            "examples": [
-                {
-                    "id": "reminder_001",
-                    "task_id": "task_harvest_001",
-                    "reminder_type": "task",
-                    "message": "Cherry tomatoes ready for harvest in 1 hour",
-                    "scheduled_time": "2025-12-05T08:00:00Z",
-                    "sent": False,
-                },
-                {
-                    "id": "reminder_002",
-                    "seed_batch_id": "batch_001",
-                    "reminder_type": "harvest",
-                    "message": "Cherry tomatoes estimated harvest in 3 days",
-                    "scheduled_time": "2025-12-02T09:00:00Z",
-                    "sent": False,
-                },
-            ]
-        }
-
-
-# Request/Response schemas for API endpoints
-
-
-class TaskCreate(Schema):
-    """Schema for creating a new task"""
-
-    task_type: TaskType
-    scope: TaskScope
-    title: str
-    description: Optional[str] = None
-    seed_batch_id: Optional[str] = None
-    garden_id: Optional[str] = None
-    pod_id: Optional[str] = None
-    scheduled_date: datetime
-    due_date: Optional[datetime] = None
-    priority: TaskPriority = TaskPriority.MEDIUM
-    reminder_minutes_before: int = 60
-    is_recurring: bool = False
-    recurrence_pattern: Optional[str] = None
-    recurrence_interval: Optional[int] = None
-    notes: Optional[str] = None
-
-
-class TaskUpdate(Schema):
-    """Schema for updating a task"""
-
-    title: Optional[str] = None
-    description: Optional[str] = None
-    scheduled_date: Optional[datetime] = None
-    due_date: Optional[datetime] = None
-    status: Optional[TaskStatus] = None
-    priority: Optional[TaskPriority] = None
-    completed_date: Optional[datetime] = None
-    is_recurring: Optional[bool] = None
-    recurrence_pattern: Optional[str] = None
-    recurrence_interval: Optional[int] = None
-    notes: Optional[str] = None
-
-
-class ReminderCreate(Schema):
-    """Schema for creating a reminder"""
-
-    task_id: Optional[str] = None
-    seed_batch_id: Optional[str] = None
-    reminder_type: str
-    message: str
-    scheduled_time: datetime
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Only unsent reminders are indexed, so the due scan stays small
+            # no matter how much delivery history accumulates.
+            models.Index(
+                fields=["scheduled_time"],
+                condition=models.Q(sent=False),
+                name="reminder_due_idx",
+            ),
+            models.Index(fields=["claim_token"], name="reminder_claim_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "scheduled_time"], name="unique_task_reminder_time"
+            )
+        ]
+
+    def __str__(self):
+        return self.message
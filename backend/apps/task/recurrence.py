@@ -0,0 +1,80 @@
+"""Lazy expansion of recurring tasks.
+
+Occurrence ``k`` of a series is computed directly as ``start + k * step`` in
+the scheduler timezone, so finding the next occurrence after any instant is
+O(1) no matter how old the series is, and wall-clock times survive DST
+changes. Monthly steps use ``relativedelta``, which clamps to the end of
+shorter months without drifting (Jan 31 -> Feb 28 -> Mar 31).
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+from zoneinfo import ZoneInfo
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+
+from .models import RecurrencePattern
+
+# Average step lengths, only used to estimate an occurrence index
+_APPROXIMATE_DAYS = {
+    RecurrencePattern.DAILY: 1,
+    RecurrencePattern.WEEKLY: 7,
+    RecurrencePattern.MONTHLY: 30.436875,
+}
+
+
+def _step(pattern: Optional[str], interval: int) -> relativedelta | timedelta:
+    # Adding a timedelta to an aware datetime is wall-clock arithmetic too, and
+    # much cheaper than relativedelta where months are not involved
+    if pattern == RecurrencePattern.WEEKLY:
+        return timedelta(weeks=interval)
+    if pattern == RecurrencePattern.MONTHLY:
+        return relativedelta(months=interval)
+    return timedelta(days=interval)
+
+
+class Recurrence:
+    """Occurrences of a task series anchored at ``start``."""
+
+    def __init__(self, start: datetime, pattern: Optional[str], interval: Optional[int]):
+        self.tz = ZoneInfo(settings.SCHEDULER_TIMEZONE)
+        self.start = start.astimezone(self.tz)
+        self.pattern = pattern
+        self.interval = interval or 1
+        self.step_days = _APPROXIMATE_DAYS.get(pattern, 1) * self.interval
+
+    @classmethod
+    def for_task(cls, task) -> "Recurrence":
+        return cls(task.scheduled_date, task.recurrence_pattern, task.recurrence_interval)
+
+    def occurrence(self, k: int) -> datetime:
+        return self.start + _step(self.pattern, self.interval * k)
+
+    def _index_after(self, instant: datetime) -> int:
+        if instant < self.start:
+            return 0
+        k = max(int((instant - self.start) / timedelta(days=self.step_days)), 0)
+        while self.occurrence(k) <= instant:
+            k += 1
+        while k > 0 and self.occurrence(k - 1) > instant:
+            k -= 1
+        return k
+
+    def after(self, instant: datetime) -> datetime:
+        """First occurrence strictly after ``instant``."""
+        return self.occurrence(self._index_after(instant))
+
+    def between(self, window_start: datetime, window_end: datetime) -> Iterator[datetime]:
+        """Yield occurrences in ``[window_start, window_end)`` one at a time."""
+        k = self._index_after(window_start - timedelta(microseconds=1))
+        while (current := self.occurrence(k)) < window_end:
+            yield current
+            k += 1
+
+
+def next_run_after(task, fired_at: datetime) -> Optional[datetime]:
+    """Next time the engine should fire ``task`` after firing ``fired_at``."""
+    if not task.is_recurring:
+        return None
+    return Recurrence.for_task(task).after(fired_at)
@@ -0,0 +1,186 @@
+"""Reminder planning and dispatch.
+
+Dispatching runs in three steps per batch:
+
+1. claim up to ``batch_size`` due reminders with a lease, found through the
+   partial index on unsent ``scheduled_time``;
+2. deliver them concurrently to every configured sink;
+3. mark the delivered ones sent with a single UPDATE and release the rest.
+
+Claims make concurrent dispatchers safe and a reminder is only marked sent
+once every sink accepted it. A crash between delivery and marking can only
+cause redelivery, never loss; sinks receive the reminder id to deduplicate.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Protocol
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OPEN_STATUSES, Reminder, ReminderType, Task
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderSink(Protocol):
+    """Delivers a reminder somewhere; raise to signal failure."""
+
+    async def send(self, reminder: Reminder) -> None: ...
+
+
+class LogSink:
+    """Writes reminders to the ``apps.task.reminders`` logger."""
+
+    async def send(self, reminder: Reminder) -> None:
+        logger.info("Reminder %s: %s", reminder.pk, reminder.message)
+
+
+class FileSink:
+    """Appends one JSON line per reminder to a local file, for testing."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    async def send(self, reminder: Reminder) -> None:
+        line = json.dumps(
+            {
+                "id": reminder.pk,
+                "task_id": reminder.task_id,
+                "reminder_type": reminder.reminder_type,
+                "message": reminder.message,
+                "scheduled_time": reminder.scheduled_time.isoformat(),
+            }
+        )
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+
+def sinks_from_settings() -> list[ReminderSink]:
+    return [
+        import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+        for config in settings.REMINDER_SINKS
+    ]
+
+
+@dataclass
+class DispatchResult:
+    delivered: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class ReminderDispatcher:
+    def __init__(
+        self,
+        sinks: Optional[Iterable[ReminderSink]] = None,
+        batch_size: int = 500,
+        concurrency: int = 100,
+        lease: timedelta = timedelta(minutes=5),
+    ):
+        self.sinks = list(sinks) if sinks is not None else sinks_from_settings()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.lease = lease
+
+    @classmethod
+    def from_settings(cls) -> "ReminderDispatcher":
+        return cls(
+            batch_size=settings.REMINDER_DISPATCH_BATCH_SIZE,
+            concurrency=settings.REMINDER_DISPATCH_CONCURRENCY,
+        )
+
+    def claim(self, now: datetime) -> list[Reminder]:
+        """Lease the next batch of due reminders to this dispatcher."""
+        token = uuid.uuid4()
+        claimable = Reminder.objects.filter(sent=False, scheduled_time__lte=now).filter(
+            Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+        )
+        with transaction.atomic():
+            due = claimable.order_by("scheduled_time").values_list("id", flat=True)
+            # Re-checking the claim in the UPDATE keeps racing dispatchers apart
+            claimable.filter(id__in=list(due[: self.batch_size])).update(
+                claim_token=token, claimed_until=now + self.lease
+            )
+        return list(Reminder.objects.filter(claim_token=token))
+
+    async def deliver(self, reminders: list[Reminder]) -> list[Reminder]:
+        """Send ``reminders`` to every sink concurrently; return the ones fully delivered."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(reminder: Reminder) -> bool:
+            async with semaphore:
+                try:
+                    for sink in self.sinks:
+                        await sink.send(reminder)
+                except Exception:
+                    logger.exception("Delivering reminder %s failed", reminder.pk)
+                    return False
+                return True
+
+        outcomes = await asyncio.gather(*(send(reminder) for reminder in reminders))
+        return [reminder for reminder, ok in zip(reminders, outcomes) if ok]
+
+    def complete(self, claimed: list[Reminder], delivered: list[Reminder], now: datetime) -> None:
+        delivered_ids = {reminder.pk for reminder in delivered}
+        failed_ids = [reminder.pk for reminder in claimed if reminder.pk not in delivered_ids]
+        with transaction.atomic():
+            Reminder.objects.filter(id__in=delivered_ids).update(
+                sent=True, sent_at=now, claim_token=None, claimed_until=None
+            )
+            Reminder.objects.filter(id__in=failed_ids).update(claim_token=None, claimed_until=None)
+            task_ids = {reminder.task_id for reminder in delivered if reminder.task_id}
+            Task.objects.filter(id__in=task_ids).update(reminder_sent=True)
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> DispatchResult:
+        """Deliver every reminder due at ``now``, one claimed batch at a time."""
+        now = now or timezone.now()
+        result = DispatchResult()
+        while claimed := self.claim(now):
+            delivered = asyncio.run(self.deliver(claimed))
+            self.complete(claimed, delivered, now)
+            result.batches += 1
+            result.delivered += len(delivered)
+            result.failed += len(claimed) - len(delivered)
+            if len(delivered) < len(claimed):
+                break  # leave failures for the next run instead of spinning on them
+        return result
+
+
+def plan_task_reminders(now: Optional[datetime] = None, window: Optional[timedelta] = None) -> int:
+    """Create the reminder for every open task occurrence due within ``window``.
+
+    Reminders are keyed on (task, scheduled_time), so running this repeatedly
+    never creates duplicates. Returns the number of occurrences considered.
+    """
+    now = now or timezone.now()
+    window = window or timedelta(hours=settings.REMINDER_PLANNING_WINDOW_HOURS)
+    tasks = Task.objects.filter(
+        next_run_at__gte=now,
+        next_run_at__lte=now + window,
+        reminder_sent=False,
+        status__in=OPEN_STATUSES,
+    ).values_list("id", "title", "next_run_at", "reminder_minutes_before")
+    reminders = [
+        Reminder(
+            task_id=task_id,
+            reminder_type=ReminderType.TASK,
+            message=f"{title} is due at {run_at.isoformat()}",
+            scheduled_time=run_at - timedelta(minutes=minutes_before),
+        )
+        for task_id, title, run_at, minutes_before in tasks.iterator(chunk_size=2000)
+    ]
+    Reminder.objects.bulk_create(reminders, batch_size=500, ignore_conflicts=True)
+    return len(reminders)
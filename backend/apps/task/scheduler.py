@@ -0,0 +1,253 @@
+"""Task scheduling engine.
+
+A single APScheduler job ticks the :class:`TaskEngine`, which keeps one heap
+of upcoming task occurrences ordered by fire time. Only tasks whose
+``next_run_at`` falls inside the look-ahead horizon are loaded, through the
+index on that column, so neither a timer per task nor a full table scan per
+tick is needed. After firing, a recurring task's next occurrence is computed
+lazily from its recurrence and persisted back to ``next_run_at``; one-off
+tasks drop out with ``next_run_at`` cleared.
+"""
+
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.garden.retention import apply_retention
+from apps.garden.sync import compact_changes
+from apps.seed.forecast import forecast_harvests
+
+from .models import Task
+from .recurrence import next_run_after
+from .reminders import ReminderDispatcher, plan_task_reminders
+from .sweeper import sweep
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[Task, datetime], None]
+
+ENGINE_JOB_ID = "seedr-task-engine"
+REMINDER_JOB_ID = "seedr-reminder-dispatch"
+FORECAST_JOB_ID = "seedr-harvest-forecast"
+RETENTION_JOB_ID = "seedr-retention"
+SWEEP_JOB_ID = "seedr-overdue-sweep"
+COMPACTION_JOB_ID = "seedr-sync-compaction"
+
+
+def log_task_due(task: Task, run_at: datetime) -> None:
+    """Default handler: record that an occurrence came due."""
+    logger.info("Task %s (%s) due at %s", task.pk, task.title, run_at.isoformat())
+
+
+class TaskEngine:
+    """Fires due task occurrences in time order from an in-memory heap."""
+
+    def __init__(
+        self,
+        handlers: Optional[Iterable[TaskHandler]] = None,
+        horizon: timedelta = timedelta(hours=1),
+    ):
+        self.handlers = list(handlers) if handlers is not None else [log_task_due]
+        self.horizon = horizon
+        self._heap: list[tuple[datetime, int]] = []
+        # task id -> run_at of its live heap entry; anything else is stale
+        self._queued: dict[int, datetime] = {}
+        self._loaded_until: Optional[datetime] = None
+
+    @classmethod
+    def from_settings(cls) -> "TaskEngine":
+        return cls(
+            handlers=[import_string(path) for path in settings.TASK_ENGINE_HANDLERS],
+            horizon=timedelta(seconds=settings.TASK_ENGINE_HORIZON_SECONDS),
+        )
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def _push(self, task_id: int, run_at: datetime) -> None:
+        if self._queued.get(task_id) != run_at:
+            self._queued[task_id] = run_at
+            heapq.heappush(self._heap, (run_at, task_id))
+
+    def refill(self, now: datetime) -> None:
+        """Queue every task due before ``now + horizon``."""
+        horizon_end = now + self.horizon
+        due = Task.objects.filter(next_run_at__lte=horizon_end).values_list("id", "next_run_at")
+        for task_id, run_at in due.iterator(chunk_size=2000):
+            self._push(task_id, run_at)
+        self._loaded_until = horizon_end
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """Fire everything due at ``now`` and return the number of occurrences fired."""
+        now = now or timezone.now()
+        if self._loaded_until is None or now + self.horizon / 2 >= self._loaded_until:
+            self.refill(now)
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            run_at, task_id = heapq.heappop(self._heap)
+            if self._queued.get(task_id) == run_at:
+                del self._queued[task_id]
+                due.append((task_id, run_at))
+        if not due:
+            return 0
+
+        tasks = Task.objects.in_bulk([task_id for task_id, _ in due])
+        fired = []
+        for task_id, run_at in due:
+            task = tasks.get(task_id)
+            if task is None or task.next_run_at != run_at:
+                continue  # deleted or rescheduled since it was queued
+            for handler in self.handlers:
+                try:
+                    handler(task, run_at)
+                except Exception:
+                    logger.exception("Task handler %r failed for task %s", handler, task_id)
+            task.last_run_at = run_at
+            # Missed occurrences are coalesced into this one, like APScheduler's coalesce
+            task.next_run_at = next_run_after(task, max(run_at, now))
+            if task.next_run_at is not None:
+                task.reminder_sent = False  # the next occurrence gets its own reminder
+                if task.next_run_at <= self._loaded_until:
+                    self._push(task.pk, task.next_run_at)
+            fired.append(task)
+
+        Task.objects.bulk_update(
+            fired, ["last_run_at", "next_run_at", "reminder_sent"], batch_size=500
+        )
+        return len(fired)
+
+
+def _run_tick(engine: TaskEngine) -> None:
+    try:
+        engine.tick()
+    finally:
+        close_old_connections()
+
+
+def _run_reminders(dispatcher: ReminderDispatcher) -> None:
+    try:
+        plan_task_reminders()
+        dispatcher.dispatch_due()
+    finally:
+        close_old_connections()
+
+
+def _run_sweep() -> None:
+    try:
+        result = sweep()
+        if result.marked_overdue or result.rolled_forward:
+            logger.info(
+                "Marked %s tasks overdue, rolled %s recurring tasks forward in %.2fs",
+                result.marked_overdue,
+                result.rolled_forward,
+                result.elapsed,
+            )
+    finally:
+        close_old_connections()
+
+
+def _run_forecast() -> None:
+    try:
+        result = forecast_harvests()
+        logger.info("Forecast %s batches, %s changed", result.forecast, result.updated)
+    finally:
+        close_old_connections()
+
+
+def _run_retention() -> None:
+    try:
+        result = apply_retention()
+        logger.info(
+            "Retention deleted %s readings in %s chunks, reclaimed %s bytes in %.1fs",
+            result.deleted,
+            result.chunks,
+            result.reclaimed_bytes,
+            result.elapsed,
+        )
+    finally:
+        close_old_connections()
+
+
+def _run_compaction() -> None:
+    try:
+        logger.info("Compacted %s superseded sync changes", compact_changes())
+    finally:
+        close_old_connections()
+
+
+def build_scheduler(
+    engine: Optional[TaskEngine] = None,
+    dispatcher: Optional[ReminderDispatcher] = None,
+    scheduler_class=BackgroundScheduler,
+):
+    """Return an APScheduler instance driving the task engine, reminder dispatch,
+    the overdue sweep, the nightly harvest forecast, raw reading retention and
+    sync change log compaction.
+
+    Each runs as a single job, however many tasks or batches there are.
+    """
+    engine = engine or TaskEngine.from_settings()
+    dispatcher = dispatcher or ReminderDispatcher.from_settings()
+    scheduler = scheduler_class(timezone=settings.SCHEDULER_TIMEZONE)
+    scheduler.add_job(
+        _run_tick,
+        "interval",
+        args=[engine],
+        seconds=settings.TASK_ENGINE_TICK_SECONDS,
+        id=ENGINE_JOB_ID,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=timezone.now(),
+    )
+    scheduler.add_job(
+        _run_reminders,
+        "interval",
+        args=[dispatcher],
+        seconds=settings.REMINDER_DISPATCH_INTERVAL_SECONDS,
+        id=REMINDER_JOB_ID,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=timezone.now(),
+    )
+    scheduler.add_job(
+        _run_sweep,
+        "interval",
+        seconds=settings.OVERDUE_SWEEP_INTERVAL_SECONDS,
+        id=SWEEP_JOB_ID,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=timezone.now(),
+    )
+    scheduler.add_job(
+        _run_forecast,
+        "cron",
+        hour=settings.HARVEST_FORECAST_HOUR,
+        id=FORECAST_JOB_ID,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _run_retention,
+        "cron",
+        hour=settings.RETENTION_HOUR,
+        id=RETENTION_JOB_ID,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _run_compaction,
+        "cron",
+        hour=settings.SYNC_COMPACTION_HOUR,
+        id=COMPACTION_JOB_ID,
+        max_instances=1,
+        coalesce=True,
+    )
+    return scheduler
@@ -0,0 +1,156 @@
+from datetime import datetime
+from typing import Optional
+
+from ninja import Field, ModelSchema, Schema
+
+from .models import (
+    RecurrencePattern,
+    Reminder,
+    ReminderType,
+    Task,
+    TaskPriority,
+    TaskScope,
+    TaskStatus,
+    TaskType,
+)
+
+
+class TaskSchema(ModelSchema):
+    """Task as returned by the API"""
+
+    class Meta:
+        model = Task
+        fields = "__all__"
+
+    class Config:
+        json_schema_extra = {
+            "examples": [
+                {
+                    "id": 1,
+                    "task_type": "harvest",
+                    "scope": "seed",
+                    "title": "Harvest cherry tomatoes",
+                    "seed_batch": 1,
+                    "scheduled_date": "2025-12-05T09:00:00Z",
+                    "priority": "high",
+                    "status": "pending",
+                },
+                {
+                    "id": 2,
+                    "task_type": "nutrient_refill",
+                    "scope": "garden",
+                    "title": "Refill nutrient solution",
+                    "description": "Add 500ml of nutrient solution A and B",
+                    "garden": 1,
+                    "scheduled_date": "2025-10-10T09:00:00Z",
+                    "priority": "medium",
+                    "is_recurring": True,
+                    "recurrence_pattern": "weekly",
+                    "recurrence_interval": 1,
+                    "status": "pending",
+                },
+            ]
+        }
+
+
+class ReminderSchema(ModelSchema):
+    """Reminder for tasks or harvest dates"""
+
+    class Meta:
+        model = Reminder
+        exclude = ["claim_token", "claimed_until"]
+
+    class Config:
+        json_schema_extra = {
+            "examples": [
+                {
+                    "id": 1,
+                    "task": 1,
+                    "reminder_type": "task",
+                    "message": "Cherry tomatoes ready for harvest in 1 hour",
+                    "scheduled_time": "2025-12-05T08:00:00Z",
+                    "sent": False,
+                },
+                {
+                    "id": 2,
+                    "seed_batch": 1,
+                    "reminder_type": "harvest",
+                    "message": "Cherry tomatoes estimated harvest in 3 days",
+                    "scheduled_time": "2025-12-02T09:00:00Z",
+                    "sent": False,
+                },
+            ]
+        }
+
+
+# Request/Response schemas for API endpoints
+
+
+class TaskCreate(Schema):
+    """Schema for creating a new task"""
+
+    task_type: TaskType
+    scope: TaskScope
+    title: str
+    description: Optional[str] = None
+    seed_batch_id: Optional[int] = None
+    garden_id: Optional[int] = None
+    pod_id: Optional[int] = None
+    scheduled_date: datetime
+    due_date: Optional[datetime] = None
+    priority: TaskPriority = TaskPriority.MEDIUM
+    reminder_minutes_before: int = 60
+    is_recurring: bool = False
+    recurrence_pattern: Optional[RecurrencePattern] = None
+    recurrence_interval: Optional[int] = Field(default=None, ge=1)
+    notes: Optional[str] = None
+
+
+class TaskUpdate(Schema):
+    """Schema for updating a task"""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    scheduled_date: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    completed_date: Optional[datetime] = None
+    is_recurring: Optional[bool] = None
+    recurrence_pattern: Optional[RecurrencePattern] = None
+    recurrence_interval: Optional[int] = Field(default=None, ge=1)
+    notes: Optional[str] = None
+
+
+class ReminderCreate(Schema):
+    """Schema for creating a reminder"""
+
+    task_id: Optional[int] = None
+    seed_batch_id: Optional[int] = None
+    reminder_type: ReminderType
+    message: str
+    scheduled_time: datetime
+
+
+class AgendaItemSchema(Schema):
+    """One occurrence of a task on the agenda"""
+
+    task_id: int
+    title: str
+    task_type: TaskType
+    scope: TaskScope
+    priority: TaskPriority
+    status: TaskStatus
+    garden_id: Optional[int] = None
+    pod_id: Optional[int] = None
+    seed_batch_id: Optional[int] = None
+    is_recurring: bool
+    starts_at: datetime
+    due_at: Optional[datetime] = None
+
+
+class TaskImport(TaskCreate):
+    """Schema for a task loaded from another system's history"""
+
+    status: TaskStatus = TaskStatus.PENDING
+    completed_date: Optional[datetime] = None
@@ -0,0 +1,148 @@
+"""Overdue sweep.
+
+Runs every ``OVERDUE_SWEEP_INTERVAL_SECONDS`` and does two things:
+
+1. One-off tasks still pending or in progress past their ``due_date`` are
+   marked overdue with a single UPDATE, found through the partial
+   ``task_overdue_idx`` index, so no task is loaded into Python.
+2. Recurring tasks whose current occurrence has closed (past its due time,
+   or its start without one) are rolled forward: ``next_due`` moves to the
+   close of the first occurrence still open and the status goes back to
+   pending. They are read through the partial ``task_window_end_idx`` index
+   and written ``OVERDUE_SWEEP_BATCH_SIZE`` at a time. Occurrences still open
+   when rolled past are counted as missed. ``scheduled_date`` and ``due_date``
+   stay the series anchor, so the agenda still expands past occurrences and
+   monthly series keep their day, and the engine's ``next_run_at`` is left
+   alone since the series is unchanged.
+
+Sweeps, rows touched and runtime are added up in the ``SweepStats`` row, so
+the API processes can report what the scheduler process did.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import OPEN_STATUSES, SweepStats, Task, TaskStatus
+from .recurrence import Recurrence
+
+# Statuses a one-off task leaves for overdue once past its due date
+DUE_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+# When a task's current occurrence closes, the first one until the sweep rolls it
+WINDOW_END = Coalesce(
+    "next_due", Greatest("scheduled_date", Coalesce("due_date", "scheduled_date"))
+)
+
+
+@dataclass
+class SweepResult:
+    marked_overdue: int = 0
+    rolled_forward: int = 0
+    missed: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+
+def record(result: SweepResult, now: datetime) -> None:
+    """Add ``result`` to the shared sweep counters."""
+    changes = {
+        "marked_overdue": F("marked_overdue") + result.marked_overdue,
+        "rolled_forward": F("rolled_forward") + result.rolled_forward,
+        "missed": F("missed") + result.missed,
+        "seconds_total": F("seconds_total") + result.elapsed,
+        "last_seconds": result.elapsed,
+        "last_rows": result.marked_overdue + result.rolled_forward,
+        "last_run_at": now,
+    }
+    if not SweepStats.objects.filter(pk=1).update(sweeps=F("sweeps") + 1, **changes):
+        SweepStats.objects.create(
+            pk=1,
+            sweeps=1,
+            marked_overdue=result.marked_overdue,
+            rolled_forward=result.rolled_forward,
+            missed=result.missed,
+            seconds_total=result.elapsed,
+            last_seconds=result.elapsed,
+            last_rows=result.marked_overdue + result.rolled_forward,
+            last_run_at=now,
+        )
+
+
+def snapshot() -> dict:
+    """The sweep counters, all zero before the first sweep."""
+    row = SweepStats.objects.filter(pk=1).first() or SweepStats()
+    return {
+        field.name: getattr(row, field.name)
+        for field in SweepStats._meta.concrete_fields
+        if not field.primary_key
+    }
+
+
+def mark_overdue(now: datetime) -> int:
+    """Mark open one-off tasks past their due date overdue; returns the rows updated."""
+    return Task.objects.filter(
+        is_recurring=False, status__in=DUE_STATUSES, due_date__lt=now
+    ).update(status=TaskStatus.OVERDUE, updated_at=now)
+
+
+def roll_forward(task: Task, now: datetime) -> None:
+    """Move ``task`` on to the first of its occurrences whose window is still open."""
+    span = task.due_date - task.scheduled_date if task.due_date is not None else None
+    if span is not None and span.total_seconds() > 0:
+        task.next_due = Recurrence.for_task(task).after(now - span) + span
+    else:
+        task.next_due = Recurrence.for_task(task).after(now)
+    task.status = TaskStatus.PENDING
+    task.updated_at = now
+
+
+def roll_recurring(now: datetime, batch_size: int) -> tuple[int, int, int]:
+    """Roll forward every recurring task whose occurrence closed before ``now``.
+
+    Returns the tasks rolled, how many of them were still open, and the batches.
+    """
+    closed = (
+        Task.objects.alias(window_end=WINDOW_END)
+        .filter(is_recurring=True, window_end__lt=now)
+        .only(
+            "scheduled_date",
+            "due_date",
+            "status",
+            "recurrence_pattern",
+            "recurrence_interval",
+            "is_recurring",
+        )
+    )
+    rolled = missed = batches = 0
+    # Rolled tasks leave the filter, so each batch picks up where the last stopped
+    while tasks := list(closed[:batch_size]):
+        for task in tasks:
+            missed += task.status in OPEN_STATUSES
+            roll_forward(task, now)
+        with transaction.atomic():
+            Task.objects.bulk_update(tasks, ["next_due", "status", "updated_at"], batch_size=500)
+        rolled += len(tasks)
+        batches += 1
+    return rolled, missed, batches
+
+
+def sweep(now: Optional[datetime] = None, batch_size: Optional[int] = None) -> SweepResult:
+    """Mark overdue tasks and roll recurring ones forward, recording the counters."""
+    started = time.perf_counter()
+    now = now or timezone.now()
+    result = SweepResult()
+    result.marked_overdue = mark_overdue(now)
+    result.rolled_forward, result.missed, result.batches = roll_recurring(
+        now, batch_size or settings.OVERDUE_SWEEP_BATCH_SIZE
+    )
+    result.elapsed = time.perf_counter() - started
+    record(result, now)
+    return result
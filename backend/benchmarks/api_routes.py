@@ -0,0 +1,367 @@
+"""Benchmark the API routes in-process against a synthetic farm.
+
+Builds a temporary database with :func:`benchmarks.farm.build_farm` (the
+``--size`` preset, adjusted by the per-dimension options), then replays each
+scenario below through httpx's ASGI transport, the way the tests call the API:
+no server, socket or worker processes, so the numbers cover routing,
+validation, queries and serialization only. Requests rotate over the farm's
+gardens, pods and batches so no single row stays hot.
+
+For every scenario it reports requests/sec, p50/p95/p99 latency, queries per
+request (from :mod:`apps.metrics`) and errors. ``--save-baseline NAME`` writes
+the results to ``benchmarks/baselines/NAME.json``; ``--compare NAME`` prints
+the change against that file and exits non-zero when a scenario got slower or
+issues more queries than ``--tolerance`` allows.
+
+    python -m benchmarks.api_routes --size medium --save-baseline main
+    python -m benchmarks.api_routes --size medium --compare main
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import urlencode
+
+from .farm import PRESETS, Farm, FarmSize, build_farm
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    # Builds the path, and the JSON body for writes, of the i-th request
+    request: Callable[[Farm, int], tuple[str, Optional[Any]]]
+    method: str = "GET"
+
+
+def _garden(farm: Farm, i: int) -> int:
+    return farm.garden_ids[i % len(farm.garden_ids)]
+
+
+def _window(farm: Farm, days: int) -> str:
+    """Query string of the last ``days`` days, or the next ones when negative."""
+    bounds = sorted([farm.now, farm.now - timedelta(days=days)])
+    return urlencode({"start": bounds[0].isoformat(), "end": bounds[1].isoformat()})
+
+
+def _readings(farm: Farm, i: int) -> list[dict]:
+    first = farm.now + timedelta(hours=i)
+    return [
+        {"timestamp": (first + timedelta(minutes=5 * n)).isoformat(), "ph_level": 6.1}
+        for n in range(12)
+    ]
+
+
+def _task(farm: Farm, i: int) -> dict:
+    return {
+        "task_type": "ph_check",
+        "scope": "garden",
+        "title": f"Bench task {i}",
+        "garden_id": _garden(farm, i),
+        "scheduled_date": (farm.now + timedelta(days=1)).isoformat(),
+    }
+
+
+SCENARIOS = [
+    Scenario("health", lambda farm, i: ("/api/v1/health", None)),
+    Scenario("garden list", lambda farm, i: ("/api/v1/gardens/", None)),
+    Scenario("garden detail", lambda farm, i: (f"/api/v1/gardens/{_garden(farm, i)}", None)),
+    Scenario("dashboard", lambda farm, i: ("/api/v1/gardens/dashboard", None)),
+    Scenario(
+        "garden dashboard",
+        lambda farm, i: (f"/api/v1/gardens/{_garden(farm, i)}/dashboard", None),
+    ),
+    Scenario(
+        "delta sync", lambda farm, i: (f"/api/v1/gardens/changes?cursor={i % 50}&limit=500", None)
+    ),
+    Scenario("pod list", lambda farm, i: (f"/api/v1/gardens/{_garden(farm, i)}/pods/", None)),
+    Scenario(
+        "pod detail",
+        lambda farm, i: (
+            f"/api/v1/gardens/{_garden(farm, i)}/pods/"
+            f"{farm.pod_numbers[i % len(farm.pod_numbers)]}",
+            None,
+        ),
+    ),
+    Scenario(
+        "readings page",
+        lambda farm, i: (f"/api/v1/gardens/{_garden(farm, i)}/environment/?limit=100", None),
+    ),
+    Scenario(
+        "readings day",
+        lambda farm, i: (
+            f"/api/v1/gardens/{_garden(farm, i)}/environment/?limit=500&{_window(farm, 1)}",
+            None,
+        ),
+    ),
+    Scenario(
+        "rollups month",
+        lambda farm, i: (
+            f"/api/v1/gardens/{_garden(farm, i)}/environment/rollups?{_window(farm, 30)}",
+            None,
+        ),
+    ),
+    Scenario(
+        "export day",
+        lambda farm, i: (
+            f"/api/v1/gardens/{_garden(farm, i)}/environment/export?{_window(farm, 1)}",
+            None,
+        ),
+    ),
+    Scenario("alerts", lambda farm, i: (f"/api/v1/gardens/{_garden(farm, i)}/alerts", None)),
+    Scenario("seed list", lambda farm, i: ("/api/v1/seeds/?limit=100", None)),
+    Scenario(
+        "seed search",
+        lambda farm, i: (f"/api/v1/seeds/search?q={['tom', 'bas', 'red', 'kale'][i % 4]}", None),
+    ),
+    Scenario("batch list", lambda farm, i: ("/api/v1/batches/?limit=100", None)),
+    Scenario(
+        "growth logs",
+        lambda farm, i: (f"/api/v1/batches/{farm.batch_ids[i % len(farm.batch_ids)]}/logs", None),
+    ),
+    Scenario(
+        "task list",
+        lambda farm, i: (f"/api/v1/tasks/?garden_id={_garden(farm, i)}&limit=100", None),
+    ),
+    Scenario(
+        "agenda week",
+        lambda farm, i: (
+            f"/api/v1/tasks/agenda?garden_id={_garden(farm, i)}&{_window(farm, -7)}",
+            None,
+        ),
+    ),
+    Scenario(
+        "ingest",
+        lambda farm, i: (f"/api/v1/gardens/{_garden(farm, i)}/environment/", _readings(farm, i)),
+        method="POST",
+    ),
+    Scenario("create task", lambda farm, i: ("/api/v1/tasks/", _task(farm, i)), method="POST"),
+]
+
+
+def _percentile(latencies: list[float], p: float) -> float:
+    return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+
+async def run_scenario(
+    client, farm: Farm, scenario: Scenario, requests: int, concurrency: int, warmup: int
+) -> dict:
+    """Replay ``requests`` requests of ``scenario`` over ``concurrency`` clients."""
+    from apps import metrics
+
+    async def call(i: int):
+        path, body = scenario.request(farm, i)
+        if scenario.method == "GET":
+            return await client.get(path)
+        return await client.request(scenario.method, path, json=body)
+
+    for i in range(warmup):
+        await call(requests + i)
+    metrics.registry.reset()
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in remaining:
+            started = time.perf_counter()
+            response = await call(i)
+            await response.aread()
+            if response.status_code < 400:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    totals = metrics.registry.totals()
+    latencies.sort()
+    served = max(totals["requests"], 1)
+    return {
+        "requests": requests,
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) if latencies else 0.0,
+        "p95_ms": _percentile(latencies, 0.95) if latencies else 0.0,
+        "p99_ms": _percentile(latencies, 0.99) if latencies else 0.0,
+        "queries_per_request": totals["queries"] / served,
+        "db_ms_per_request": totals["db_seconds"] * 1000 / served,
+        "errors": errors,
+    }
+
+
+async def run_suite(
+    farm: Farm,
+    requests: int,
+    concurrency: int = 1,
+    warmup: int = 5,
+    only: Optional[list[str]] = None,
+) -> dict[str, dict]:
+    """Run every scenario (or those named in ``only``) in turn, returning results by name."""
+    from httpx import ASGITransport, AsyncClient
+
+    from seedr.asgi import application
+
+    results = {}
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for scenario in SCENARIOS:
+            if only and scenario.name not in only:
+                continue
+            results[scenario.name] = await run_scenario(
+                client, farm, scenario, requests, concurrency, warmup
+            )
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Describe every scenario that regressed against ``baseline``.
+
+    A scenario regresses when its p95 latency grows, or its throughput drops,
+    by more than ``tolerance`` (a fraction), when it issues more queries per
+    request, or when it starts failing.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+        if result["requests_per_sec"] < before["requests_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {before['requests_per_sec']:.0f} -> "
+                f"{result['requests_per_sec']:.0f} req/s"
+            )
+        if result["queries_per_request"] > before["queries_per_request"] + 0.01:
+            regressions.append(
+                f"{name}: {before['queries_per_request']:.1f} -> "
+                f"{result['queries_per_request']:.1f} queries per request"
+            )
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: {before['errors']} -> {result['errors']} errors")
+    return regressions
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "app_env": os.environ.get("APP_ENV", "development"),
+    }
+
+
+def _change(now: float, before: Optional[float]) -> str:
+    if not before:
+        return ""
+    return f"{(now - before) / before:+.0%}"
+
+
+def _print(results: dict[str, dict], baseline: Optional[dict[str, dict]]) -> None:
+    header = f"{'scenario':<18}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    header += f"{'queries':>9}{'db ms':>8}{'errors':>8}"
+    if baseline is not None:
+        header += f"{'Δ req/s':>9}{'Δ p95':>8}"
+    print(header)
+    for name, result in results.items():
+        line = (
+            f"{name:<18}{result['requests_per_sec']:>9.0f}{result['p50_ms']:>9.2f}"
+            f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{result['queries_per_request']:>9.1f}{result['db_ms_per_request']:>8.2f}"
+            f"{result['errors']:>8}"
+        )
+        if baseline is not None:
+            before = baseline.get(name, {})
+            line += f"{_change(result['requests_per_sec'], before.get('requests_per_sec')):>9}"
+            line += f"{_change(result['p95_ms'], before.get('p95_ms')):>8}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=sorted(PRESETS), default="medium")
+    for name, default in vars(FarmSize()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), dest=name)
+    parser.add_argument("--seed", type=int, default=7, help="random seed of the farm")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", action="append", help="run just this scenario (repeatable)")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed slowdown, as a fraction"
+    )
+    args = parser.parse_args()
+
+    size = replace(
+        PRESETS[args.size],
+        **{
+            name: getattr(args, name)
+            for name in vars(FarmSize())
+            if getattr(args, name) is not None
+        },
+    )
+    baseline = None
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SQLITE_DB_PATH"] = str(Path(tmp) / "bench.sqlite3")
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seedr.settings")
+        import django
+
+        django.setup()
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
+        started = time.perf_counter()
+        farm = build_farm(size, seed=args.seed)
+        print(f"populated {farm.describe()} in {time.perf_counter() - started:.1f}s")
+        results = asyncio.run(
+            run_suite(farm, args.requests, args.concurrency, args.warmup, args.only)
+        )
+
+    _print(results, baseline["scenarios"] if baseline else None)
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save_baseline}.json"
+        document = {
+            "farm": farm.describe(),
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "environment": _environment(),
+            "scenarios": results,
+        }
+        path.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"baseline written to {path}")
+
+    if baseline is not None:
+        if baseline["farm"] != farm.describe() or baseline["concurrency"] != args.concurrency:
+            print("warning: the baseline was recorded with a different farm or concurrency")
+        regressions = compare(results, baseline["scenarios"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Synthetic farm datasets for the benchmarks.
+
+``build_farm`` fills the configured database with gardens, their pods, seed
+batches and growth logs, tasks (a tenth of them recurring) and months of
+environment readings at a fixed interval, together with the matching rollups
+and a few alerts. The same ``seed`` always produces the same farm, so runs
+against a saved baseline compare like with like.
+
+Django must be set up and migrated before calling it.
+"""
+
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+# Readings drift around these means, within the ranges a healthy garden sees
+METRIC_MEANS = {
+    "ph_level": (6.0, 0.3),
+    "ec_level": (1.6, 0.2),
+    "water_temp_c": (21.0, 1.5),
+    "dissolved_oxygen": (7.5, 0.5),
+    "air_temp_c": (23.0, 2.5),
+    "humidity_percent": (60.0, 8.0),
+}
+
+
+@dataclass(frozen=True)
+class FarmSize:
+    gardens: int = 10
+    pods_per_garden: int = 48
+    months: int = 3
+    reading_interval_minutes: int = 15
+    tasks_per_garden: int = 500
+    batches_per_garden: int = 40
+    logs_per_batch: int = 10
+    seeds: int = 200
+
+
+PRESETS = {
+    "small": FarmSize(
+        gardens=2,
+        pods_per_garden=12,
+        months=1,
+        reading_interval_minutes=60,
+        tasks_per_garden=50,
+        batches_per_garden=8,
+        logs_per_batch=3,
+        seeds=20,
+    ),
+    "medium": FarmSize(),
+    "large": FarmSize(
+        gardens=50,
+        pods_per_garden=96,
+        months=12,
+        tasks_per_garden=2000,
+        batches_per_garden=80,
+        seeds=1000,
+    ),
+}
+
+
+@dataclass
+class Farm:
+    """Ids of the generated rows, for building request paths."""
+
+    size: FarmSize
+    now: datetime
+    garden_ids: list[int] = field(default_factory=list)
+    pod_numbers: list[int] = field(default_factory=list)
+    seed_ids: list[int] = field(default_factory=list)
+    batch_ids: list[int] = field(default_factory=list)
+    task_ids: list[int] = field(default_factory=list)
+    readings: int = 0
+
+    def describe(self) -> dict:
+        return {**asdict(self.size), "readings": self.readings}
+
+
+def build_farm(size: FarmSize, seed: int = 7, now: datetime | None = None) -> Farm:
+    """Write a farm of ``size`` to the database and return the ids it created."""
+    from django.db import transaction
+
+    rng = random.Random(seed)
+    now = (now or datetime.now(timezone.utc)).replace(second=0, microsecond=0)
+    farm = Farm(size=size, now=now)
+    with transaction.atomic():
+        _seeds(farm, rng)
+        _gardens(farm, rng)
+        _batches(farm, rng)
+        _tasks(farm, rng)
+        _alerts(farm, rng)
+    _readings(farm, rng)
+    return farm
+
+
+def _seeds(farm: Farm, rng: random.Random) -> None:
+    from apps.seed.models import Seed, SeedType
+
+    words = ["Cherry", "Sweet", "Genovese", "Thai", "Butterhead", "Red", "Dwarf", "Giant"]
+    kinds = ["Tomato", "Basil", "Lettuce", "Pepper", "Mint", "Kale", "Chard", "Strawberry"]
+    seeds = Seed.objects.bulk_create(
+        (
+            Seed(
+                name=f"{rng.choice(words)} {rng.choice(kinds)}",
+                seed_type=rng.choice(SeedType.values),
+                variety=f"Variety {i}",
+                supplier=rng.choice(["Burpee", "Johnny's", "Baker Creek", None]),
+                germination_days=rng.randint(3, 14),
+                days_to_harvest=rng.randint(30, 90),
+                optimal_ph_min=5.5,
+                optimal_ph_max=6.8,
+                optimal_temp_c_min=16.0,
+                optimal_temp_c_max=28.0,
+            )
+            for i in range(farm.size.seeds)
+        ),
+        batch_size=5000,
+    )
+    farm.seed_ids = [seed.pk for seed in seeds]
+
+
+def _gardens(farm: Farm, rng: random.Random) -> None:
+    from apps.garden import sync
+    from apps.garden.models import Garden, GardenPod, PodStatus, SyncEntity
+
+    size = farm.size
+    gardens = Garden.objects.bulk_create(
+        Garden(name=f"Garden {i}", total_pods=size.pods_per_garden) for i in range(size.gardens)
+    )
+    farm.garden_ids = [garden.pk for garden in gardens]
+    farm.pod_numbers = list(range(1, size.pods_per_garden + 1))
+    GardenPod.objects.bulk_create(
+        (
+            GardenPod(
+                garden=garden,
+                pod_number=number,
+                status=rng.choice(PodStatus.values),
+                planted_date=farm.now - timedelta(days=rng.randrange(60)),
+            )
+            for garden in gardens
+            for number in farm.pod_numbers
+        ),
+        batch_size=5000,
+    )
+    # Bulk inserts skip the signals that log changes for delta sync
+    sync.log_changes(SyncEntity.GARDEN, farm.garden_ids)
+    sync.log_changes(SyncEntity.POD, GardenPod.objects.values_list("pk", flat=True))
+
+
+def _batches(farm: Farm, rng: random.Random) -> None:
+    from apps.seed.models import GrowthLogEntry, SeedBatch
+
+    size = farm.size
+    batches = SeedBatch.objects.bulk_create(
+        (
+            SeedBatch(
+                seed_id=rng.choice(farm.seed_ids),
+                batch_number=f"B-{i:06d}",
+                germination_start_date=(farm.now - timedelta(days=rng.randrange(90))).date(),
+            )
+            for i in range(size.gardens * size.batches_per_garden)
+        ),
+        batch_size=5000,
+    )
+    farm.batch_ids = [batch.pk for batch in batches]
+    GrowthLogEntry.objects.bulk_create(
+        (
+            GrowthLogEntry(
+                seed_batch=batch,
+                timestamp=farm.now - timedelta(days=day * 3),
+                height_cm=round(rng.uniform(1, 40), 1),
+                leaf_count=rng.randint(2, 30),
+            )
+            for batch in batches
+            for day in range(size.logs_per_batch)
+        ),
+        batch_size=5000,
+    )
+
+
+def _tasks(farm: Farm, rng: random.Random) -> None:
+    from apps.task.models import (
+        RecurrencePattern,
+        Task,
+        TaskPriority,
+        TaskScope,
+        TaskStatus,
+        TaskType,
+    )
+
+    size = farm.size
+    tasks = []
+    for garden_id in farm.garden_ids:
+        for i in range(size.tasks_per_garden):
+            scheduled = farm.now + timedelta(hours=rng.randrange(-24 * 60, 24 * 60))
+            recurring = i % 10 == 0
+            tasks.append(
+                Task(
+                    task_type=rng.choice(TaskType.values),
+                    scope=TaskScope.GARDEN,
+                    priority=rng.choice(TaskPriority.values),
+                    title=f"Task {i}",
+                    garden_id=garden_id,
+                    scheduled_date=scheduled,
+                    due_date=scheduled + timedelta(hours=rng.randrange(1, 72)),
+                    status=TaskStatus.PENDING if recurring else rng.choice(TaskStatus.values),
+                    is_recurring=recurring,
+                    recurrence_pattern=RecurrencePattern.WEEKLY if recurring else None,
+                    recurrence_interval=1 if recurring else None,
+                )
+            )
+    farm.task_ids = [task.pk for task in Task.objects.bulk_create(tasks, batch_size=5000)]
+
+
+def _alerts(farm: Farm, rng: random.Random) -> None:
+    from apps.garden.models import GardenAlert
+
+    alerts = []
+    for garden_id in farm.garden_ids:
+        for i in range(20):
+            raised = farm.now - timedelta(hours=rng.randrange(24 * 30))
+            cleared = raised + timedelta(hours=2) if i else None
+            alerts.append(
+                GardenAlert(
+                    garden_id=garden_id,
+                    metric="ph_level" if i else "water_temp_c",
+                    low=5.5,
+                    high=6.8,
+                    value=7.2,
+                    raised_at=raised,
+                    cleared_at=cleared,
+                    clear_value=6.5 if cleared else None,
+                )
+            )
+    GardenAlert.objects.bulk_create(alerts)
+
+
+def _readings(farm: Farm, rng: random.Random) -> None:
+    """Readings for every garden, written a day at a time with their rollups."""
+    from django.db import transaction
+
+    from apps.garden.models import GardenEnvironmentLog
+    from apps.garden.rollups import record_readings
+
+    step = timedelta(minutes=farm.size.reading_interval_minutes)
+    per_day = timedelta(days=1) // step
+    days = farm.size.months * 30
+    first = farm.now - timedelta(days=days)
+    for garden_id in farm.garden_ids:
+        levels = {metric: mean for metric, (mean, _) in METRIC_MEANS.items()}
+        for day in range(days):
+            logs = []
+            for i in range(per_day):
+                # A random walk pulled back towards the mean
+                for metric, (mean, spread) in METRIC_MEANS.items():
+                    level = levels[metric]
+                    levels[metric] = level + 0.1 * (mean - level) + rng.gauss(0, spread / 10)
+                logs.append(
+                    GardenEnvironmentLog(
+                        garden_id=garden_id,
+                        timestamp=first + (day * per_day + i) * step,
+                        light_intensity_lux=rng.randint(0, 20000),
+                        **{metric: round(level, 3) for metric, level in levels.items()},
+                    )
+                )
+            with transaction.atomic():
+                GardenEnvironmentLog.objects.bulk_create(logs, batch_size=5000)
+                record_readings(logs)
+            farm.readings += len(logs)
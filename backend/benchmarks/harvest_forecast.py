@@ -0,0 +1,117 @@
+"""Time the nightly harvest re-forecast against a synthetic farm.
+
+Builds a temporary database with ``--batches`` growing seed batches spread
+over ``--gardens`` gardens, each with ``--days`` of daily temperature rollups,
+then runs the forecast twice: once writing every prediction and once more
+where nothing changed.
+
+    python -m benchmarks.harvest_forecast --batches 100000 --gardens 1000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+
+def _populate(args: argparse.Namespace, today: date) -> None:
+    from django.db import transaction
+
+    from apps.garden.models import Garden, GardenEnvironmentRollup, GardenPod, RollupResolution
+    from apps.seed.models import Seed, SeedBatch, SeedType
+
+    rng = random.Random(7)
+    pods_per_garden = -(-args.batches // args.gardens)
+    with transaction.atomic():
+        seeds = Seed.objects.bulk_create(
+            Seed(
+                name=f"Seed {i}",
+                seed_type=SeedType.VEGETABLE,
+                germination_days=rng.randint(3, 14),
+                days_to_harvest=rng.randint(30, 90),
+            )
+            for i in range(50)
+        )
+        gardens = Garden.objects.bulk_create(
+            Garden(name=f"Garden {i}", total_pods=pods_per_garden) for i in range(args.gardens)
+        )
+        batches = SeedBatch.objects.bulk_create(
+            (
+                SeedBatch(
+                    seed=rng.choice(seeds),
+                    germination_start_date=today - timedelta(days=rng.randrange(args.days)),
+                )
+                for _ in range(args.batches)
+            ),
+            batch_size=5000,
+        )
+        GardenPod.objects.bulk_create(
+            (
+                GardenPod(
+                    garden=gardens[i // pods_per_garden],
+                    pod_number=i % pods_per_garden + 1,
+                    seed_batch=batch,
+                )
+                for i, batch in enumerate(batches)
+            ),
+            batch_size=5000,
+        )
+        first = datetime.combine(today, datetime.min.time(), timezone.utc)
+        GardenEnvironmentRollup.objects.bulk_create(
+            (
+                GardenEnvironmentRollup(
+                    garden=garden,
+                    resolution=RollupResolution.DAY,
+                    bucket_start=first - timedelta(days=day),
+                    metric=metric,
+                    sample_count=288,
+                    total=288 * mean,
+                    minimum=mean - 2,
+                    maximum=mean + 2,
+                )
+                for garden in gardens
+                for day in range(1, args.days + 1)
+                for metric in ("water_temp_c", "air_temp_c")
+                for mean in [rng.uniform(16.0, 28.0)]
+            ),
+            batch_size=5000,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=100_000)
+    parser.add_argument("--gardens", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SQLITE_DB_PATH"] = str(Path(tmp) / "bench.sqlite3")
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seedr.settings")
+        import django
+
+        django.setup()
+        from django.core.management import call_command
+
+        from apps.seed.forecast import forecast_harvests
+
+        call_command("migrate", verbosity=0)
+        today = date.today()
+        started = time.perf_counter()
+        _populate(args, today)
+        print(f"populated in {time.perf_counter() - started:.1f}s")
+
+        for label in ("first run", "unchanged"):
+            started = time.perf_counter()
+            result = forecast_harvests(today)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:<10} {result.forecast} batches, {result.updated} written, {elapsed:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Compare requests/sec and latency of the dev server and the uvicorn serving mode.
+
+Both servers run against the same temporary database, seeded with a garden,
+its pods and a day of readings. A fixed number of concurrent clients then
+replay a polling mix (health, garden, pod list, single pod, latest
+readings) for ``--seconds`` each:
+
+* ``runserver`` — ``manage.py runserver`` (WSGI, one process, a thread per
+  request), the setup the Dockerfile used to ship;
+* ``uvicorn`` — ``uvicorn seedr.asgi:application`` with ``--workers``
+  processes, the async endpoints and the production SQLite profile.
+
+    python -m benchmarks.http_load --workers 4 --concurrency 64 --seconds 15
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _populate(pods: int) -> int:
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seedr.settings")
+    django.setup()
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from apps.garden.ingest import ingest_readings
+    from apps.garden.models import Garden, GardenPod
+
+    call_command("migrate", verbosity=0)
+    garden = Garden.objects.create(name="Load test", total_pods=pods)
+    GardenPod.objects.bulk_create(
+        GardenPod(garden=garden, pod_number=number) for number in range(1, pods + 1)
+    )
+    now = timezone.now()
+    ingest_readings(
+        garden.pk,
+        (
+            {"timestamp": now - timedelta(minutes=5 * i), "ph_level": 6.0, "water_temp_c": 21.0}
+            for i in range(288)
+        ),
+    )
+    return garden.pk
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_command(mode: str, port: int, workers: int) -> list[str]:
+    if mode == "runserver":
+        return [sys.executable, "manage.py", "runserver", "--noreload", f"127.0.0.1:{port}"]
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "seedr.asgi:application",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--no-access-log",
+    ]
+
+
+async def _wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/v1/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+async def _load(base_url: str, paths: list[str], concurrency: int, seconds: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        deadline = time.monotonic() + seconds
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            i = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    ok = response.status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+                i += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+    return {
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(0.50) if latencies else 0.0,
+        "p99_ms": percentile(0.99) if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--pods", type=int, default=48)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SQLITE_DB_PATH"] = str(Path(tmp) / "bench.sqlite3")
+        garden_id = _populate(args.pods)
+        paths = [
+            "/api/v1/health",
+            f"/api/v1/gardens/{garden_id}",
+            f"/api/v1/gardens/{garden_id}/pods/",
+            f"/api/v1/gardens/{garden_id}/pods/1",
+            f"/api/v1/gardens/{garden_id}/environment/?limit=50",
+        ]
+
+        results = {}
+        for mode, app_env in (("runserver", "development"), ("uvicorn", "production")):
+            port = _free_port()
+            server = subprocess.Popen(
+                _server_command(mode, port, args.workers),
+                cwd=BACKEND_DIR,
+                env={**os.environ, "APP_ENV": app_env},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                asyncio.run(_wait_ready(base_url))
+                results[mode] = asyncio.run(_load(base_url, paths, args.concurrency, args.seconds))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    print(f"{'server':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<12}{result['requests_per_sec']:>10.0f}{result['p50_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
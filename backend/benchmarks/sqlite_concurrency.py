@@ -0,0 +1,147 @@
+"""Compare ingestion + read throughput of the default and production SQLite profiles.
+
+Each profile runs in its own subprocess against a fresh temporary database:
+writer processes push batches of readings through the ingestion service,
+updater processes run read-then-write transactions like ``update_garden``
+and reader processes page through environment logs, mirroring controllers,
+growers and wall displays hitting the API workers at the same time.
+
+    python -m benchmarks.sqlite_concurrency --writers 2 --updaters 2 --readers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROFILES = {"default": "development", "production": "production"}
+
+
+def _setup_django() -> None:
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seedr.settings")
+    django.setup()
+
+
+def _worker(role: str, garden_id: int, args: argparse.Namespace, ready, results) -> None:
+    _setup_django()
+    from django.db import OperationalError, transaction
+
+    from apps.garden.ingest import ingest_readings
+    from apps.garden.models import Garden, GardenEnvironmentLog
+
+    batch = [{"ph_level": 6.0, "ec_level": 1.5, "water_temp_c": 20.0}] * args.batch_size
+    done = errors = 0
+    ready.wait()  # start measuring only once every worker has booted Django
+    deadline = time.monotonic() + args.seconds
+    while time.monotonic() < deadline:
+        try:
+            if role == "writer":
+                done += ingest_readings(garden_id, batch).accepted
+            elif role == "updater":
+                with transaction.atomic():
+                    garden = Garden.objects.get(pk=garden_id)
+                    garden.notes = f"checked {time.time()}"
+                    garden.save()
+                done += 1
+            else:
+                logs = GardenEnvironmentLog.objects.filter(garden_id=garden_id)
+                list(logs.order_by("-timestamp", "-id")[:100])
+                done += 1
+        except OperationalError:
+            errors += 1
+    results.put((role, done, errors))
+
+
+def run_profile(args: argparse.Namespace) -> dict:
+    """Executed inside the subprocess for a single profile."""
+    _setup_django()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from apps.garden.models import Garden
+
+    call_command("migrate", verbosity=0)
+    garden_id = Garden.objects.create(name="bench", total_pods=1).id
+    connection.close()
+
+    # Separate processes, like API workers, so the GIL does not serialize them
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    roles = ["writer"] * args.writers + ["updater"] * args.updaters + ["reader"] * args.readers
+    ready = context.Barrier(len(roles) + 1)
+    processes = [
+        context.Process(target=_worker, args=(role, garden_id, args, ready, results))
+        for role in roles
+    ]
+    for process in processes:
+        process.start()
+    ready.wait()
+    started = time.monotonic()
+    totals = {"writer": 0, "updater": 0, "reader": 0, "errors": 0}
+    for _ in processes:
+        role, done, errors = results.get()
+        totals[role] += done
+        totals["errors"] += errors
+    for process in processes:
+        process.join()
+    elapsed = time.monotonic() - started
+
+    return {
+        "rows_per_sec": totals["writer"] / elapsed,
+        "updates_per_sec": totals["updater"] / elapsed,
+        "reads_per_sec": totals["reader"] / elapsed,
+        "locked_errors": totals["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--updaters", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--profile", choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args)))
+        return
+
+    backend_dir = Path(__file__).resolve().parent.parent
+    results = {}
+    for profile, app_env in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "APP_ENV": app_env,
+                "SQLITE_DB_PATH": str(Path(tmp) / "bench.sqlite3"),
+            }
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.sqlite_concurrency", *sys.argv[1:]]
+                + ["--profile", profile],
+                cwd=backend_dir,
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[profile] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'profile':<12}{'rows/s':>10}{'updates/s':>11}{'reads/s':>10}{'locked':>8}")
+    for profile, result in results.items():
+        print(
+            f"{profile:<12}{result['rows_per_sec']:>10.0f}{result['updates_per_sec']:>11.0f}"
+            f"{result['reads_per_sec']:>10.0f}{result['locked_errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
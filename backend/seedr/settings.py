@@ -10,11 +10,15 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Deployment environment; "production" enables the tuned SQLite profile below.
+APP_ENV = os.environ.get("APP_ENV", "development")
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -39,9 +43,12 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "apps",
     "apps.garden",
+    "apps.seed",
+    "apps.task",
 ]
 
 MIDDLEWARE = [
+    "apps.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -69,7 +76,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "seedr.wsgi.application"
-ASGI_APPLICATION = "seedr.wsgi.application"
+ASGI_APPLICATION = "seedr.asgi.application"
 
 
 # Database
@@ -78,10 +85,78 @@ ASGI_APPLICATION = "seedr.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "data" / "db.sqlite3",
+        "NAME": os.environ.get("SQLITE_DB_PATH", BASE_DIR / "data" / "db.sqlite3"),
     }
 }
 
+# Production SQLite profile. WAL lets API reads proceed while ingestion
+# writes; synchronous=NORMAL is durable across application crashes in WAL
+# mode and only fsyncs at checkpoints. mmap and a larger page cache keep hot
+# indexes in memory. IMMEDIATE transactions take the write lock up front, so
+# concurrent writers queue on busy_timeout instead of failing with "database
+# is locked" when a read transaction tries to upgrade.
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # milliseconds
+    "mmap_size": 268435456,  # 256 MiB
+    "cache_size": -65536,  # negative means KiB, i.e. 64 MiB
+    "temp_store": "MEMORY",
+}
+
+if APP_ENV == "production":
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": int(os.environ.get("SQLITE_CONN_MAX_AGE", 600)),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "init_command": ";".join(
+                    f"PRAGMA {name}={value}" for name, value in SQLITE_PRODUCTION_PRAGMAS.items()
+                ),
+                "transaction_mode": "IMMEDIATE",
+                "timeout": SQLITE_PRODUCTION_PRAGMAS["busy_timeout"] / 1000,
+            },
+        }
+    )
+
+
+# Response cache for polled garden/pod reads. Local memory (per worker, LRU
+# bounded by MAX_ENTRIES) unless RESPONSE_CACHE_URL points at a Redis server
+# shared by all workers.
+RESPONSE_CACHE_URL = os.environ.get("RESPONSE_CACHE_URL")
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "60"))
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": RESPONSE_CACHE_URL,
+            "KEY_PREFIX": "seedr",
+        }
+        if RESPONSE_CACHE_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "seedr-responses",
+            "OPTIONS": {
+                "MAX_ENTRIES": int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "5000")),
+                "CULL_FREQUENCY": 10,  # evict the least recently used tenth when full
+            },
+        }
+    ),
+}
+
+# Live garden streams (GET /api/v1/gardens/{id}/stream). One task per worker
+# reads new readings and pod changes every LIVE_STREAM_POLL_SECONDS, at most
+# LIVE_STREAM_BATCH_SIZE readings per query, and fans them out. Each client
+# queues at most LIVE_STREAM_QUEUE_SIZE events, dropping the oldest when it
+# falls behind, and gets a keepalive comment after LIVE_STREAM_KEEPALIVE_SECONDS
+# without one.
+LIVE_STREAM_POLL_SECONDS = float(os.environ.get("LIVE_STREAM_POLL_SECONDS", "1.0"))
+LIVE_STREAM_BATCH_SIZE = 1000
+LIVE_STREAM_QUEUE_SIZE = int(os.environ.get("LIVE_STREAM_QUEUE_SIZE", "256"))
+LIVE_STREAM_KEEPALIVE_SECONDS = 15
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -119,6 +194,113 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Task scheduling engine
+
+SCHEDULER_TIMEZONE = os.environ.get("SCHEDULER_TIMEZONE", "UTC")
+
+# How often the engine wakes up, and how far ahead it loads upcoming tasks.
+TASK_ENGINE_TICK_SECONDS = 15
+TASK_ENGINE_HORIZON_SECONDS = 3600
+
+# Callables invoked with (task, run_at) for every occurrence that comes due.
+TASK_ENGINE_HANDLERS = ["apps.task.scheduler.log_task_due"]
+
+# The overdue sweep runs every OVERDUE_SWEEP_INTERVAL_SECONDS and rolls
+# recurring tasks forward OVERDUE_SWEEP_BATCH_SIZE per transaction.
+OVERDUE_SWEEP_INTERVAL_SECONDS = 60
+OVERDUE_SWEEP_BATCH_SIZE = 1000
+
+# Longest date range the agenda endpoint expands in one request
+AGENDA_MAX_DAYS = 366
+
+# Reminder delivery. Each sink is an object with an async send(reminder);
+# FileSink takes OPTIONS={"path": ...} and is handy for local testing.
+REMINDER_SINKS = [{"BACKEND": "apps.task.reminders.LogSink"}]
+REMINDER_DISPATCH_INTERVAL_SECONDS = 15
+REMINDER_DISPATCH_BATCH_SIZE = 500
+REMINDER_DISPATCH_CONCURRENCY = 100
+
+# How far ahead task reminders are created from upcoming occurrences.
+REMINDER_PLANNING_WINDOW_HOURS = 24 * 7
+
+# Harvest forecasting: growing degree-days accumulate above the base
+# temperature; seeds without an optimal band grow at the reference one.
+HARVEST_BASE_TEMP_C = 10.0
+HARVEST_REFERENCE_TEMP_C = 22.0
+# Hour of day (SCHEDULER_TIMEZONE) for the nightly re-forecast
+HARVEST_FORECAST_HOUR = 2
+
+# Days ahead the planting planner fills pods for
+PLANTING_HORIZON_DAYS = 365
+
+# Out-of-range alerting: callables invoked with every raised or cleared
+# AlertEvent, and how far back inside the envelope a reading must be before
+# an open alert clears.
+ALERT_HANDLERS = ["apps.garden.alerts.log_alert"]
+ALERT_DEADBANDS = {"ph_level": 0.1, "ec_level": 0.1, "water_temp_c": 0.5, "air_temp_c": 0.5}
+# How long a process trusts its cached envelopes before reloading them
+ALERT_ENVELOPE_TTL_SECONDS = 60
+
+# Anomaly detection on readings. ANOMALY_NOISE_FLOORS lists the metrics
+# analysed with the smallest standard deviation assumed for each (about the
+# sensor's resolution); light is left out since it swings day and night. The
+# rolling mean and variance follow ANOMALY_FAST_HOURS, after
+# ANOMALY_WARMUP_READINGS readings. A reading more than ANOMALY_SPIKE_SIGMAS
+# off is a spike, ANOMALY_STUCK_READINGS identical readings in a row a stuck
+# sensor, and a daily level ANOMALY_DRIFT_SIGMAS away from the weekly baseline
+# drift. After a gap of ANOMALY_GAP_HOURS the rolling statistics warm up again.
+ANOMALY_HANDLERS = ["apps.garden.anomalies.log_anomaly"]
+ANOMALY_NOISE_FLOORS = {
+    "ph_level": 0.02,
+    "ec_level": 0.02,
+    "water_temp_c": 0.1,
+    "dissolved_oxygen": 0.1,
+    "air_temp_c": 0.2,
+    "humidity_percent": 0.5,
+}
+ANOMALY_WARMUP_READINGS = 20
+ANOMALY_SPIKE_SIGMAS = 5.0
+ANOMALY_STUCK_READINGS = 12
+ANOMALY_DRIFT_SIGMAS = 4.0
+ANOMALY_FAST_HOURS = 6
+ANOMALY_LEVEL_HOURS = 24
+ANOMALY_BASELINE_HOURS = 7 * 24
+ANOMALY_GAP_HOURS = 6
+
+# Raw environment readings are kept for RETENTION_RAW_DAYS (0 keeps them
+# forever) and pruned nightly at RETENTION_HOUR, RETENTION_DELETE_CHUNK rows
+# per transaction with a pause between chunks. Afterwards up to
+# RETENTION_VACUUM_PAGES free pages (0 for all) are returned to the OS when the
+# database uses auto_vacuum=INCREMENTAL.
+RETENTION_RAW_DAYS = int(os.environ.get("RETENTION_RAW_DAYS", "180"))
+RETENTION_HOUR = 3
+RETENTION_DELETE_CHUNK = 2000
+RETENTION_CHUNK_PAUSE_SECONDS = 0.05
+RETENTION_VACUUM_PAGES = 0
+
+# Sync change log rows superseded by a later change of the same object are
+# dropped nightly at SYNC_COMPACTION_HOUR, in a job of its own so a failed
+# retention run does not hold it up.
+SYNC_COMPACTION_HOUR = 4
+
+# Request metrics (GET /api/v1/metrics). Setting METRICS_SLOW_REQUEST_MS turns
+# on the slow request profiler: METRICS_PROFILE_SAMPLE_RATE of the requests
+# have their stacks sampled every METRICS_PROFILE_INTERVAL_MS, and those slower
+# than the threshold are passed to METRICS_SLOW_REQUEST_HANDLERS.
+METRICS_SLOW_REQUEST_MS = (
+    float(os.environ["METRICS_SLOW_REQUEST_MS"])
+    if os.environ.get("METRICS_SLOW_REQUEST_MS")
+    else None
+)
+METRICS_PROFILE_SAMPLE_RATE = float(os.environ.get("METRICS_PROFILE_SAMPLE_RATE", "0.1"))
+METRICS_PROFILE_INTERVAL_MS = 5
+METRICS_PROFILE_TOP_STACKS = 20
+METRICS_SLOW_REQUEST_HANDLERS = ["apps.metrics.log_slow_request"]
+
+# Rows fetched from the database, and written as one CSV block or Parquet
+# row group, per step of a streaming export
+EXPORT_CHUNK_SIZE = 10_000
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,43 @@
+"""
+API-only settings: the Seedr service without the admin site.
+
+Drops the admin, auth, sessions, messages and staticfiles apps and their
+middleware, none of which the API uses (it runs with ``csrf=False`` and no
+authentication), so worker processes boot without importing them. Templates
+stay configured for the ``/api/v1/docs`` page. Select it with
+``DJANGO_SETTINGS_MODULE=seedr.settings_api``; everything else is read from
+``seedr.settings``.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE
+
+# Apps and middleware only the admin site needs
+ADMIN_ONLY_APPS = {
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+}
+ADMIN_ONLY_MIDDLEWARE = {
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+}
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS]
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in ADMIN_ONLY_MIDDLEWARE]
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": False,
+        "OPTIONS": {"context_processors": ["django.template.context_processors.request"]},
+    },
+]
+
+AUTH_PASSWORD_VALIDATORS = []
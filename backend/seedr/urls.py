@@ -15,7 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
+from django.apps import apps
 from django.http import JsonResponse
 from django.urls import path
 
@@ -34,6 +34,11 @@ def root(request):
 
 urlpatterns = [
     path("", root),
-    path("admin/", admin.site.urls),
     path("api/v1/", api.urls),
 ]
+
+# Not installed in the API-only profile (seedr.settings_api)
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(1, path("admin/", admin.site.urls))
@@ -0,0 +1,42 @@
+import os
+
+import django
+import pytest
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seedr.settings")
+django.setup()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_test_db():
+    """Run the suite against a throwaway test database instead of data/db.sqlite3."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    yield
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+    teardown_test_environment()
+
+
+@pytest.fixture(autouse=True)
+def flush_db():
+    """Leave every test with empty tables, whichever thread did the writes."""
+    from django.core.cache import caches
+    from django.core.management import call_command
+
+    from apps import metrics
+    from apps.cache import RESPONSE_CACHE_ALIAS
+    from apps.garden.alerts import alert_engine
+    from apps.garden.anomalies import anomaly_detector
+    from apps.garden.live import live_feed
+
+    yield
+    call_command("flush", interactive=False, verbosity=0)
+    # ids are reused once the tables are empty
+    alert_engine.reset()
+    anomaly_detector.reset()
+    live_feed.reset()
+    caches[RESPONSE_CACHE_ALIAS].clear()
+    metrics.registry.reset()
@@ -0,0 +1,124 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.models import Garden
+from apps.task.agenda import agenda
+from apps.task.models import RecurrencePattern, Task, TaskPriority, TaskScope, TaskType
+from apps.task.recurrence import Recurrence
+from seedr.asgi import application
+
+START = datetime(2025, 3, 3, 0, 0, tzinfo=timezone.utc)
+
+
+def _brute_force(start, end, **filters):
+    """Expand every task from its first occurrence: what the index must match."""
+    expected = []
+    for task in Task.objects.filter(**filters):
+        span = timedelta(0)
+        if task.due_date is not None:
+            span = max(task.due_date - task.scheduled_date, timedelta(0))
+        occurrences = [task.scheduled_date]
+        if task.is_recurring:
+            recurrence = Recurrence.for_task(task)
+            occurrences = []
+            k = 0
+            while (occurrence := recurrence.occurrence(k)) < end:
+                occurrences.append(occurrence)
+                k += 1
+        for occurrence in occurrences:
+            if occurrence < end and occurrence + span >= start:
+                expected.append((occurrence, task.pk))
+    return sorted(expected)
+
+
+def test_agenda_matches_full_expansion_across_writes():
+    rng = random.Random(3)
+    garden = Garden.objects.create(name="Agenda", total_pods=4)
+    tasks = []
+    for i in range(400):
+        scheduled = START + timedelta(hours=rng.randrange(-24 * 120, 24 * 120))
+        recurring = i % 10 == 0
+        tasks.append(
+            Task(
+                task_type=TaskType.PH_CHECK,
+                scope=rng.choice(TaskScope.values),
+                priority=rng.choice(TaskPriority.values),
+                title=f"Task {i}",
+                garden=garden if i % 2 else None,
+                scheduled_date=scheduled,
+                due_date=scheduled + timedelta(hours=rng.randrange(0, 24 * 10))
+                if rng.random() < 0.7
+                else None,
+                is_recurring=recurring,
+                recurrence_pattern=rng.choice(RecurrencePattern.values) if recurring else None,
+                recurrence_interval=rng.randrange(1, 4) if recurring else None,
+            )
+        )
+    tasks = Task.objects.bulk_create(tasks)
+    # The interval index follows saves, queryset updates and deletes
+    tasks[1].scheduled_date = START - timedelta(days=30)
+    tasks[1].due_date = START + timedelta(days=2)
+    tasks[1].save()
+    Task.objects.filter(pk=tasks[3].pk).update(scheduled_date=START + timedelta(days=1))
+    Task.objects.filter(pk=tasks[5].pk).update(is_recurring=True)
+    tasks[7].delete()
+
+    week = (START, START + timedelta(days=7))
+    found = [(item.starts_at, item.task_id) for item in agenda(*week)]
+    assert found == _brute_force(*week)
+    assert tasks[1].pk in {task_id for _, task_id in found}
+
+    filtered = agenda(*week, garden_id=garden.pk, priority=TaskPriority.HIGH)
+    expected = _brute_force(*week, garden_id=garden.pk, priority=TaskPriority.HIGH)
+    assert [(item.starts_at, item.task_id) for item in filtered] == expected
+
+    quarter = (START - timedelta(days=45), START + timedelta(days=45))
+    assert [(item.starts_at, item.task_id) for item in agenda(*quarter)] == _brute_force(*quarter)
+
+
+@pytest.mark.asyncio
+async def test_agenda_endpoint_expands_series_and_checks_range():
+    garden = await Garden.objects.acreate(name="Weekly", total_pods=4)
+    await Task.objects.acreate(
+        task_type=TaskType.WATER_CHANGE,
+        scope=TaskScope.GARDEN,
+        title="Change water",
+        garden=garden,
+        scheduled_date=datetime(2025, 2, 1, 12, 0, tzinfo=timezone.utc),
+        due_date=datetime(2025, 2, 3, 12, 0, tzinfo=timezone.utc),
+        is_recurring=True,
+        recurrence_pattern=RecurrencePattern.WEEKLY,
+        recurrence_interval=1,
+    )
+    await Task.objects.acreate(
+        task_type=TaskType.PRUNE,
+        scope=TaskScope.POD,
+        title="Prune basil",
+        scheduled_date=START + timedelta(days=2),
+    )
+
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        params = {"start": START.isoformat(), "end": (START + timedelta(days=7)).isoformat()}
+        response = await client.get("/api/v1/tasks/agenda", params=params)
+        assert response.status_code == 200
+        items = response.json()
+        assert [item["title"] for item in items] == [
+            "Change water",  # started on Mar 1, due Mar 3 at noon
+            "Prune basil",
+            "Change water",
+        ]
+        assert items[0]["due_at"] == "2025-03-03T12:00:00Z"
+
+        response = await client.get(
+            "/api/v1/tasks/agenda", params={**params, "garden_id": garden.pk, "scope": "garden"}
+        )
+        assert [item["title"] for item in response.json()] == ["Change water"] * 2
+
+        response = await client.get(
+            "/api/v1/tasks/agenda", params={"start": params["end"], "end": params["start"]}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,92 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.alerts import alert_engine
+from apps.garden.ingest import ingest_readings
+from apps.garden.models import Garden, GardenAlert, GardenPod
+from apps.seed.models import Seed, SeedBatch, SeedType
+from seedr.asgi import application
+
+START = datetime(2025, 6, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _plant(garden, pod_number, **band):
+    seed = Seed.objects.create(name=f"Seed {pod_number}", seed_type=SeedType.HERB, **band)
+    batch = SeedBatch.objects.create(seed=seed, germination_start_date=date(2025, 5, 1))
+    return GardenPod.objects.create(garden=garden, pod_number=pod_number, seed_batch=batch)
+
+
+def _readings(*values, metric="ph_level"):
+    return [
+        {"timestamp": (START + timedelta(minutes=i)).isoformat(), metric: value}
+        for i, value in enumerate(values)
+    ]
+
+
+def test_envelope_is_the_intersection_and_follows_pod_changes():
+    garden = Garden.objects.create(name="Rack", total_pods=3)
+    _plant(garden, 1, optimal_ph_min=5.5, optimal_ph_max=6.5)
+    lettuce = _plant(garden, 2, optimal_ph_min=6.0, optimal_ph_max=7.0, optimal_temp_c_max=24.0)
+
+    envelope = alert_engine.envelope(garden.pk)
+    assert envelope["ph_level"] == (6.0, 6.5)
+    assert envelope["water_temp_c"][1] == 24.0
+
+    # Pod changes update the cached envelope without reloading the garden
+    with CaptureQueriesContext(connection) as queries:
+        lettuce.seed_batch = None
+        lettuce.save()
+        assert alert_engine.envelope(garden.pk)["ph_level"] == (5.5, 6.5)
+        lettuce.delete()
+    assert not any("optimal_ph_min" in query["sql"] for query in queries.captured_queries)
+
+    _plant(garden, 3, optimal_ph_min=5.0, optimal_ph_max=6.0)
+    assert alert_engine.envelope(garden.pk)["ph_level"] == (5.5, 6.0)
+
+
+def test_alerts_raise_and_clear_with_hysteresis():
+    garden = Garden.objects.create(name="Rack", total_pods=1)
+    _plant(garden, 1, optimal_ph_min=5.5, optimal_ph_max=6.5)
+    events = []
+    alert_engine.handlers.append(events.append)
+    try:
+        # 6.45 is back in range but inside the 0.1 deadband, so the alert stays open
+        ingest_readings(garden.pk, _readings(6.0, 6.7, 6.8, 6.45, 6.6, 6.3, 6.2))
+    finally:
+        alert_engine.handlers.remove(events.append)
+
+    assert [(e.raised, e.value) for e in events] == [(True, 6.7), (False, 6.3)]
+    alert = GardenAlert.objects.get()
+    assert (alert.low, alert.high, alert.value, alert.clear_value) == (5.5, 6.5, 6.7, 6.3)
+    assert alert.raised_at == START + timedelta(minutes=1)
+    assert alert.cleared_at == START + timedelta(minutes=5)
+
+
+def test_gardens_without_bands_never_alert():
+    garden = Garden.objects.create(name="Empty", total_pods=1)
+    ingest_readings(garden.pk, _readings(1.0, 14.0))
+    assert not GardenAlert.objects.exists()
+
+
+@pytest.mark.asyncio
+async def test_alerts_endpoint_lists_open_alerts():
+    garden = await Garden.objects.acreate(name="Rack", total_pods=1)
+    await GardenAlert.objects.acreate(
+        garden=garden, metric="ph_level", low=5.5, high=6.5, value=7.1, raised_at=START
+    )
+    await GardenAlert.objects.acreate(
+        garden=garden,
+        metric="ec_level",
+        high=2.0,
+        value=2.4,
+        raised_at=START,
+        cleared_at=START + timedelta(hours=1),
+    )
+    async with AsyncClient(transport=ASGITransport(app=application), base_url="http://test") as c:
+        response = await c.get(f"/api/v1/gardens/{garden.pk}/alerts", params={"active": True})
+    assert response.status_code == 200
+    assert [alert["metric"] for alert in response.json()["items"]] == ["ph_level"]
@@ -0,0 +1,113 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.anomalies import AnomalyDetector, MetricStats, anomaly_detector
+from apps.garden.ingest import ingest_readings
+from apps.garden.models import AnomalyCheckpoint, AnomalyKind, Garden, GardenAnomaly
+from seedr.asgi import application
+
+START = datetime(2025, 6, 1, tzinfo=timezone.utc)
+STEP = timedelta(minutes=15)
+
+
+def _ph(values, start=0):
+    return [
+        {"timestamp": (START + (start + i) * STEP).isoformat(), "ph_level": value}
+        for i, value in enumerate(values)
+    ]
+
+
+def _noise(count, seed=1, mean=6.0):
+    rng = random.Random(seed)
+    return [round(rng.gauss(mean, 0.03), 3) for _ in range(count)]
+
+
+def test_spikes_and_stuck_sensors_are_flagged_and_stored():
+    garden = Garden.objects.create(name="Rack", total_pods=1)
+    values = _noise(200)
+    values[100] = 8.5
+    values[150:170] = [6.02] * 20
+    ingest_readings(garden.pk, _ph(values))
+
+    found = list(GardenAnomaly.objects.order_by("detected_at").values_list("kind", "value"))
+    assert found == [(AnomalyKind.SPIKE, 8.5), (AnomalyKind.STUCK, 6.02)]
+    stuck = GardenAnomaly.objects.get(kind=AnomalyKind.STUCK)
+    assert stuck.score == 12 and stuck.detected_at == START + 161 * STEP
+    # A noisy month of readings raises nothing
+    other = Garden.objects.create(name="Tower", total_pods=1)
+    ingest_readings(other.pk, _ph(_noise(30 * 96, seed=2)))
+    assert not GardenAnomaly.objects.filter(garden=other).exists()
+
+
+def test_slow_drift_is_flagged_once():
+    detector = AnomalyDetector({"ph_level": 0.02}, handlers=[])
+    stats = MetricStats()
+    rng = random.Random(3)
+    found = []
+    for i in range(30 * 96):
+        days = i / 96
+        # The probe starts creeping by 0.05 pH a day after ten days
+        value = rng.gauss(6.0, 0.03) + max(0.0, days - 10) * 0.05
+        for kind, expected, score in detector.update(stats, value, i * 900.0, 0.02):
+            found.append((kind, days, expected, score))
+
+    assert len(found) == 1
+    kind, days, expected, score = found[0]
+    assert kind == AnomalyKind.DRIFT and 11 < days < 16
+    assert abs(expected - 6.0) < 0.1 and score > 4
+
+
+def test_restarts_resume_from_the_checkpoint_without_reading_history():
+    garden = Garden.objects.create(name="Rack", total_pods=1)
+    values = _noise(400, seed=4)
+    ingest_readings(garden.pk, _ph(values[:300]))
+    checkpoint = AnomalyCheckpoint.objects.get(garden=garden)
+    assert checkpoint.last_reading_id == garden.environment_logs.latest("id").pk
+
+    anomaly_detector.reset()  # as after a restart
+    with CaptureQueriesContext(connection) as queries:
+        ingest_readings(garden.pk, _ph(values[300:], start=300))
+    reads = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+    assert not any("garden_gardenenvironmentlog" in sql for sql in reads)
+    assert sum("garden_anomalycheckpoint" in sql for sql in reads) == 2
+
+    # The resumed statistics match a detector that saw every reading
+    reference = AnomalyDetector({"ph_level": 0.02}, handlers=[])
+    stats = MetricStats()
+    for i, value in enumerate(values):
+        reference.update(stats, value, (START + i * STEP).timestamp(), 0.02)
+    resumed = AnomalyCheckpoint.objects.get(garden=garden).state["ph_level"]
+    assert resumed == pytest.approx(stats.dump())
+
+
+@pytest.mark.asyncio
+async def test_anomalies_endpoint_filters_by_kind():
+    garden = await Garden.objects.acreate(name="Rack", total_pods=1)
+    await GardenAnomaly.objects.abulk_create(
+        GardenAnomaly(
+            garden=garden,
+            metric="ph_level",
+            kind=kind,
+            value=7.0,
+            expected=6.0,
+            score=6.0,
+            detected_at=START + i * STEP,
+        )
+        for i, kind in enumerate([AnomalyKind.SPIKE, AnomalyKind.DRIFT, AnomalyKind.SPIKE])
+    )
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        url = f"/api/v1/gardens/{garden.pk}/anomalies"
+        spikes = (await client.get(url, params={"kind": "spike"})).json()
+        invalid = await client.get(url, params={"kind": "flood"})
+
+    assert [item["detected_at"] for item in spikes["items"]] == [
+        (START + 2 * STEP).isoformat().replace("+00:00", "Z"),
+        START.isoformat().replace("+00:00", "Z"),
+    ]
+    assert invalid.status_code == 422
@@ -0,0 +1,52 @@
+import pytest
+from asgiref.sync import sync_to_async
+
+from apps.garden.models import GardenEnvironmentLog, GardenEnvironmentRollup
+from benchmarks.api_routes import SCENARIOS, compare, run_suite
+from benchmarks.farm import FarmSize, build_farm
+
+TINY = FarmSize(
+    gardens=2,
+    pods_per_garden=3,
+    months=1,
+    reading_interval_minutes=360,
+    tasks_per_garden=10,
+    batches_per_garden=2,
+    logs_per_batch=2,
+    seeds=4,
+)
+
+
+@pytest.mark.asyncio
+async def test_every_scenario_runs_against_a_generated_farm():
+    farm = await sync_to_async(build_farm)(TINY)
+    assert farm.readings == 2 * 30 * 4
+    assert await GardenEnvironmentLog.objects.acount() == farm.readings
+    assert await GardenEnvironmentRollup.objects.aexists()
+    assert len(farm.task_ids) == 20
+
+    results = await run_suite(farm, requests=3, warmup=1)
+
+    assert list(results) == [scenario.name for scenario in SCENARIOS]
+    for name, result in results.items():
+        assert result["errors"] == 0, name
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert results["garden list"]["queries_per_request"] == 1
+    assert results["health"]["requests_per_sec"] > 0
+
+
+def test_compare_flags_slower_scenarios_and_extra_queries():
+    before = {"requests_per_sec": 100.0, "p95_ms": 10.0, "queries_per_request": 2.0, "errors": 0}
+    baseline = {"same": before, "slower": before, "chattier": before, "new": None}
+    results = {
+        "same": {**before, "p95_ms": 11.0},
+        "slower": {**before, "p95_ms": 13.0, "requests_per_sec": 70.0},
+        "chattier": {**before, "queries_per_request": 3.0},
+        "unknown": before,
+    }
+
+    assert compare(results, baseline, tolerance=0.2) == [
+        "slower: p95 10.0 -> 13.0 ms",
+        "slower: 100 -> 70 req/s",
+        "chattier: 2.0 -> 3.0 queries per request",
+    ]
@@ -0,0 +1,105 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden import pods
+from apps.garden.models import Garden, GardenChange, GardenPod, PodStatus
+from apps.garden.sync import changes_since, compact_changes
+from apps.seed.models import Seed, SeedBatch, SeedType
+from apps.task.scheduler import COMPACTION_JOB_ID, RETENTION_JOB_ID, build_scheduler
+from seedr.asgi import application
+
+
+def _client():
+    return AsyncClient(transport=ASGITransport(app=application), base_url="http://test")
+
+
+def test_changes_since_a_cursor_include_bulk_writes_and_cascade_tombstones():
+    rack = Garden.objects.create(name="Rack A", total_pods=3)
+    tower = Garden.objects.create(name="Tower", total_pods=2)
+    pods.provision_pods(rack)
+    pods.provision_pods(tower)
+    feed = changes_since(0, 100)
+    assert [garden.name for garden in feed.gardens] == ["Rack A", "Tower"]
+    assert len(feed.pods) == 5 and not feed.has_more
+
+    pods.transition_pods(rack, [1, 2], PodStatus.PLANTED)
+    pods.transition_pods(rack, [1], PodStatus.GROWING)
+    tower_id = tower.pk
+    tower_pods = list(GardenPod.objects.filter(garden=tower).values_list("pk", flat=True))
+    tower.delete()
+    changes = changes_since(feed.cursor, 100)
+    # Pod 1 changed twice and comes once, as it is now
+    assert {(pod.pod_number, pod.status) for pod in changes.pods} == {
+        (1, PodStatus.GROWING),
+        (2, PodStatus.PLANTED),
+    }
+    assert changes.gardens == []
+    assert changes.deleted_gardens == [tower_id]
+    assert sorted(changes.deleted_pods) == sorted(tower_pods)
+    assert changes_since(changes.cursor, 100).pods == []
+
+
+def test_sync_pages_cost_the_changes_not_the_farm():
+    garden = Garden.objects.create(name="Rack A", total_pods=2000)
+    pods.provision_pods(garden)
+    cursor = changes_since(0, 5000).cursor
+    pods.transition_pods(garden, [10, 20, 30], PodStatus.MAINTENANCE)
+
+    with CaptureQueriesContext(connection) as queries:
+        first = changes_since(cursor, 2)
+        second = changes_since(first.cursor, 2)
+    assert [pod.pod_number for pod in first.pods + second.pods] == [10, 20, 30]
+    assert (first.has_more, second.has_more) == (True, False)
+    # One read of the log and one of the pods per page, by primary key
+    assert len(queries) == 4
+    assert all("LIMIT" in query["sql"] or "IN (" in query["sql"] for query in queries)
+
+
+def test_compaction_keeps_the_latest_change_of_every_object():
+    garden = Garden.objects.create(name="Rack A", total_pods=2)
+    pods.provision_pods(garden)
+    seed = Seed.objects.create(name="Basil", seed_type=SeedType.HERB)
+    batch = SeedBatch.objects.create(seed=seed, germination_start_date=date(2025, 3, 1))
+    GardenPod.objects.filter(garden=garden, pod_number=1).update(seed_batch=batch)
+    cursor = changes_since(0, 100).cursor
+    pods.transition_pods(garden, [2], PodStatus.PLANTED)
+    # Detaching pods from a deleted batch is logged too
+    batch.delete()
+
+    assert compact_changes() == 2
+    assert GardenChange.objects.count() == 3
+    after = changes_since(cursor, 100)
+    assert sorted(pod.pod_number for pod in after.pods) == [1, 2]
+    assert {pod.seed_batch_id for pod in after.pods} == {None}
+
+
+@pytest.mark.asyncio
+async def test_changes_endpoint():
+    garden = await Garden.objects.acreate(name="Rack A", total_pods=2)
+    async with _client() as client:
+        await client.post(f"/api/v1/gardens/{garden.pk}/pods/provision", json={})
+        first = (await client.get("/api/v1/gardens/changes", params={"limit": 2})).json()
+        rest = await client.get("/api/v1/gardens/changes", params={"cursor": first["cursor"]})
+        await client.delete(f"/api/v1/gardens/{garden.pk}")
+        deleted = await client.get("/api/v1/gardens/changes", params={"cursor": first["cursor"]})
+        invalid = await client.get("/api/v1/gardens/changes", params={"cursor": -1})
+
+    assert first["has_more"] is True
+    assert first["gardens"][0]["id"] == garden.pk
+    assert first["pods"][0]["garden"] == garden.pk
+    assert [pod["pod_number"] for pod in rest.json()["pods"]] == [2]
+    body = deleted.json()
+    assert body["deleted_gardens"] == [garden.pk]
+    assert len(body["deleted_pods"]) == 2 and body["pods"] == []
+    assert invalid.status_code == 422
+
+
+def test_compaction_runs_as_its_own_nightly_job():
+    scheduler = build_scheduler()
+    compaction = scheduler.get_job(COMPACTION_JOB_ID)
+    assert compaction is not None
+    assert compaction.func is not scheduler.get_job(RETENTION_JOB_ID).func
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.ingest import ingest_readings
+from apps.garden.models import Garden, GardenEnvironmentLog
+from seedr.asgi import application
+
+
+async def _create_garden(client: AsyncClient) -> int:
+    response = await client.post("/api/v1/gardens/", json={"name": "Rack A", "total_pods": 12})
+    assert response.status_code == 200
+    return (await Garden.objects.alatest("id")).id
+
+
+@pytest.mark.asyncio
+async def test_ingest_json_array_reports_rejected_rows():
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        garden_id = await _create_garden(client)
+        readings = [
+            {"ph_level": 6.1, "ec_level": 1.4, "timestamp": "2025-10-01T06:00:00Z"},
+            {"ph_level": "acidic"},
+            {"water_temp_c": 20.5, "light_intensity_lux": 12000},
+        ]
+        response = await client.post(f"/api/v1/gardens/{garden_id}/environment/", json=readings)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 2
+    assert body["rejected"] == 1
+    assert body["batches"] == [{"accepted": 2, "rejected": 1}]
+    assert body["errors"][0]["index"] == 1
+    assert await GardenEnvironmentLog.objects.filter(garden_id=garden_id).acount() == 2
+    first = await GardenEnvironmentLog.objects.filter(garden_id=garden_id).aearliest("timestamp")
+    assert first.timestamp.isoformat() == "2025-10-01T06:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_ingest_ndjson_stream():
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        garden_id = await _create_garden(client)
+        lines = [json.dumps({"ph_level": 5.8 + i / 100}) for i in range(25)] + ["{not json"]
+        response = await client.post(
+            f"/api/v1/gardens/{garden_id}/environment/",
+            content="\n".join(lines).encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 25
+    assert response.json()["rejected"] == 1
+    assert await GardenEnvironmentLog.objects.filter(garden_id=garden_id).acount() == 25
+
+
+@pytest.mark.asyncio
+async def test_ingest_unknown_garden_returns_404():
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/gardens/999/environment/", json=[])
+
+    assert response.status_code == 404
+
+
+def test_batches_are_written_as_they_stream_in():
+    garden = Garden.objects.create(name="Rack A", total_pods=12)
+    written = []
+
+    def rows():
+        for i in range(25):
+            if i % 10 == 0:
+                written.append(GardenEnvironmentLog.objects.filter(garden=garden).count())
+            yield {"ph_level": 6.0}
+
+    result = ingest_readings(garden.pk, rows(), batch_size=10)
+    # Each batch was inserted before the next one was read
+    assert written == [0, 10, 20]
+    assert [batch.accepted for batch in result.batches] == [10, 10, 5]
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from asgiref.sync import sync_to_async
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.models import Garden, GardenEnvironmentRollup, RollupResolution
+from apps.garden.rollups import pick_resolution, rebuild_rollups
+from seedr.asgi import application
+
+
+def test_pick_resolution_prefers_coarsest_fitting_bucket():
+    start = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=90)
+
+    assert pick_resolution(start, end, None, max_points=200) == RollupResolution.HOUR
+    assert pick_resolution(start, end, None, max_points=90) == RollupResolution.DAY
+    assert pick_resolution(start, end, timedelta(minutes=5), 500) == RollupResolution.HOUR
+
+
+@pytest.mark.asyncio
+async def test_ingested_readings_are_rolled_up_incrementally():
+    garden = await Garden.objects.acreate(name="Rack A", total_pods=12)
+    readings = [
+        {"timestamp": "2025-10-01T06:10:00Z", "ph_level": 6.0, "ec_level": 1.2},
+        {"timestamp": "2025-10-01T06:40:00Z", "ph_level": 6.4},
+        {"timestamp": "2025-10-01T07:05:00Z", "ph_level": 5.8},
+    ]
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for reading in readings:
+            await client.post(f"/api/v1/gardens/{garden.id}/environment/", json=[reading])
+        response = await client.get(
+            f"/api/v1/gardens/{garden.id}/environment/rollups",
+            params={
+                "start": "2025-10-01T00:00:00Z",
+                "end": "2025-10-02T00:00:00Z",
+                "step_seconds": 3600,
+                "metrics": ["ph_level"],
+            },
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["resolution"] == "hour"
+    first, second = body["points"]
+    assert first["metrics"]["ph_level"] == {"count": 2, "min": 6.0, "max": 6.4, "mean": 6.2}
+    assert second["metrics"]["ph_level"]["count"] == 1
+
+    daily = await GardenEnvironmentRollup.objects.aget(
+        garden=garden, resolution=RollupResolution.DAY, metric="ph_level"
+    )
+    assert (daily.sample_count, daily.minimum, daily.maximum) == (3, 5.8, 6.4)
+
+    # A full rebuild from raw readings must agree with the incremental merge
+    await sync_to_async(rebuild_rollups)(garden.id)
+    rebuilt = await GardenEnvironmentRollup.objects.aget(
+        garden=garden, resolution=RollupResolution.DAY, metric="ph_level"
+    )
+    assert (rebuilt.sample_count, rebuilt.minimum, rebuilt.maximum) == (3, 5.8, 6.4)
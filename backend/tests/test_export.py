@@ -0,0 +1,91 @@
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from httpx import ASGITransport, AsyncClient
+
+from apps import export
+from apps.garden.models import Garden, GardenEnvironmentLog
+from apps.seed.models import GrowthLogEntry, Seed, SeedBatch, SeedType
+from seedr.asgi import application
+
+START = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _readings(garden, count):
+    GardenEnvironmentLog.objects.bulk_create(
+        GardenEnvironmentLog(
+            garden=garden, timestamp=START + timedelta(minutes=5 * i), ph_level=6.0 + i / 1000
+        )
+        for i in range(count)
+    )
+
+
+def test_csv_export_streams_one_block_per_chunk():
+    garden = Garden.objects.create(name="Rack", total_pods=4)
+    _readings(garden, 1050)
+    chunks = list(
+        export.iter_csv(export.environment_logs(garden.pk), ("timestamp", "ph_level"), 100)
+    )
+    assert len(chunks) == 11
+
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == ["timestamp", "ph_level"]
+    assert rows[1] == ["2025-06-01T00:00:00+00:00", "6.0"]
+    assert len(rows) == 1051
+
+
+def test_parquet_export_writes_a_row_group_per_chunk(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    seed = Seed.objects.create(name="Basil", seed_type=SeedType.HERB)
+    batch = SeedBatch.objects.create(seed=seed, germination_start_date=START.date())
+    GrowthLogEntry.objects.bulk_create(
+        GrowthLogEntry(
+            seed_batch=batch,
+            timestamp=START + timedelta(days=i),
+            height_cm=float(i),
+            photo_urls=[f"{i}.jpg"],
+        )
+        for i in range(25)
+    )
+
+    path = tmp_path / "growth.parquet"
+    call_command(
+        "export_telemetry",
+        "growth",
+        batch=batch.pk,
+        format="parquet",
+        output=str(path),
+        chunk_size=10,
+        stderr=io.StringIO(),
+    )
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == list(export.GROWTH_LOG_EXPORT_FIELDS)
+    assert table.column("height_cm").to_pylist() == [float(i) for i in range(25)]
+    assert table.column("photo_urls")[0].as_py() == '["0.jpg"]'
+    assert table.column("timestamp")[0].as_py() == START
+
+
+@pytest.mark.asyncio
+async def test_environment_export_endpoint_filters_range():
+    garden = await Garden.objects.acreate(name="Rack", total_pods=4)
+    await GardenEnvironmentLog.objects.acreate(garden=garden, timestamp=START, ph_level=5.9)
+    await GardenEnvironmentLog.objects.acreate(
+        garden=garden, timestamp=START + timedelta(days=1), ph_level=6.4
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=application), base_url="http://test"
+    ) as client:
+        response = await client.get(
+            f"/api/v1/gardens/{garden.pk}/environment/export",
+            params={"end": (START + timedelta(hours=1)).isoformat()},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv"
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["ph_level"] for row in rows] == ["5.9"]
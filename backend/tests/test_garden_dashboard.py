@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.dashboard import garden_dashboards
+from apps.garden.models import Garden, GardenEnvironmentLog, GardenPod, PodStatus
+from apps.seed.models import Seed, SeedBatch, SeedType
+from apps.task.models import Task, TaskScope, TaskStatus, TaskType
+from seedr.asgi import application
+
+
+def _garden(name, pods=6):
+    now = timezone.now()
+    garden = Garden.objects.create(name=name, total_pods=pods)
+    seed = Seed.objects.create(name=f"{name} basil", seed_type=SeedType.HERB)
+    batch = SeedBatch.objects.create(seed=seed, germination_start_date=date(2025, 6, 1))
+    GardenPod.objects.bulk_create(
+        GardenPod(
+            garden=garden,
+            pod_number=n,
+            status=PodStatus.GROWING if n <= 4 else PodStatus.EMPTY,
+            seed_batch=batch if n <= 4 else None,
+        )
+        for n in range(1, pods + 1)
+    )
+    pod = GardenPod.objects.get(garden=garden, pod_number=1)
+    for status, due in [
+        (TaskStatus.PENDING, now - timedelta(days=1)),
+        (TaskStatus.PENDING, now + timedelta(days=1)),
+        (TaskStatus.COMPLETED, now - timedelta(days=1)),
+        (TaskStatus.OVERDUE, None),
+    ]:
+        Task.objects.create(
+            task_type=TaskType.OTHER,
+            scope=TaskScope.POD,
+            title="Check roots",
+            pod=pod,
+            scheduled_date=now - timedelta(days=2),
+            due_date=due,
+            status=status,
+        )
+    for minutes, ph in [(10, 6.1), (5, 6.3)]:
+        GardenEnvironmentLog.objects.create(
+            garden=garden, timestamp=now - timedelta(minutes=minutes), ph_level=ph
+        )
+    return garden
+
+
+def test_dashboard_query_count_does_not_grow_with_gardens():
+    first = _garden("North")
+    with CaptureQueriesContext(connection) as one:
+        (dashboard,) = garden_dashboards(first.pk)
+    assert dashboard.pods_by_status["growing"] == 4
+    assert dashboard.pods_by_status["empty"] == 2
+    assert dashboard.overdue_tasks == 2
+    assert dashboard.latest_reading.ph_level == 6.3
+    assert [(b.seed_name, b.pod_numbers) for b in dashboard.active_batches] == [
+        ("North basil", [1, 2, 3, 4])
+    ]
+
+    for name in ("South", "East", "West"):
+        _garden(name, pods=12)
+    with CaptureQueriesContext(connection) as many:
+        dashboards = garden_dashboards()
+    assert [d.name for d in dashboards] == ["North", "South", "East", "West"]
+    assert len(one) == len(many) == 3
+
+    # Printing pods loaded without their garden stays query-free
+    pods = list(GardenPod.objects.filter(garden=first))
+    with CaptureQueriesContext(connection) as printed:
+        labels = [str(pod) for pod in pods]
+    assert len(printed) == 0
+    assert labels[0] == f"Pod 1 in garden {first.pk}"
+
+
+def test_harvested_batches_are_not_active():
+    garden = _garden("North")
+    seed = Seed.objects.create(name="Mint", seed_type=SeedType.HERB)
+    harvested = SeedBatch.objects.create(
+        seed=seed, germination_start_date=date(2025, 5, 1), actual_harvest_date=date(2025, 6, 20)
+    )
+    GardenPod.objects.filter(garden=garden, pod_number=5).update(seed_batch=harvested)
+    (dashboard,) = garden_dashboards(garden.pk)
+    assert [b.seed_name for b in dashboard.active_batches] == ["North basil"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_endpoints():
+    garden = await Garden.objects.acreate(name="Empty", total_pods=0)
+    async with AsyncClient(
+        transport=ASGITransport(app=application), base_url="http://test"
+    ) as client:
+        single = await client.get(f"/api/v1/gardens/{garden.pk}/dashboard")
+        listed = await client.get("/api/v1/gardens/dashboard")
+        missing = await client.get("/api/v1/gardens/999/dashboard")
+    assert single.status_code == 200
+    assert single.json()["latest_reading"] is None
+    assert single.json()["pods_by_status"]["empty"] == 0
+    assert [d["id"] for d in listed.json()] == [garden.pk]
+    assert missing.status_code == 404
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from apps.garden.ingest import ingest_readings
+from apps.garden.models import Garden, GardenPod
+from apps.seed.forecast import forecast_harvests, predict_harvest_dates
+from apps.seed.models import Seed, SeedBatch, SeedType
+
+TODAY = date(2025, 6, 30)
+PLANTED = TODAY - timedelta(days=30)
+
+
+def _planted_batch(garden, seed, pod_number=1, **fields):
+    batch = SeedBatch.objects.create(seed=seed, germination_start_date=PLANTED, **fields)
+    GardenPod.objects.create(garden=garden, pod_number=pod_number, seed_batch=batch)
+    return batch
+
+
+def _daily_readings(garden, water_temp_c):
+    rows = [
+        {
+            "timestamp": datetime.combine(PLANTED + timedelta(days=d), datetime.min.time())
+            .replace(hour=12, tzinfo=timezone.utc)
+            .isoformat(),
+            "water_temp_c": water_temp_c,
+        }
+        for d in range(30)
+    ]
+    assert ingest_readings(garden.pk, rows).rejected == 0
+
+
+def test_forecast_follows_degree_days():
+    # Reference temperature 22C: 12 GDD/day against the 10C base
+    seed = Seed.objects.create(
+        name="Basil", seed_type=SeedType.HERB, germination_days=10, days_to_harvest=50
+    )
+    warm = Garden.objects.create(name="Warm", total_pods=4)
+    cold = Garden.objects.create(name="Cold", total_pods=4)
+    quiet = Garden.objects.create(name="No sensors", total_pods=4)
+    _daily_readings(warm, 28.0)  # 18 GDD/day: 1.5x reference
+    _daily_readings(cold, 16.0)  # 6 GDD/day: 0.5x reference
+
+    in_warm = _planted_batch(warm, seed)
+    in_cold = _planted_batch(cold, seed)
+    baseline = _planted_batch(quiet, seed)
+    unplanted = SeedBatch.objects.create(seed=seed, germination_start_date=PLANTED)
+    harvested = _planted_batch(quiet, seed, pod_number=2, actual_harvest_date=TODAY)
+
+    result = forecast_harvests(TODAY)
+    assert (result.forecast, result.updated) == (4, 4)
+    for batch in (in_warm, in_cold, baseline, unplanted, harvested):
+        batch.refresh_from_db()
+
+    # 60 reference days: 30 days spent 45 (warm) or 15 (cold) of them
+    assert baseline.predicted_harvest_date == PLANTED + timedelta(days=60)
+    assert unplanted.predicted_harvest_date == baseline.predicted_harvest_date
+    assert in_warm.predicted_harvest_date == TODAY + timedelta(days=10)
+    assert in_cold.predicted_harvest_date == TODAY + timedelta(days=90)
+    assert harvested.predicted_harvest_date is None
+
+    assert forecast_harvests(TODAY).updated == 0
+
+
+def test_observed_germination_restarts_the_budget_and_seed_band_sets_reference():
+    seed = Seed.objects.create(
+        name="Lettuce",
+        seed_type=SeedType.VEGETABLE,
+        germination_days=5,
+        days_to_harvest=40,
+        optimal_temp_c_min=14.0,
+        optimal_temp_c_max=18.0,
+    )
+    garden = Garden.objects.create(name="Cool room", total_pods=2)
+    _daily_readings(garden, 16.0)  # exactly the band midpoint
+    batch = _planted_batch(garden, seed, actual_germination_date=TODAY - timedelta(days=20))
+
+    forecast_harvests(TODAY)
+    batch.refresh_from_db()
+    assert batch.predicted_harvest_date == TODAY + timedelta(days=20)
+
+
+def test_prediction_is_vectorized_over_many_batches():
+    n = 100_000
+    rng = np.random.default_rng(7)
+    gardens = np.arange(1, 1001)
+    today = TODAY.toordinal()
+    batches = {
+        "id": np.arange(n),
+        "garden": rng.integers(0, 1001, n),  # garden 0 does not exist
+        "start": today - rng.integers(0, 90, n),
+        "germinated": np.full(n, -1),
+        "predicted": np.full(n, -1),
+        "germination_days": np.full(n, 7.0),
+        "days_to_harvest": np.full(n, 60.0),
+        "temp_min": np.full(n, np.nan),
+        "temp_max": np.full(n, np.nan),
+    }
+    temperatures = np.full((len(gardens), 90), 22.0)
+    predicted = predict_harvest_dates(batches, temperatures, gardens, today)
+    # At the reference temperature every batch lands on its baseline date
+    assert np.array_equal(predicted, np.maximum(batches["start"] + 67, today))
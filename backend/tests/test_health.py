@@ -1,13 +1,8 @@
-import os
-import django
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from seedr.asgi import application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seedr.settings")
-django.setup()
-
 
 @pytest.mark.asyncio
 async def test_health_endpoint():
@@ -0,0 +1,94 @@
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from django.db import connection
+
+from apps.garden.models import Garden, GardenEnvironmentLog, GardenEnvironmentRollup
+from apps.task.models import Task, TaskStatus
+
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def _import(*args, **options):
+    out, err = io.StringIO(), io.StringIO()
+    call_command("import_telemetry", *args, stdout=out, stderr=err, **options)
+    return out.getvalue(), err.getvalue()
+
+
+def _indexes(table):
+    with connection.cursor() as cursor:
+        return set(connection.introspection.get_constraints(cursor, table))
+
+
+def test_environment_csv_import_in_batches_with_deferred_indexes(tmp_path):
+    garden = Garden.objects.create(name="Legacy rack", total_pods=8)
+    path = tmp_path / "readings.csv.gz"
+    with gzip.open(path, "wt", newline="") as file:
+        file.write("timestamp,ph_level,ec_level,notes\n")
+        for i in range(250):
+            file.write(f"{(START + timedelta(hours=i)).isoformat()},6.{i % 10},1.4,\n")
+        file.write("yesterday,6.0,1.4,\n")
+        file.write(f"{START.isoformat()},acidic,1.4,\n")
+        # History without a time would be stamped with the import time
+        file.write(",6.0,1.4,\n")
+
+    out, err = _import(
+        "environment", str(path), garden=garden.pk, batch_size=100, defer_indexes=True
+    )
+    assert "Imported 250 environment rows, rejected 3" in out
+    assert err.count("batch ") == 3
+    assert "row 251:" in err and "row 252:" in err
+    assert "row 253:" in err and "'timestamp'" in err
+
+    assert GardenEnvironmentLog.objects.filter(garden=garden).count() == 250
+    first = GardenEnvironmentLog.objects.earliest("timestamp")
+    assert (first.timestamp, first.ph_level, first.notes) == (START, 6.0, None)
+    # Rollups are kept in step and the dropped index is back
+    assert GardenEnvironmentRollup.objects.filter(metric="ph_level").count() > 0
+    assert "env_log_garden_time_idx" in _indexes(GardenEnvironmentLog._meta.db_table)
+
+
+def test_task_ndjson_import_keeps_history_out_of_the_engine(tmp_path):
+    garden = Garden.objects.create(name="Legacy rack", total_pods=8)
+    rows = [
+        {
+            "task_type": "nutrient_refill",
+            "scope": "garden",
+            "title": "Weekly refill",
+            "garden_id": garden.pk,
+            "scheduled_date": START.isoformat(),
+            "is_recurring": True,
+            "recurrence_pattern": "weekly",
+        },
+        {
+            "task_type": "harvest",
+            "scope": "garden",
+            "title": "Harvest lettuce",
+            "garden_id": garden.pk,
+            "scheduled_date": START.isoformat(),
+            "status": "completed",
+            "completed_date": (START + timedelta(days=1)).isoformat(),
+        },
+        {
+            "task_type": "harvest",
+            "scope": "garden",
+            "title": "Lost",
+            "garden_id": 999,
+            "scheduled_date": START.isoformat(),
+        },
+    ]
+    path = tmp_path / "tasks.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n{not json\n")
+
+    out, _ = _import("tasks", str(path))
+    assert "Imported 2 tasks rows, rejected 2" in out
+
+    weekly = Task.objects.get(title="Weekly refill")
+    assert weekly.next_run_at > datetime.now(timezone.utc)
+    assert weekly.next_run_at.weekday() == START.weekday()
+    harvest = Task.objects.get(title="Harvest lettuce")
+    assert harvest.status == TaskStatus.COMPLETED
+    assert harvest.next_run_at is None
@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from apps.garden import pods
+from apps.garden.ingest import ingest_readings
+from apps.garden.live import RETRY_FRAME, live_feed
+from apps.garden.models import Garden, PodStatus
+from seedr.asgi import application
+
+
+def _parse(data: bytes) -> tuple[str, dict]:
+    event, payload = data.decode().strip().split("\n")
+    return event.removeprefix("event: "), json.loads(payload.removeprefix("data: "))
+
+
+async def _next(subscriber) -> bytes:
+    return await asyncio.wait_for(anext(subscriber.frames(keepalive=5)), 5)
+
+
+@pytest.mark.asyncio
+async def test_changes_fan_out_to_every_subscriber_of_the_garden():
+    garden = await Garden.objects.acreate(name="Rack A", total_pods=4)
+    other = await Garden.objects.acreate(name="Rack B", total_pods=4)
+    await sync_to_async(pods.provision_pods)(garden, PodStatus.EMPTY)
+    first = await live_feed.subscribe(garden.pk)
+    second = await live_feed.subscribe(garden.pk)
+    bystander = await live_feed.subscribe(other.pk)
+
+    await sync_to_async(ingest_readings)(garden.pk, [{"ph_level": 6.2}])
+    reading = await _next(first)
+    assert await _next(second) is reading  # encoded once, shared by both queues
+    event, data = _parse(reading)
+    assert event == "reading"
+    assert data["garden_id"] == garden.pk and data["ph_level"] == 6.2
+
+    await sync_to_async(pods.transition_pods)(garden, [2], PodStatus.PLANTED)
+    event, data = _parse(await _next(first))
+    assert event == "pod"
+    assert (data["pod_number"], data["status"]) == (2, PodStatus.PLANTED)
+    assert _parse(await _next(second))[1] == data
+    assert not bystander.queue
+
+    assert live_feed.snapshot()["subscribers"] == 3
+    for subscriber in (first, second, bystander):
+        live_feed.unsubscribe(subscriber)
+    assert live_feed.snapshot()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_clients_drop_the_oldest_frames_and_are_told_how_many():
+    garden = await Garden.objects.acreate(name="Rack A", total_pods=4)
+    live_feed.queue_size = 3
+    try:
+        subscriber = await live_feed.subscribe(garden.pk)
+        await sync_to_async(ingest_readings)(garden.pk, [{"ec_level": i} for i in range(8)])
+        # The commit wakes the feed, which publishes without waiting for the client
+        for _ in range(100):
+            stats = live_feed.snapshot()
+            if stats["frames_queued"] + stats["frames_dropped"] == 8:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        live_feed.queue_size = 256
+
+    stream = subscriber.frames(keepalive=5)
+    event, data = _parse(await anext(stream))
+    assert (event, data) == ("lagged", {"missed": 5})
+    assert [_parse(await anext(stream))[1]["ec_level"] for _ in range(3)] == [5, 6, 7]
+    assert live_feed.snapshot()["frames_dropped"] == 5
+    live_feed.unsubscribe(subscriber)
+
+
+async def _open_stream(path: str) -> tuple[int, dict, list[bytes]]:
+    """Drive the ASGI app directly: read the head and the first frames, then disconnect."""
+    started, subscribed = asyncio.Event(), asyncio.Event()
+    head, frames = {}, []
+    disconnect = asyncio.Event()
+    messages = [{"type": "http.request", "body": b""}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            head.update(message)
+            started.set()
+        elif message.get("body"):
+            frames.append(message["body"])
+            subscribed.set()
+            if len(frames) == 2:
+                disconnect.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "server": ("test", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    app = asyncio.create_task(application(scope, receive, send))
+    await asyncio.wait_for(started.wait(), 5)
+    if head["status"] == 200:
+        # The retry frame comes after the response has subscribed
+        await asyncio.wait_for(subscribed.wait(), 5)
+        garden_id = int(path.split("/")[4])
+        await sync_to_async(ingest_readings)(garden_id, [{"water_temp_c": 19.5}])
+    else:
+        disconnect.set()
+    await asyncio.wait_for(app, 5)
+    return head["status"], dict(head["headers"]), frames
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_sends_server_sent_events():
+    garden = await Garden.objects.acreate(name="Rack A", total_pods=4)
+    status, headers, frames = await _open_stream(f"/api/v1/gardens/{garden.pk}/stream")
+    assert status == 200
+    assert headers[b"Content-Type"] == b"text/event-stream"
+    assert headers[b"Cache-Control"] == b"no-cache"
+    assert frames[0] == RETRY_FRAME
+    event, data = _parse(frames[1])
+    assert event == "reading" and data["water_temp_c"] == 19.5
+    # The response unsubscribed when the client went away
+    assert live_feed.snapshot()["subscribers"] == 0
+
+    status, _, _ = await _open_stream(f"/api/v1/gardens/{garden.pk + 100}/stream")
+    assert status == 404
@@ -0,0 +1,126 @@
+import re
+import threading
+import time
+from collections import Counter
+
+import pytest
+from django.test import RequestFactory, override_settings
+from httpx import ASGITransport, AsyncClient
+from ninja import NinjaAPI, Router, Schema
+from ninja.testing import TestClient
+
+from apps import metrics
+from apps.garden.models import Garden, GardenEnvironmentLog
+from seedr.asgi import application
+
+
+def _value(text: str, sample: str) -> float:
+    match = re.search(rf"^{re.escape(sample)} (\S+)$", text, re.MULTILINE)
+    assert match, f"{sample} missing"
+    return float(match.group(1))
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_latency_queries_and_serialization():
+    for i in range(3):
+        garden = await Garden.objects.acreate(name=f"Garden {i}", total_pods=4)
+        await GardenEnvironmentLog.objects.acreate(garden=garden, ph_level=6.0)
+
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for _ in range(2):
+            assert (await client.get("/api/v1/tasks/")).status_code == 200
+        assert (await client.get("/api/v1/gardens/dashboard")).status_code == 200
+        assert (await client.get("/api/v1/tasks/999")).status_code == 404
+        response = await client.get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    tasks = 'method="GET",route="api/v1/tasks/"'
+    assert _value(text, f'seedr_http_requests_total{{{tasks},status="200"}}') == 2
+    missing = 'method="GET",route="api/v1/tasks/<task_id>",status="404"'
+    assert _value(text, f"seedr_http_requests_total{{{missing}}}") == 1
+    assert _value(text, f'seedr_http_request_duration_seconds_bucket{{{tasks},le="+Inf"}}') == 2
+    assert _value(text, f"seedr_http_request_duration_seconds_count{{{tasks}}}") == 2
+
+    # The dashboard takes three queries however many gardens there are
+    dashboard = 'method="GET",route="api/v1/gardens/dashboard"'
+    assert _value(text, f"seedr_http_db_queries_sum{{{dashboard}}}") == 3
+    assert _value(text, f'seedr_http_db_queries_bucket{{{dashboard},le="2"}}') == 0
+    assert _value(text, f'seedr_http_db_queries_bucket{{{dashboard},le="5"}}') == 1
+    assert _value(text, f"seedr_http_db_seconds_total{{{dashboard}}}") > 0
+    assert _value(text, f"seedr_http_serialization_seconds_total{{{dashboard}}}") > 0
+
+    assert "# TYPE seedr_task_sweep_runs_total counter" in text
+    assert _value(text, "seedr_task_sweep_last_rows") == 0
+    assert "seedr_response_cache_hits_total" in text
+
+
+def _busy_for(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_collects_stacks_of_the_profiled_thread():
+    request = metrics.RequestMetrics()
+    metrics.sampler.start(request, interval=0.002)
+    _busy_for(0.1)
+    metrics.sampler.stop(request)
+
+    assert sum(request.samples.values()) >= 10
+    stack, _ = request.samples.most_common(1)[0]
+    assert stack.endswith("tests.test_metrics:_busy_for")
+    assert "test_sampler_collects_stacks_of_the_profiled_thread" in stack
+
+    # The sampling thread exits once nothing is being profiled
+    time.sleep(0.02)
+    assert not any(thread.name == "seedr-stack-sampler" for thread in threading.enumerate())
+
+
+class _Response:
+    status_code = 200
+
+
+def test_slow_requests_go_to_the_handlers(monkeypatch):
+    slow = []
+    monkeypatch.setattr(metrics, "_slow_request_handlers", lambda: [slow.append])
+    with override_settings(METRICS_SLOW_REQUEST_MS=10, METRICS_PROFILE_SAMPLE_RATE=1.0):
+        middleware = metrics.MetricsMiddleware(lambda request: _busy_for(0.05) or _Response())
+        middleware(RequestFactory().get("/slow"))
+        middleware = metrics.MetricsMiddleware(lambda request: _Response())
+        middleware(RequestFactory().get("/fast"))
+
+    assert len(slow) == 1
+    assert (slow[0].path, slow[0].route) == ("/slow", "unmatched")
+    assert slow[0].elapsed >= 0.05
+    assert any(stack.endswith(":_busy_for") for stack in slow[0].metrics.samples)
+
+
+class _Item(Schema):
+    name: str
+
+
+def test_instrument_hooks_still_fire_on_this_ninja_version():
+    # instrument() rebinds Operation internals; a Ninja release renaming them
+    # would silently stop the timings, so check Ninja really calls the hooks
+    api = NinjaAPI(urls_namespace="metrics-hooks")
+    router = Router()
+
+    @router.get("/items", response=list[_Item])
+    def items(request):
+        return [{"name": f"item {i}"} for i in range(500)]
+
+    api.add_router("/", router)
+    metrics.instrument(api)
+    request = metrics.RequestMetrics(samples=Counter())
+    token = metrics._current.set(request)
+    try:
+        response = TestClient(router).get("/items")
+    finally:
+        metrics._current.reset(token)
+
+    assert response.status_code == 200 and len(response.json()) == 500
+    assert request.serialization_seconds > 0
+    assert threading.get_ident() in request.threads
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from httpx import ASGITransport, AsyncClient
+
+from apps.task.agenda import agenda
+from apps.task.models import RecurrencePattern, Task, TaskScope, TaskStatus, TaskType
+from apps.task.sweeper import mark_overdue, sweep
+from seedr.asgi import application
+
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _task(**fields) -> Task:
+    defaults = {
+        "task_type": TaskType.EC_CHECK,
+        "scope": TaskScope.GARDEN,
+        "title": "Check EC",
+        "scheduled_date": NOW - timedelta(days=2),
+    }
+    return Task.objects.create(**{**defaults, **fields})
+
+
+def test_overdue_one_off_tasks_are_marked_in_one_update():
+    late = _task(due_date=NOW - timedelta(hours=1))
+    started = _task(due_date=NOW - timedelta(days=1), status=TaskStatus.IN_PROGRESS)
+    on_time = _task(due_date=NOW + timedelta(hours=1))
+    done = _task(due_date=NOW - timedelta(days=1), status=TaskStatus.COMPLETED)
+    no_due = _task()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert mark_overdue(NOW) == 2
+    assert len(queries) == 1
+    assert queries[0]["sql"].startswith("UPDATE")
+
+    statuses = dict(Task.objects.values_list("id", "status"))
+    assert statuses[late.pk] == statuses[started.pk] == TaskStatus.OVERDUE
+    assert statuses[on_time.pk] == statuses[no_due.pk] == TaskStatus.PENDING
+    assert statuses[done.pk] == TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_recurring_tasks_roll_forward_in_batches_and_sweeps_are_counted():
+    anchor = datetime(2025, 2, 3, 9, 0, tzinfo=timezone.utc)  # a Monday
+    # Weekly with a 36 hour window: the Mar 3 occurrence closed on Mar 4 21:00
+    weekly = []
+    for i in range(5):
+        weekly.append(
+            await Task.objects.acreate(
+                task_type=TaskType.WATER_CHANGE,
+                scope=TaskScope.GARDEN,
+                title=f"Change water {i}",
+                scheduled_date=anchor,
+                due_date=anchor + timedelta(hours=36),
+                is_recurring=True,
+                recurrence_pattern=RecurrencePattern.WEEKLY,
+                status=TaskStatus.COMPLETED if i == 0 else TaskStatus.PENDING,
+            )
+        )
+    # Daily with a three day window: Mar 8 is the first occurrence still open
+    daily = await Task.objects.acreate(
+        task_type=TaskType.PH_CHECK,
+        scope=TaskScope.GARDEN,
+        title="Check pH",
+        scheduled_date=anchor,
+        due_date=anchor + timedelta(days=3),
+        is_recurring=True,
+        recurrence_pattern=RecurrencePattern.DAILY,
+    )
+    next_run = (await Task.objects.aget(pk=weekly[0].pk)).next_run_at
+
+    result = await sync_to_async(sweep)(NOW, batch_size=2)
+    assert (result.rolled_forward, result.missed, result.batches) == (6, 5, 3)
+
+    rolled = await Task.objects.aget(pk=weekly[3].pk)
+    # The Mar 10 occurrence, due 36 hours later; the series keeps its anchor
+    assert rolled.next_due == datetime(2025, 3, 11, 21, 0, tzinfo=timezone.utc)
+    assert (rolled.scheduled_date, rolled.due_date) == (anchor, anchor + timedelta(hours=36))
+    assert rolled.status == TaskStatus.PENDING
+    assert rolled.next_run_at == next_run  # the engine's bookkeeping is untouched
+    daily = await Task.objects.aget(pk=daily.pk)
+    assert daily.next_due == datetime(2025, 3, 11, 9, 0, tzinfo=timezone.utc)
+
+    assert (await sync_to_async(sweep)(NOW)).rolled_forward == 0
+
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/api/v1/tasks/sweep/stats")
+    stats = response.json()
+    assert stats["sweeps"] == 2
+    assert stats["rolled_forward"] == 6
+    assert stats["missed"] == 5
+    assert stats["last_rows"] == 0
+    assert stats["seconds_total"] >= stats["last_seconds"] > 0
+
+
+def test_rolling_forward_keeps_the_series_anchor():
+    anchor = datetime(2025, 1, 31, 9, 0, tzinfo=timezone.utc)
+    task = _task(
+        task_type=TaskType.NUTRIENT_REFILL,
+        title="Refill nutrients",
+        scheduled_date=anchor,
+        is_recurring=True,
+        recurrence_pattern=RecurrencePattern.MONTHLY,
+    )
+    for now in (
+        datetime(2025, 2, 3, tzinfo=timezone.utc),
+        datetime(2025, 3, 3, tzinfo=timezone.utc),
+    ):
+        sweep(now)
+    task.refresh_from_db()
+    # Feb 28 was clamped, March is back on the 31st
+    assert task.next_due == datetime(2025, 3, 31, 9, 0, tzinfo=timezone.utc)
+    assert task.scheduled_date == anchor
+    window = (datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 4, 1, tzinfo=timezone.utc))
+    assert [item.starts_at.day for item in agenda(*window)] == [31, 28, 31]
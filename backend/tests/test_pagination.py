@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import IntegrityError, connection
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.models import Garden, GardenEnvironmentLog, GardenPod
+from seedr.asgi import application
+
+
+async def _collect(client: AsyncClient, url: str, limit: int) -> tuple[list, int]:
+    items, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.asyncio
+async def test_gardens_and_pods_are_keyset_paginated():
+    for number in range(5):
+        await Garden.objects.acreate(name=f"Rack {number}", total_pods=4)
+    garden = await Garden.objects.aearliest("id")
+    for pod_number in (3, 1, 4, 2):
+        await GardenPod.objects.acreate(garden=garden, pod_number=pod_number)
+
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        gardens, pages = await _collect(client, "/api/v1/gardens/", limit=2)
+        pods, _ = await _collect(client, f"/api/v1/gardens/{garden.id}/pods/", limit=3)
+
+    assert [g["name"] for g in gardens] == [f"Rack {n}" for n in range(5)]
+    assert pages == 3
+    assert [p["pod_number"] for p in pods] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_environment_logs_page_newest_first_with_tied_timestamps():
+    garden = await Garden.objects.acreate(name="Rack A", total_pods=4)
+    same_time = datetime(2025, 10, 1, 6, 0, tzinfo=timezone.utc)
+    await GardenEnvironmentLog.objects.abulk_create(
+        GardenEnvironmentLog(garden=garden, timestamp=same_time, ph_level=5.5 + i / 10)
+        for i in range(5)
+    )
+
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        logs, pages = await _collect(client, f"/api/v1/gardens/{garden.id}/environment/", limit=2)
+        bad = await client.get(
+            f"/api/v1/gardens/{garden.id}/environment/", params={"cursor": "garbage"}
+        )
+
+    assert pages == 3
+    assert [log["ph_level"] for log in logs] == [5.9, 5.8, 5.7, 5.6, 5.5]
+    assert bad.status_code == 400
+
+
+def test_pod_numbers_are_unique_per_garden_and_logs_use_composite_index():
+    garden = Garden.objects.create(name="Rack A", total_pods=4)
+    GardenPod.objects.create(garden=garden, pod_number=1)
+    with pytest.raises(IntegrityError):
+        GardenPod.objects.create(garden=garden, pod_number=1)
+
+    query = GardenEnvironmentLog.objects.filter(garden_id=garden.id).order_by("-timestamp", "-id")
+    sql, params = query[:10].query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = " ".join(str(row) for row in cursor.fetchall())
+    assert "env_log_garden_time_idx" in plan
+    assert "TEMP B-TREE" not in plan
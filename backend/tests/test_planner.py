@@ -0,0 +1,117 @@
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import replace
+from datetime import date, timedelta
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.models import Garden, GardenPod, PodStatus
+from apps.garden.planner import apply_plan, pending_batches, plan_garden, plan_plantings
+from apps.seed.models import Seed, SeedBatch, SeedType
+from apps.task.models import Task, TaskType
+from seedr.asgi import application
+
+TODAY = date(2025, 3, 1)
+
+
+def test_thousand_pods_for_a_year_plan_fast_without_overlaps():
+    rng = random.Random(7)
+    pods, days = 1000, 365
+    durations = [rng.choice([35, 50, 65, 80, 95]) for _ in range(6000)]
+    releases = [rng.randrange(0, 120) for _ in durations]
+    free_from = [rng.randrange(0, 60) for _ in range(pods)]
+
+    started = time.perf_counter()
+    placements = plan_plantings(releases, durations, free_from, days - 1, max_harvests_per_day=20)
+    assert time.perf_counter() - started < 1.0
+
+    booked = defaultdict(list)
+    for p in placements:
+        assert p.start >= max(releases[p.batch], free_from[p.pod])
+        assert p.end - p.start == durations[p.batch]
+        booked[p.pod].append((p.start, p.end))
+    for spans in booked.values():
+        spans.sort()
+        assert all(end <= start for (_, end), (start, _) in zip(spans, spans[1:]))
+    assert max(Counter(p.end for p in placements).values()) <= 20
+    assert len({p.batch for p in placements}) == len(placements) > 3000
+
+
+@pytest.mark.asyncio
+async def test_plan_endpoint_fills_free_pods_and_applies_as_tasks():
+    garden = await Garden.objects.acreate(name="Plan rack", total_pods=3)
+    lettuce = await Seed.objects.acreate(
+        name="Lettuce", seed_type=SeedType.VEGETABLE, germination_days=5, days_to_harvest=25
+    )
+    growing = await SeedBatch.objects.acreate(
+        seed=lettuce, germination_start_date=TODAY, predicted_harvest_date=TODAY + timedelta(10)
+    )
+    await GardenPod.objects.acreate(
+        garden=garden, pod_number=1, status=PodStatus.GROWING, seed_batch=growing
+    )
+    await GardenPod.objects.acreate(garden=garden, pod_number=2)
+    await GardenPod.objects.acreate(garden=garden, pod_number=3, status=PodStatus.MAINTENANCE)
+    pending = [
+        await SeedBatch.objects.acreate(seed=lettuce, germination_start_date=TODAY)
+        for _ in range(3)
+    ]
+
+    async with AsyncClient(transport=ASGITransport(app=application), base_url="http://test") as c:
+        url = f"/api/v1/gardens/{garden.pk}/plan"
+        plan = (await c.post(url, json={"start": TODAY.isoformat(), "horizon_days": 40})).json()
+        assert [(p["pod_number"], p["plant_on"], p["harvest_on"]) for p in plan["plantings"]] == [
+            (2, "2025-03-01", "2025-03-31"),
+            (1, "2025-03-11", "2025-04-10"),
+            (2, "2025-03-31", "2025-04-30"),
+        ]
+        assert [p["batch_id"] for p in plan["plantings"]] == [b.pk for b in pending]
+        assert plan["utilization"] == pytest.approx(1.0)
+
+        body = {"start": TODAY.isoformat(), "horizon_days": 40, "apply": True}
+        applied = (await c.post(url, json=body)).json()
+        assert len(applied["plantings"]) == 3
+        # Planned batches are no longer pending and keep their pods booked
+        again = (await c.post(url, json={"start": TODAY.isoformat()})).json()
+        assert again["plantings"] == [] and again["unplanned"] == []
+
+    tasks = [task async for task in Task.objects.filter(task_type=TaskType.TRANSPLANT)]
+    assert sorted(task.seed_batch_id for task in tasks) == [b.pk for b in pending]
+    assert all(task.next_run_at == task.scheduled_date for task in tasks)
+
+
+def test_a_stale_plan_does_not_book_batches_planned_since():
+    garden = Garden.objects.create(name="Plan rack", total_pods=2)
+    GardenPod.objects.bulk_create(GardenPod(garden=garden, pod_number=n) for n in (1, 2))
+    basil = Seed.objects.create(name="Basil", seed_type=SeedType.HERB, days_to_harvest=30)
+    batches = [SeedBatch.objects.create(seed=basil, germination_start_date=TODAY) for _ in "ab"]
+
+    first = plan_garden(garden, TODAY, 40)
+    second = plan_garden(garden, TODAY, 40)
+    assert [p.batch_id for p in second.plantings] == [b.pk for b in batches]
+    assert len(apply_plan(first)) == 2
+    assert apply_plan(second) == [] and second.plantings == []
+    assert Task.objects.filter(seed_batch=batches[0]).count() == 1
+    assert pending_batches() == []
+
+
+def test_a_stale_plan_does_not_double_book_a_pod():
+    garden = Garden.objects.create(name="Plan rack", total_pods=1)
+    GardenPod.objects.create(garden=garden, pod_number=1)
+    basil = Seed.objects.create(name="Basil", seed_type=SeedType.HERB, days_to_harvest=30)
+    first, second = [
+        SeedBatch.objects.create(seed=basil, germination_start_date=TODAY) for _ in "ab"
+    ]
+    plan_a = plan_garden(garden, TODAY, 5)
+    assert [p.batch_id for p in plan_a.plantings] == [first.pk]
+    assert plan_a.unplanned == [second.pk]
+    # A plan made alongside it put the batch A left over into the same slot
+    plan_b = replace(plan_a, plantings=[replace(plan_a.plantings[0], batch_id=second.pk)])
+    plan_b.unplanned = []
+
+    assert len(apply_plan(plan_a)) == 1
+    assert apply_plan(plan_b) == []
+    assert (plan_b.plantings, plan_b.unplanned) == ([], [second.pk])
+    assert plan_b.utilization == pytest.approx(1.0)  # the pod is busy with A's batch
+    assert Task.objects.filter(task_type=TaskType.TRANSPLANT).count() == 1
@@ -0,0 +1,68 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from apps.garden.models import Garden, GardenPod, PodStatus
+from seedr.asgi import application
+
+
+def _client():
+    return AsyncClient(transport=ASGITransport(app=application), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_provision_creates_only_missing_pods():
+    garden = await Garden.objects.acreate(name="NFT rack", total_pods=500)
+    await GardenPod.objects.acreate(garden=garden, pod_number=7, status=PodStatus.GROWING)
+    async with _client() as client:
+        url = f"/api/v1/gardens/{garden.pk}/pods/provision"
+        first = await client.post(url, json={})
+        again = await client.post(url, json={})
+    assert first.json() == {"created": 499, "existing": 1}
+    assert again.json() == {"created": 0, "existing": 500}
+    assert await GardenPod.objects.filter(garden=garden).acount() == 500
+    pod = await GardenPod.objects.aget(garden=garden, pod_number=7)
+    assert pod.status == PodStatus.GROWING
+
+
+@pytest.mark.asyncio
+async def test_status_transition_is_all_or_nothing():
+    garden = await Garden.objects.acreate(name="NFT rack", total_pods=4)
+    async with _client() as client:
+        await client.post(f"/api/v1/gardens/{garden.pk}/pods/provision", json={"status": 1})
+        url = f"/api/v1/gardens/{garden.pk}/pods/status"
+        # Cached pod reads must see the bulk update
+        assert (await client.get(f"/api/v1/gardens/{garden.pk}/pods/1")).json()["status"] == 1
+
+        moved = await client.post(url, json={"pod_numbers": [1, 2], "status": 2, "from_status": 1})
+        assert moved.json() == {"updated": 2}
+        assert (await client.get(f"/api/v1/gardens/{garden.pk}/pods/1")).json()["status"] == 2
+
+        for body, message in [
+            ({"pod_numbers": [3, 9], "status": 2}, "Unknown pod numbers: 9"),
+            ({"pod_numbers": [2, 3], "status": 2, "from_status": 1}, "not in status Planted: 2"),
+            ({"pod_numbers": [2, 3], "status": 3}, "cannot move to Harvesting: 3"),
+            ({"pod_numbers": [3, 3], "status": 2}, "must not repeat"),
+        ]:
+            rejected = await client.post(url, json=body)
+            assert rejected.status_code == 400
+            assert message in rejected.json()["detail"]
+
+    statuses = [pod.status async for pod in GardenPod.objects.filter(garden=garden)]
+    assert sorted(statuses) == [1, 1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_creating_a_taken_pod_number_conflicts():
+    garden = await Garden.objects.acreate(name="NFT rack", total_pods=4)
+    async with _client() as client:
+        url = f"/api/v1/gardens/{garden.pk}/pods/"
+        first = await client.post(url, json={"pod_number": 1})
+        again = await client.post(url, json={"pod_number": 1, "status": 1})
+        missing = await client.post(
+            f"/api/v1/gardens/{garden.pk + 1}/pods/", json={"pod_number": 1}
+        )
+    assert first.status_code == 200
+    assert again.status_code == 409
+    assert again.json()["detail"] == f"Pod 1 already exists in garden {garden.pk}"
+    assert missing.status_code == 404
+    assert await GardenPod.objects.filter(garden=garden).acount() == 1
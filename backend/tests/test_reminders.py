@@ -0,0 +1,97 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+
+from apps.task.models import Reminder, ReminderType, Task, TaskScope, TaskType
+from apps.task.reminders import FileSink, ReminderDispatcher, plan_task_reminders
+
+MORNING = datetime(2025, 6, 2, 6, 0, tzinfo=timezone.utc)
+
+
+class SlowSink:
+    """Records delivered ids and the peak number of sends in flight."""
+
+    def __init__(self):
+        self.delivered = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def send(self, reminder):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.delivered.append(reminder.pk)
+
+
+def _reminders(count, at=MORNING):
+    Reminder.objects.bulk_create(
+        Reminder(reminder_type=ReminderType.CUSTOM, message=f"check {i}", scheduled_time=at)
+        for i in range(count)
+    )
+
+
+def test_burst_is_delivered_concurrently_and_only_once():
+    _reminders(2000)
+    _reminders(5, at=MORNING + timedelta(hours=1))
+    sink = SlowSink()
+    dispatcher = ReminderDispatcher(sinks=[sink], batch_size=500, concurrency=100)
+
+    result = dispatcher.dispatch_due(MORNING)
+    assert (result.delivered, result.failed, result.batches) == (2000, 0, 4)
+    # 2000 sends of 10ms each would take 20s one at a time
+    assert sink.peak == 100
+    assert len(set(sink.delivered)) == 2000
+
+    assert dispatcher.dispatch_due(MORNING).delivered == 0
+    assert Reminder.objects.filter(sent=False).count() == 5
+    assert not Reminder.objects.filter(claim_token__isnull=False).exists()
+
+
+def test_failed_deliveries_are_released_for_retry(tmp_path):
+    class FlakySink:
+        async def send(self, reminder):
+            if reminder.message.endswith("0"):
+                raise ConnectionError("sink unavailable")
+
+    _reminders(20)
+    result = ReminderDispatcher(sinks=[FlakySink()]).dispatch_due(MORNING)
+    assert (result.delivered, result.failed) == (18, 2)
+
+    path = tmp_path / "reminders.jsonl"
+    result = ReminderDispatcher(sinks=[FileSink(str(path))]).dispatch_due(MORNING)
+    assert result.delivered == 2
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(line["message"] for line in lines) == ["check 0", "check 10"]
+
+
+def test_task_reminders_are_planned_once_and_mark_the_task():
+    task = Task.objects.create(
+        task_type=TaskType.PH_CHECK,
+        scope=TaskScope.GARDEN,
+        title="Check pH",
+        scheduled_date=MORNING + timedelta(hours=1),
+        reminder_minutes_before=30,
+    )
+    plan_task_reminders(now=MORNING)
+    plan_task_reminders(now=MORNING)
+    reminder = Reminder.objects.get()
+    assert reminder.task_id == task.pk
+    assert reminder.scheduled_time == MORNING + timedelta(minutes=30)
+
+    sink = SlowSink()
+    assert ReminderDispatcher(sinks=[sink]).dispatch_due(MORNING).delivered == 0
+    assert ReminderDispatcher(sinks=[sink]).dispatch_due(reminder.scheduled_time).delivered == 1
+    task.refresh_from_db()
+    assert task.reminder_sent
+
+
+def test_due_scan_uses_the_partial_index():
+    query = Reminder.objects.filter(sent=False, scheduled_time__lte=MORNING).values("id").query
+    sql, params = query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+    assert "reminder_due_idx" in plan
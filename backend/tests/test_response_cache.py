@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from django.core.cache import caches
+from httpx import ASGITransport, AsyncClient
+
+from apps import cache
+from apps.garden.models import Garden, GardenPod
+from seedr.asgi import application
+
+
+def _client():
+    return AsyncClient(transport=ASGITransport(app=application), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_are_served_from_cache_with_etags():
+    garden = await Garden.objects.acreate(name="Kitchen", total_pods=2)
+    cache.stats.reset()
+    async with _client() as client:
+        first = await client.get(f"/api/v1/gardens/{garden.pk}")
+        etag = first.headers["ETag"]
+        # Served even though the row changed behind the cache's back
+        await Garden.objects.filter(pk=garden.pk).aupdate(name="Renamed")
+        second = await client.get(f"/api/v1/gardens/{garden.pk}")
+        assert second.json() == first.json()
+        assert second.headers["ETag"] == etag
+
+        revalidated = await client.get(
+            f"/api/v1/gardens/{garden.pk}", headers={"If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+
+        stats = (await client.get("/api/v1/cache/stats")).json()
+    assert stats == {"hits": 2, "misses": 1, "not_modified": 1, "invalidations": 0}
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_garden_and_pod_reads():
+    garden = await Garden.objects.acreate(name="Kitchen", total_pods=2)
+    async with _client() as client:
+        pods_url = f"/api/v1/gardens/{garden.pk}/pods/"
+        assert (await client.get(pods_url)).json()["items"] == []
+        before = await client.get(f"/api/v1/gardens/{garden.pk}")
+
+        created = await client.post(pods_url, json={"pod_number": 1, "status": 1})
+        assert created.status_code == 200
+        assert [pod["pod_number"] for pod in (await client.get(pods_url)).json()["items"]] == [1]
+        pod = await client.get(f"{pods_url}1")
+        assert pod.json()["status"] == 1
+
+        await client.put(f"/api/v1/gardens/{garden.pk}", json={"name": "Balcony", "total_pods": 2})
+        after = await client.get(
+            f"/api/v1/gardens/{garden.pk}", headers={"If-None-Match": before.headers["ETag"]}
+        )
+        assert after.status_code == 200
+        assert after.json()["name"] == "Balcony"
+
+        # Model saves outside the API invalidate too; QuerySet.update() does not
+        assert (await client.get(f"{pods_url}1")).json()["status"] == 1
+        await GardenPod.objects.filter(garden=garden).aupdate(status=2)
+        assert (await client.get(f"{pods_url}1")).json()["status"] == 1
+        await (await GardenPod.objects.aget(garden=garden, pod_number=1)).asave()
+        assert (await client.get(f"{pods_url}1")).json()["status"] == 2
+
+        await client.delete(f"/api/v1/gardens/{garden.pk}")
+        assert (await client.get(f"/api/v1/gardens/{garden.pk}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_async_views_keep_cache_calls_off_the_event_loop(monkeypatch):
+    garden = await Garden.objects.acreate(name="Kitchen", total_pods=2)
+    backend = caches[cache.RESPONSE_CACHE_ALIAS]
+    on_loop = []
+
+    def blocking(method):
+        def call(*args, **kwargs):
+            # A shared cache would block here on a network round trip
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(method.__name__)
+            except RuntimeError:
+                pass
+            return method(*args, **kwargs)
+
+        return call
+
+    for name in ("get", "add", "set"):
+        monkeypatch.setattr(backend, name, blocking(getattr(backend, name)))
+    async with _client() as client:
+        first = await client.get(f"/api/v1/gardens/{garden.pk}")
+        second = await client.get(f"/api/v1/gardens/{garden.pk}")
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert on_loop == []
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+
+from apps.garden.ingest import ingest_readings
+from apps.garden.models import Garden, GardenEnvironmentLog, GardenEnvironmentRollup
+from apps.garden.retention import apply_retention, enable_incremental_vacuum
+from apps.garden.rollups import query_rollups
+
+NOW = datetime(2025, 6, 30, 15, 0, tzinfo=timezone.utc)
+
+
+def _hourly(garden, days, ph=6.0):
+    start = NOW - timedelta(days=days)
+    return [
+        GardenEnvironmentLog(garden=garden, timestamp=start + timedelta(hours=h), ph_level=ph)
+        for h in range(24 * days)
+    ]
+
+
+def test_old_readings_are_deleted_in_chunks_after_rollups_are_checked():
+    ingested = Garden.objects.create(name="Ingested", total_pods=4)
+    rows = [
+        {"timestamp": log.timestamp.isoformat(), "ph_level": 6.2} for log in _hourly(ingested, 20)
+    ]
+    ingest_readings(ingested.pk, rows)
+    # These readings bypassed ingestion, so they have no rollups yet
+    backfilled = Garden.objects.create(name="Backfilled", total_pods=4)
+    GardenEnvironmentLog.objects.bulk_create(_hourly(backfilled, 20, ph=5.8))
+
+    result = apply_retention(days=10, now=NOW, chunk=50, pause=0)
+
+    cutoff = datetime(2025, 6, 20, tzinfo=timezone.utc)
+    assert result.cutoff == cutoff
+    assert result.rebuilt_gardens == [backfilled.pk]
+    old = 24 * 20 - (NOW - cutoff) // timedelta(hours=1)
+    assert result.deleted == 2 * old
+    assert result.chunks == 2 * -(-old // 50)
+    assert not GardenEnvironmentLog.objects.filter(timestamp__lt=cutoff).exists()
+    assert GardenEnvironmentLog.objects.filter(timestamp__gte=cutoff).count() == 2 * (24 * 20 - old)
+
+    # History before the cutoff is still served from the rollups
+    for garden, ph in [(ingested, 6.2), (backfilled, 5.8)]:
+        points = query_rollups(garden.pk, NOW - timedelta(days=20), cutoff, "day", ["ph_level"])
+        assert sum(p["metrics"]["ph_level"]["count"] for p in points) == old
+        assert all(p["metrics"]["ph_level"]["mean"] == pytest.approx(ph) for p in points)
+
+    # The next day only touches that day; older rollups are left alone
+    rollups = GardenEnvironmentRollup.objects.filter(bucket_start__lt=cutoff).count()
+    again = apply_retention(days=10, now=NOW + timedelta(days=1), chunk=50, pause=0)
+    assert again.rebuilt_gardens == [backfilled.pk]
+    assert again.deleted == 2 * 24
+    assert GardenEnvironmentRollup.objects.filter(bucket_start__lt=cutoff).count() == rollups
+
+
+def test_incremental_vacuum_returns_deleted_pages():
+    enable_incremental_vacuum()
+    garden = Garden.objects.create(name="Big", total_pods=4)
+    logs = _hourly(garden, 60)
+    for log in logs:
+        log.notes = "x" * 500
+    GardenEnvironmentLog.objects.bulk_create(logs)
+
+    result = apply_retention(days=1, now=NOW, pause=0)
+
+    assert result.deleted > 0
+    assert result.reclaimed_bytes > 0
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA freelist_count")
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,80 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from apps.seed.models import Seed, SeedType
+from apps.seed.search import search_seeds
+from seedr.asgi import application
+
+
+def _client():
+    return AsyncClient(transport=ASGITransport(app=application), base_url="http://test")
+
+
+def _names(seeds):
+    return [seed.name for seed in seeds]
+
+
+def test_search_matches_word_prefixes_and_ranks_names_first():
+    Seed.objects.bulk_create(
+        [
+            Seed(name="Cherry Tomato", seed_type=SeedType.VEGETABLE, variety="Sweet 100"),
+            Seed(name="Basil", seed_type=SeedType.HERB, variety="Cherry Queen"),
+            Seed(name="Tomatillo", seed_type=SeedType.FRUIT, supplier="Crème Seeds"),
+            Seed(name="Marigold", seed_type=SeedType.FLOWER),
+        ]
+    )
+    assert _names(search_seeds("cher tom")) == ["Cherry Tomato"]
+    assert _names(search_seeds("cher")) == ["Cherry Tomato", "Basil"]
+    assert _names(search_seeds("creme")) == ["Tomatillo"]
+    assert _names(search_seeds("herb")) == ["Basil"]
+    assert search_seeds('" OR *') == []
+    assert search_seeds("marig", limit=0) == []
+
+
+def test_search_index_follows_updates_and_deletes():
+    seed = Seed.objects.create(name="Kale", seed_type=SeedType.VEGETABLE)
+    Seed.objects.filter(pk=seed.pk).update(name="Lacinato Kale")
+    assert _names(search_seeds("lacin")) == ["Lacinato Kale"]
+
+    seed.delete()
+    assert search_seeds("kale") == []
+
+
+@pytest.mark.asyncio
+async def test_seed_and_batch_routes_with_growth_logs():
+    async with _client() as client:
+        seed = await client.post(
+            "/api/v1/seeds/", json={"name": "Genovese Basil", "seed_type": "herb"}
+        )
+        assert seed.status_code == 200
+        seed_id = seed.json()["id"]
+
+        found = await client.get("/api/v1/seeds/search", params={"q": "geno"})
+        assert [s["id"] for s in found.json()] == [seed_id]
+
+        renamed = await client.put(f"/api/v1/seeds/{seed_id}", json={"variety": "Italian Large"})
+        assert renamed.json()["variety"] == "Italian Large"
+        found = await client.get("/api/v1/seeds/search", params={"q": "ital"})
+        assert [s["id"] for s in found.json()] == [seed_id]
+
+        batch = await client.post(
+            "/api/v1/batches/",
+            json={"seed_id": seed_id, "germination_start_date": "2025-10-01"},
+        )
+        batch_id = batch.json()["id"]
+        missing = await client.post(
+            "/api/v1/batches/", json={"seed_id": 999, "germination_start_date": "2025-10-01"}
+        )
+        assert missing.status_code == 404
+
+        for height, timestamp in [(2.5, "2025-10-05T10:00:00Z"), (4.0, "2025-10-09T10:00:00Z")]:
+            log = await client.post(
+                f"/api/v1/batches/{batch_id}/logs",
+                json={"height_cm": height, "timestamp": timestamp, "photo_urls": ["a.jpg"]},
+            )
+            assert log.status_code == 200
+        logs = (await client.get(f"/api/v1/batches/{batch_id}/logs")).json()
+        assert [entry["height_cm"] for entry in logs["items"]] == [4.0, 2.5]
+
+        assert (await client.delete(f"/api/v1/seeds/{seed_id}")).status_code == 200
+        assert (await client.get(f"/api/v1/batches/{batch_id}")).status_code == 404
@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+
+from apps.api import api
+from apps.management.commands.startup_profile import parse_importtime
+
+PROBE = """
+import json, sys
+import django
+django.setup()
+from django.urls import resolve
+loaded = lambda: sorted(m for m in ("apps.garden.api", "apps.seed.api", "apps.task.api",
+                                    "django.contrib.admin") if m in sys.modules)
+resolve("/api/v1/health")
+before = loaded()
+resolve("/api/v1/gardens/1/pods/")
+print(json.dumps([before, loaded(), resolve("/api/v1/gardens/1/pods/").route]))
+"""
+
+
+def test_api_profile_boots_without_admin_and_imports_routers_on_demand():
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=settings.BASE_DIR,
+        env={"DJANGO_SETTINGS_MODULE": "seedr.settings_api", "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    before, after, route = json.loads(completed.stdout)
+    assert before == []
+    assert after == ["apps.garden.api"]
+    assert route == "api/v1/gardens/<garden_id>/pods/"
+
+
+def test_openapi_schema_covers_every_router_and_is_built_once():
+    schema = api.get_openapi_schema(path_prefix="/api/v1/")
+    assert api.get_openapi_schema(path_prefix="/api/v1/") is schema
+    paths = schema["paths"]
+    for path in (
+        "/api/v1/health",
+        "/api/v1/gardens/{garden_id}",
+        "/api/v1/batches/",
+        "/api/v1/reminders/",
+    ):
+        assert path in paths
+
+
+def test_import_times_are_attributed_to_phases():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 | site",
+            "startup-phase: django.setup()",
+            "import time:        30 |         30 |   django.utils",
+            "import time:       500 |        530 | django",
+        ]
+    )
+    assert parse_importtime(stderr) == [
+        ("interpreter", "site", 0, 120, 120),
+        ("django.setup()", "django.utils", 1, 30, 30),
+        ("django.setup()", "django", 0, 500, 530),
+    ]
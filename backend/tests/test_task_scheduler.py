@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from apps.seed.models import Seed, SeedBatch, SeedType
+from apps.task.models import RecurrencePattern, Task, TaskScope, TaskStatus, TaskType
+from apps.task.recurrence import Recurrence
+from apps.task.scheduler import TaskEngine
+from seedr.asgi import application
+
+START = datetime(2025, 1, 31, 9, 0, tzinfo=timezone.utc)
+
+
+def _task(**fields) -> Task:
+    defaults = {
+        "task_type": TaskType.PH_CHECK,
+        "scope": TaskScope.GARDEN,
+        "title": "Check pH",
+        "scheduled_date": START,
+    }
+    return Task.objects.create(**{**defaults, **fields})
+
+
+def test_recurrence_seeks_directly_and_clamps_month_ends():
+    monthly = Recurrence(START, RecurrencePattern.MONTHLY, 1)
+    assert monthly.after(START) == datetime(2025, 2, 28, 9, 0, tzinfo=timezone.utc)
+    assert monthly.after(datetime(2025, 3, 1, tzinfo=timezone.utc)).day == 31
+
+    every_three_days = Recurrence(START, None, 3)
+    far = datetime(2125, 1, 1, tzinfo=timezone.utc)
+    nxt = every_three_days.after(far)
+    assert far < nxt <= far + timedelta(days=3)
+    assert (nxt - START).days % 3 == 0
+
+    weekly = Recurrence(START, RecurrencePattern.WEEKLY, 1)
+    window = list(weekly.between(START, START + timedelta(days=21)))
+    assert window == [START + timedelta(weeks=k) for k in range(3)]
+
+
+def test_engine_fires_due_tasks_once_and_rolls_recurring_forward():
+    fired = []
+    engine = TaskEngine(handlers=[lambda task, run_at: fired.append((task.title, run_at))])
+    once = _task(title="Change filter")
+    daily = _task(
+        title="Check pH",
+        is_recurring=True,
+        recurrence_pattern=RecurrencePattern.DAILY,
+        scheduled_date=START + timedelta(minutes=5),
+    )
+    _task(title="Next month", scheduled_date=START + timedelta(days=30))
+    _task(title="Done", status=TaskStatus.COMPLETED)
+
+    assert engine.tick(START) == 1
+    # Only tasks inside the one hour horizon are loaded into the heap
+    assert len(engine) == 1
+    assert engine.tick(START + timedelta(minutes=10)) == 1
+    assert engine.tick(START + timedelta(minutes=20)) == 0
+    assert fired == [("Change filter", START), ("Check pH", START + timedelta(minutes=5))]
+
+    once.refresh_from_db()
+    daily.refresh_from_db()
+    assert once.next_run_at is None and once.last_run_at == START
+    assert daily.next_run_at == START + timedelta(days=1, minutes=5)
+
+    # A fresh engine (e.g. after a restart) does not fire the same occurrences again
+    assert TaskEngine(handlers=[]).tick(START + timedelta(minutes=20)) == 0
+
+
+@pytest.mark.asyncio
+async def test_task_api_create_and_reschedule():
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/tasks/",
+            json={
+                "task_type": "nutrient_refill",
+                "scope": "garden",
+                "title": "Refill nutrients",
+                "scheduled_date": "2025-10-10T09:00:00Z",
+                "is_recurring": True,
+                "recurrence_pattern": "weekly",
+            },
+        )
+        assert created.status_code == 200
+        task_id = created.json()["id"]
+        assert created.json()["next_run_at"] == "2025-10-10T09:00:00Z"
+
+        updated = await client.put(
+            f"/api/v1/tasks/{task_id}", json={"scheduled_date": "2025-10-12T09:00:00Z"}
+        )
+        listing = await client.get("/api/v1/tasks/", params={"status": "pending"})
+
+    assert updated.json()["next_run_at"] == "2025-10-12T09:00:00Z"
+    assert [task["id"] for task in listing.json()["items"]] == [task_id]
+
+
+@pytest.mark.asyncio
+async def test_seed_tasks_reference_their_batch():
+    basil = await Seed.objects.acreate(name="Basil", seed_type=SeedType.HERB)
+    batch = await SeedBatch.objects.acreate(seed=basil, germination_start_date=date(2025, 3, 1))
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/tasks/",
+            json={
+                "task_type": "harvest",
+                "scope": "seed",
+                "title": "Harvest basil",
+                "seed_batch_id": batch.pk,
+                "scheduled_date": "2025-04-10T09:00:00Z",
+            },
+        )
+    assert created.json()["seed_batch"] == batch.pk
+    assert await batch.tasks.acount() == 1
+
+    # Deleting the batch keeps the task
+    await batch.adelete()
+    task = await Task.objects.aget(pk=created.json()["id"])
+    assert task.seed_batch_id is None